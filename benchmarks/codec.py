@@ -0,0 +1,169 @@
+"""Compares the JSON codecs on dvmdb device payloads, without a FortiManager.
+
+Measures encoding and decoding a response with every installed codec, and a whole get request through Api with a MemoryTransport returning the same response, so only the client side is timed.
+
+Usage:
+    python benchmarks/codec.py [--devices 5000] [--repeat 20]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Import pyfortimanager from this checkout when it is not installed
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pyfortimanager
+from pyfortimanager.core.codec import JSONCodec, OrjsonCodec
+from pyfortimanager.core.transport import Response
+
+
+def device(index: int):
+    """Returns a FortiGate as returned by /dvmdb/adom/{adom}/device, with the fields FortiManager 7.x returns by default.
+    """
+
+    name = f"FGT-{index:05d}"
+
+    return {
+        "adm_usr": "admin",
+        "app_ver": "",
+        "av_ver": "91.01234(2024-05-01 12:34)",
+        "beta": -1,
+        "branch_pt": 2573,
+        "build": 2573,
+        "checksum": "a7 3f 91 0c 5e 22 d8 14 6b 90 e1 47 3c aa 05 f2",
+        "conf_status": 1,
+        "conn_mode": 1,
+        "conn_status": 1,
+        "db_status": 1,
+        "desc": f"Store {index}",
+        "dev_status": 1,
+        "flags": 67371040,
+        "foslic_cpu": 0,
+        "foslic_dr_site": 0,
+        "foslic_inst_time": 0,
+        "foslic_last_sync": 0,
+        "foslic_ram": 0,
+        "foslic_type": 0,
+        "foslic_utm": None,
+        "fsw_cnt": 2,
+        "fap_cnt": 4,
+        "ha_group_id": 0,
+        "ha_group_name": "",
+        "ha_mode": 0,
+        "ha_slave": None,
+        "hdisk_size": 0,
+        "hostname": name,
+        "hw_rev_major": 0,
+        "hw_rev_minor": 0,
+        "ip": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}",
+        "ips_ext": 0,
+        "ips_ver": "28.00812(2024-05-01 02:15)",
+        "last_checked": 1714560000 + index,
+        "last_resync": 1714560000 + index,
+        "latitude": "55.676098",
+        "longitude": "12.568337",
+        "lic_flags": 0,
+        "lic_region": "",
+        "location_from": "GUI(10.0.0.1)",
+        "logdisk_size": 0,
+        "maxvdom": 10,
+        "meta fields": {
+            "Country": "DK",
+            "Store ID": str(index),
+            "Region": "EMEA"
+        },
+        "mgmt_id": 123456789 + index,
+        "mgmt_if": "wan1",
+        "mgmt_mode": 3,
+        "mgmt_uuid": 0,
+        "mgt_vdom": "root",
+        "mr": 4,
+        "name": name,
+        "oid": 1000 + index,
+        "os_type": 0,
+        "os_ver": 7,
+        "patch": 4,
+        "platform_str": "FortiGate-60F",
+        "prefer_img_ver": "",
+        "psk": "",
+        "sn": f"FGT60FTK{index:08d}",
+        "tab_status": "",
+        "tunnel_ip": "169.254.0.2",
+        "vdom": [
+            {
+                "comments": "",
+                "name": "root",
+                "oid": 3,
+                "opmode": 1,
+                "status": None,
+                "vpn_id": 0
+            }
+        ],
+        "version": 700,
+        "vm_cpu": 0,
+        "vm_cpu_limit": 0,
+        "vm_lic_expire": 0,
+        "vm_mem": 0,
+        "vm_mem_limit": 0,
+        "vm_status": 0
+    }
+
+
+def codecs():
+    """Returns every installed codec.
+    """
+
+    installed = [JSONCodec()]
+
+    try:
+        installed.append(OrjsonCodec())
+    except ImportError:
+        pass
+
+    return installed
+
+
+def measure(fn, repeat: int):
+    """Returns the median and lowest seconds fn takes.
+    """
+
+    fn()
+    times = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times), min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=5000, help="Number of devices in the response. Default is 5000.")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of timed runs. Default is 20.")
+    args = parser.parse_args()
+
+    result = [{"status": {"code": 0, "message": "OK"}, "url": "/dvmdb/adom/root/device", "data": [device(index) for index in range(args.devices)]}]
+    content = json.dumps({"id": 1, "result": result}).encode()
+
+    print(f"{args.devices} devices, {len(content) / 1e6:.1f} MB, median (lowest) of {args.repeat} runs")
+
+    for codec in codecs():
+        api = pyfortimanager.api(host="https://fortimanager.example.com", token="token", codec=codec, transport=pyfortimanager.MemoryTransport(lambda method, params: Response(200, content)))
+
+        timings = {
+            "loads": measure(lambda: codec.loads(content), args.repeat),
+            "dumps": measure(lambda: codec.dumps(result), args.repeat),
+            "get": measure(lambda: api.adoms.post(method="get", params={"url": "/dvmdb/adom/root/device"}), args.repeat),
+        }
+
+        print(f"{codec.name:8}" + "".join(f"  {name} {median * 1000:7.1f} ms ({lowest * 1000:.1f})" for name, (median, lowest) in timings.items()))
+
+
+if __name__ == "__main__":
+    main()
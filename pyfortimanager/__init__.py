@@ -1 +1,12 @@
 from pyfortimanager.core.api import Api as api
+from pyfortimanager.core.async_api import AsyncApi as async_api
+from pyfortimanager.core.filters import Field, Filter, all_of, any_of
+from pyfortimanager.core.cache import ResponseCache
+from pyfortimanager.core.limiter import AdaptiveLimiter
+from pyfortimanager.core.retry import CircuitBreaker, RetryPolicy
+from pyfortimanager.core.deadline import Deadline
+from pyfortimanager.core.hedging import HedgePolicy
+from pyfortimanager.core.metrics import Exporter, Metrics, PrometheusExporter
+from pyfortimanager.core.tracing import MemoryTracer, OpenTelemetryTracer, Span, Tracer
+from pyfortimanager.core.debug import SlowCallLog
+from pyfortimanager.core.transport import AiohttpTransport, HttpxTransport, MemoryTransport, RequestsTransport, Response, Transport
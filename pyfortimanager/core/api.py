@@ -1,124 +1,273 @@
-from pyfortimanager.models.adoms import ADOMs
-from pyfortimanager.models.cli_template_groups import CLI_Template_Groups
-from pyfortimanager.models.device_groups import Device_Groups
-from pyfortimanager.models.fortiaps_proxy import FortiAPs_Proxy
-from pyfortimanager.models.fortiaps import FortiAPs
-from pyfortimanager.models.fortigates_proxy import FortiGates_Proxy
-from pyfortimanager.models.fortigates import FortiGates
-from pyfortimanager.models.fortiswitches_proxy import FortiSwitches_Proxy
-from pyfortimanager.models.fortiswitches import FortiSwitches
-from pyfortimanager.models.install_wizard import Install_Wizard
-from pyfortimanager.models.metadata_variables import MetadataVariables
-from pyfortimanager.models.policy_packages import Policy_Packages
-from pyfortimanager.models.radius_servers import RADIUS_Servers
-from pyfortimanager.models.scripts import Scripts
-from pyfortimanager.models.sdwan_templates import SDWAN_Templates
-from pyfortimanager.models.system import System
+import importlib
+
+from pyfortimanager.core.batch import Batch
+from pyfortimanager.core.codec import default_codec
+from pyfortimanager.core.deadline import Deadline
+from pyfortimanager.core.fanout import fan_out
+from pyfortimanager.core.fortimanager import FortiManager
+from pyfortimanager.core.singleflight import SingleFlight
+from pyfortimanager.core.tracing import start_span, trace_result
+from pyfortimanager.core.transport import RequestsTransport
 
 
 class Api(object):
     """Base API class.
     """
 
-    def __init__(self, host: str, token: str, adom: str = "root", verify: bool = True, proxy_timeout: int = 60, **kwargs):
+    is_async = False
+
+    def __init__(self, host: str, token: str, adom: str = "root", verify: bool = True, proxy_timeout: int = 60, connect_timeout: float = 10, read_timeout: float = 300, pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False, pool_idle_timeout: float = None, codec=None, cache=None, coalesce: bool = False, limiter=None, retry=None, circuit_breaker=None, hedge=None, metrics=None, tracer=None, debug=None, transport=None, **kwargs):
         self.host = host
         self.token = token
         self.adom = adom
         self.verify = verify
         self.proxy_timeout = proxy_timeout
 
+        # Seconds to wait for the FortiManager to accept a connection, and to send data. None means no timeout.
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        # JSON codec for request and response bodies. Defaults to orjson if installed.
+        self.codec = codec or default_codec()
+
+        # Optional ResponseCache for read-only calls
+        self.cache = cache
+
+        # Share one in-flight request between concurrent identical read-only calls
+        self.coalesce = coalesce
+        self.single_flight = SingleFlight()
+
+        # Optional AdaptiveLimiter for the number of requests in flight
+        self.limiter = limiter
+
+        # Optional RetryPolicy and CircuitBreaker for failed requests
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+
+        # Optional HedgePolicy for slow read-only calls. Its threads are sized to the connection pool unless given.
+        self.hedge = hedge
+
+        if hedge is not None and hedge.max_workers is None:
+            hedge.max_workers = 2 * pool_maxsize
+
+        # Optional Metrics collecting counters and histograms of every request
+        self.metrics = metrics
+
+        # Optional Tracer for spans of model methods, batches and HTTP requests
+        self.tracer = tracer
+
+        # Optional SlowCallLog logging slow requests with a timing breakdown
+        self.debug = debug
+
+        # Connection pool settings
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.pool_idle_timeout = pool_idle_timeout
+
+        # Transport sending the requests. Defaults to requests, or aiohttp when using AsyncApi.
+        self.transport = transport or self._default_transport()
+
+        # Model instances, created on first use
+        self._models = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _default_transport(self):
+        """Returns the transport used when none is given, sending requests with requests over a keep-alive connection pool.
+        """
+
+        return RequestsTransport(
+            verify=self.verify,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            pool_idle_timeout=self.pool_idle_timeout,
+            timed=self.debug is not None
+        )
+
+    @property
+    def session(self):
+        """Shared keep-alive HTTP session used by all endpoints, or None if the transport does not use requests.
+
+        The session is created on first use. If pool_idle_timeout is set and the session has been idle for longer than that, the pooled connections are dropped and a new session is created.
+        """
+
+        return getattr(self.transport, "session", None)
+
+    def close(self):
+        """Closes the transport and all pooled connections.
+
+        New connections are made automatically on the next request.
+        """
+
+        self.transport.close()
+
+    def reset_session(self):
+        """Closes the current connection pool and creates a new one.
+        """
+
+        self.close()
+
+        return self.session
+
+    def batch(self, max_size: int = None):
+        """Queues all calls made inside the with-block and sends them as multi-params requests when the block exits.
+
+        Args:
+            max_size (int, optional): Maximum number of params blocks per request. Default is no limit.
+
+        Returns:
+            Batch: Context manager collecting the calls.
+        """
+
+        return Batch(client=FortiManager(api=self), max_size=max_size)
+
+    def deadline(self, seconds: float):
+        """Sets a time budget for all calls made inside the with-block.
+
+        No request is sent once the budget is spent, and request timeouts are shortened to the remaining time. map() and the iter_* methods stop and return what they have so far.
+
+        Args:
+            seconds (float): The time budget.
+
+        Returns:
+            Deadline: Context manager holding the budget.
+        """
+
+        return Deadline(seconds)
+
+    def map(self, fn, items, max_workers: int = None, ordered: bool = False):
+        """Calls fn for every item on a bounded thread pool sharing this API's connection pool. Exceptions are captured per item instead of stopping the run.
+
+        Args:
+            fn (callable): Function called with every item. Ex. lambda fortigate: fortimanager.fortigates_proxy.status(fortigate=fortigate)
+            items (iterable): The items.
+            max_workers (int, optional): Number of threads. Defaults to pool_maxsize, so every thread can keep a pooled connection.
+            ordered (bool): Yield the results in the order of the items instead of as they complete. Default is False.
+
+        Returns:
+            generator: MapResult with item, result and error for every item.
+        """
+
+        span = start_span(self.tracer, "Api.map", {"pyfortimanager.max_workers": max_workers or self.pool_maxsize})
+
+        return trace_result(span, fan_out(fn, items, max_workers=max_workers or self.pool_maxsize, ordered=ordered))
+
+    def _model(self, module: str, name: str):
+        """Returns the model instance for this API, importing its module on first use.
+
+        Args:
+            module (str): Module in pyfortimanager.models. Ex. adoms
+            name (str): Class name of the model. Ex. ADOMs
+
+        Returns:
+            FortiManager: The model.
+        """
+
+        model = self._models.get(name)
+
+        if model is None:
+            model = self._models[name] = getattr(importlib.import_module(f"pyfortimanager.models.{module}"), name)(api=self)
+
+        return model
+
     @property
     def adoms(self):
         """Endpoints related to ADOM management.
         """
-        return ADOMs(api=self)
+        return self._model("adoms", "ADOMs")
 
     @property
     def cli_template_groups(self):
         """Endpoints related to CLI Template Groups.
         """
-        return CLI_Template_Groups(api=self)
+        return self._model("cli_template_groups", "CLI_Template_Groups")
 
     @property
     def device_groups(self):
         """Endpoints related to Device Groups.
         """
-        return Device_Groups(api=self)
+        return self._model("device_groups", "Device_Groups")
 
     @property
     def fortiaps_proxy(self):
         """Endpoints related to FortiAP proxy calls on a FortiGate.
         """
-        return FortiAPs_Proxy(api=self)
+        return self._model("fortiaps_proxy", "FortiAPs_Proxy")
 
     @property
     def fortiaps(self):
         """Endpoints related to FortiAP management.
         """
-        return FortiAPs(api=self)
+        return self._model("fortiaps", "FortiAPs")
 
     @property
     def fortigates_proxy(self):
         """Endpoints related to proxy calls on a FortiGate.
         """
-        return FortiGates_Proxy(api=self)
+        return self._model("fortigates_proxy", "FortiGates_Proxy")
 
     @property
     def fortigates(self):
         """Endpoints related to FortiGate management.
         """
-        return FortiGates(api=self)
+        return self._model("fortigates", "FortiGates")
 
     @property
     def fortiswitches_proxy(self):
         """Endpoints related to FortiSwitch proxy calls on a FortiGate.
         """
-        return FortiSwitches_Proxy(api=self)
+        return self._model("fortiswitches_proxy", "FortiSwitches_Proxy")
 
     @property
     def fortiswitches(self):
         """Endpoints related to FortiSwitch management.
         """
-        return FortiSwitches(api=self)
+        return self._model("fortiswitches", "FortiSwitches")
 
     @property
     def install_wizard(self):
         """Endpoints related to the Install Wizard.
         """
-        return Install_Wizard(api=self)
+        return self._model("install_wizard", "Install_Wizard")
 
     @property
     def metadata_variables(self):
         """Endpoints related to Metadata Variables.
         """
-        return MetadataVariables(api=self)
+        return self._model("metadata_variables", "MetadataVariables")
 
     @property
     def policy_packages(self):
         """Endpoints related to Policy Packages.
         """
-        return Policy_Packages(api=self)
+        return self._model("policy_packages", "Policy_Packages")
 
     @property
     def radius_servers(self):
         """Endpoints related to RADIUS_Servers.
         """
-        return RADIUS_Servers(api=self)
+        return self._model("radius_servers", "RADIUS_Servers")
 
     @property
     def scripts(self):
         """Endpoints related to Scripts.
         """
-        return Scripts(api=self)
+        return self._model("scripts", "Scripts")
 
     @property
     def sdwan_templates(self):
         """Endpoints related to SD-WAN Templates.
         """
-        return SDWAN_Templates(api=self)
+        return self._model("sdwan_templates", "SDWAN_Templates")
 
     @property
     def system(self):
         """Endpoints related to the FortiManager system.
         """
-        return System(api=self)
+        return self._model("system", "System")
@@ -0,0 +1,98 @@
+from pyfortimanager.core.api import Api
+from pyfortimanager.core.fanout import fan_out_async
+from pyfortimanager.core.tracing import start_span, trace_result
+from pyfortimanager.core.transport import AiohttpTransport
+
+
+class AsyncApi(Api):
+    """Asyncio API class.
+
+    Exposes the same endpoints as Api, but every call returns a coroutine. Requests are sent through a shared aiohttp connection pool by default, and the number of requests in flight is limited by max_concurrency.
+    """
+
+    is_async = True
+
+    def __init__(self, host: str, token: str, adom: str = "root", verify: bool = True, proxy_timeout: int = 60, connect_timeout: float = 10, read_timeout: float = 300, max_concurrency: int = 100, pool_connections: int = 10, pool_maxsize: int = 100, pool_idle_timeout: float = None, codec=None, cache=None, coalesce: bool = False, limiter=None, retry=None, circuit_breaker=None, hedge=None, metrics=None, tracer=None, debug=None, transport=None, **kwargs):
+        super(AsyncApi, self).__init__(host=host, token=token, adom=adom, verify=verify, proxy_timeout=proxy_timeout, connect_timeout=connect_timeout, read_timeout=read_timeout, pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_idle_timeout=pool_idle_timeout, codec=codec, cache=cache, coalesce=coalesce, limiter=limiter, retry=retry, circuit_breaker=circuit_breaker, hedge=hedge, metrics=metrics, tracer=tracer, debug=debug, transport=transport, **kwargs)
+        self.max_concurrency = max_concurrency
+
+        self._semaphore = None
+
+    def __enter__(self):
+        raise TypeError("AsyncApi closes its connections asynchronously, use 'async with' instead of 'with'.")
+
+    def __exit__(self, *exc):
+        # Never reached, __enter__ raises
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def semaphore(self):
+        """Semaphore limiting the number of requests in flight.
+        """
+
+        if self._semaphore is None:
+            import asyncio
+
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        return self._semaphore
+
+    def map(self, fn, items, max_workers: int = None, ordered: bool = False):
+        """Awaits fn(item) for every item with a bounded number of calls in flight. Exceptions are captured per item instead of stopping the run.
+
+        Args:
+            fn (callable): Function returning an awaitable for every item. Ex. lambda fortigate: fortimanager.fortigates_proxy.status(fortigate=fortigate)
+            items (iterable): The items.
+            max_workers (int, optional): Number of calls in flight. Defaults to max_concurrency.
+            ordered (bool): Yield the results in the order of the items instead of as they complete. Default is False.
+
+        Returns:
+            async generator: MapResult with item, result and error for every item.
+        """
+
+        span = start_span(self.tracer, "AsyncApi.map", {"pyfortimanager.max_workers": max_workers or self.max_concurrency})
+
+        return trace_result(span, fan_out_async(fn, items, max_workers=max_workers or self.max_concurrency, ordered=ordered))
+
+    def _default_transport(self):
+        """Returns the transport used when none is given, sending requests with aiohttp over a keep-alive connection pool.
+        """
+
+        return AiohttpTransport(
+            verify=self.verify,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_idle_timeout=self.pool_idle_timeout,
+            timed=self.debug is not None
+        )
+
+    async def get_session(self):
+        """Returns the shared aiohttp session of the default transport, creating it on first use.
+
+        Returns:
+            aiohttp.ClientSession: The shared session.
+        """
+
+        return await self.transport.get_session()
+
+    async def close(self):
+        """Closes the transport and all pooled connections.
+
+        New connections are made automatically on the next request.
+        """
+
+        await self.transport.close_async()
+
+    async def reset_session(self):
+        """Closes the current connection pool and creates a new one.
+        """
+
+        await self.close()
+
+        return await self.get_session()
@@ -0,0 +1,169 @@
+import contextvars
+
+from pyfortimanager.core.tracing import active_span
+
+
+# The batch currently collecting calls, if any.
+current_batch = contextvars.ContextVar("pyfortimanager_batch", default=None)
+
+
+class BatchResult(object):
+    """Placeholder for the result of a call queued in a batch. The result is available once the batch has been sent.
+    """
+
+    def __init__(self, parent=None, callback=None):
+        self._parent = parent
+        self._callback = callback
+        self._done = False
+        self._result = None
+
+    @property
+    def done(self):
+        """True when the batch has been sent and the result is available.
+        """
+
+        if self._parent is not None:
+            return self._parent.done
+
+        return self._done
+
+    @property
+    def result(self):
+        """The JSON data returned for this call.
+
+        Raises:
+            RuntimeError: If the batch has not been sent yet.
+        """
+
+        if self._parent is not None:
+            return self._callback(self._parent.result)
+
+        if not self._done:
+            raise RuntimeError("The batch has not been sent yet.")
+
+        return self._result
+
+    def then(self, callback):
+        """Returns a new placeholder whose result is callback applied to this result.
+
+        Args:
+            callback (callable): Function called with the JSON data of this call.
+
+        Returns:
+            BatchResult: The derived placeholder.
+        """
+
+        return BatchResult(parent=self, callback=callback)
+
+    def _set(self, result):
+        self._result = result
+        self._done = True
+
+
+class Batch(object):
+    """Collects calls made through the models and sends them as multi-params JSON-RPC requests.
+
+    Consecutive calls using the same method (get, set, add, update, delete, exec) are sent together in one request. Every queued call returns a BatchResult, which holds its own result once the batch has been sent.
+    """
+
+    def __init__(self, client, max_size: int = None):
+        self.client = client
+        self.api = client.api
+        self.max_size = max_size
+        self.calls = []
+        self._token = None
+
+    def __enter__(self):
+        self._token = current_batch.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        current_batch.reset(self._token)
+        self._token = None
+
+        # Only send the queued calls if the block completed
+        if exc_type is None:
+            self.send()
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        current_batch.reset(self._token)
+        self._token = None
+
+        # Only send the queued calls if the block completed
+        if exc_type is None:
+            await self.send_async()
+
+    def __len__(self):
+        return len(self.calls)
+
+    def add(self, method: str, params: dict):
+        """Queues a call.
+
+        Args:
+            method (str): get, exec, add, set, update, delete.
+            params (dict): Payload data to send with the request.
+
+        Returns:
+            BatchResult: Placeholder for the result.
+        """
+
+        result = BatchResult()
+        self.calls.append((method, params, result))
+
+        return result
+
+    def _chunks(self, calls: list):
+        """Splits calls into runs of the same method, at most max_size calls each.
+        """
+
+        chunk = []
+
+        for call in calls:
+            if chunk and (call[0] != chunk[0][0] or len(chunk) == self.max_size):
+                yield chunk
+                chunk = []
+
+            chunk.append(call)
+
+        if chunk:
+            yield chunk
+
+    def send(self):
+        """Sends all queued calls and fills in their results.
+
+        Returns:
+            list: JSON data for every queued call, in the order they were queued.
+        """
+
+        calls, self.calls = self.calls, []
+
+        with active_span(self.api.tracer, "Batch.send", {"pyfortimanager.calls": len(calls)}):
+            for chunk in self._chunks(calls):
+                self._fill(chunk, self.client.send(method=chunk[0][0], params=[params for _, params, _ in chunk]))
+
+        return [result.result for _, _, result in calls]
+
+    async def send_async(self):
+        """Sends all queued calls and fills in their results, when using AsyncApi.
+
+        Returns:
+            list: JSON data for every queued call, in the order they were queued.
+        """
+
+        calls, self.calls = self.calls, []
+
+        with active_span(self.api.tracer, "Batch.send", {"pyfortimanager.calls": len(calls)}):
+            for chunk in self._chunks(calls):
+                self._fill(chunk, await self.client.send(method=chunk[0][0], params=[params for _, params, _ in chunk]))
+
+        return [result.result for _, _, result in calls]
+
+    def _fill(self, chunk: list, results: list):
+        """Sets the result of every call in a chunk.
+        """
+
+        for index, (_, _, result) in enumerate(chunk):
+            result._set(results[index] if results else None)
@@ -0,0 +1,169 @@
+from pyfortimanager.core.tasks import STATE_DONE, STATE_WARNING
+
+
+# Status of a device without a result from FortiManager
+UNKNOWN_STATUS = {"code": -1, "message": "FortiManager returned no result for this device."}
+
+
+class DeviceResult(object):
+    """Result of a bulk operation for one device.
+    """
+
+    __slots__ = ("device", "status", "task", "detail", "error")
+
+    def __init__(self, device: str, status: dict = None, task: int = None, detail: str = None, error: Exception = None):
+        self.device = device
+        self.status = status or {}
+        self.task = task
+        self.detail = detail
+
+        # The exception raised by the request of the device, if any
+        self.error = error
+
+    def __repr__(self):
+        return f"DeviceResult(device={self.device!r}, ok={self.ok}, task={self.task!r})"
+
+    @property
+    def ok(self):
+        """True if FortiManager accepted the device, and its task line succeeded if the task was waited for.
+        """
+
+        return self.status.get('code', 0) == 0
+
+    @property
+    def retriable(self):
+        """True if the request of the device raised an exception, such as a connection error. Devices that FortiManager rejected are not sent again.
+        """
+
+        return self.error is not None
+
+
+class DeviceResults(dict):
+    """Results of a bulk operation, by device name.
+
+    Devices are sent in chunks, and every chunk may create a task. tasks maps the ID of every task to the devices it handles.
+    """
+
+    def __init__(self):
+        super(DeviceResults, self).__init__()
+        self.tasks = {}
+
+    @property
+    def failed(self):
+        """Names of the devices that failed.
+        """
+
+        return [name for name, result in self.items() if not result.ok]
+
+    def sent(self, devices: list, response: dict):
+        """Sets the result of every device in a chunk from the response of its request.
+
+        Args:
+            devices (list): Names of the devices in the chunk.
+            response (dict): JSON data of the request.
+        """
+
+        response = response or {}
+        status = response.get('status') or {}
+        data = response.get('data')
+        task = (data.get('taskid') or data.get('task')) if isinstance(data, dict) else None
+
+        for device in devices:
+            self[device] = DeviceResult(device, status=status, task=task)
+
+        if task and status.get('code', 0) == 0:
+            self.tasks[task] = list(devices)
+
+    def updated(self, devices: list, result: list):
+        """Sets the result of every device in a chunk from the params block returned for it.
+
+        Args:
+            devices (list): Names of the devices in the chunk.
+            result (list): JSON data of every params block, in the order of the devices.
+        """
+
+        result = list(result or ())
+
+        for index, device in enumerate(devices):
+            block = result[index] if index < len(result) and isinstance(result[index], dict) else {}
+            self[device] = DeviceResult(device, status=block.get('status') or UNKNOWN_STATUS)
+
+    def merge(self, other):
+        """Adds the results and tasks of another DeviceResults, replacing the results of the same devices.
+        """
+
+        self.update(other)
+        self.tasks.update(other.tasks)
+
+    def failed_chunk(self, devices: list, error: Exception):
+        """Sets the result of every device in a chunk whose request raised an exception.
+        """
+
+        for device in devices:
+            self[device] = DeviceResult(device, status={"code": -1, "message": str(error)}, detail=repr(error), error=error)
+
+    def timed_out(self, error: Exception):
+        """Sets the result of every device whose task had not finished when waiting for the tasks timed out.
+
+        Args:
+            error (TaskTimeout): The timeout, with the IDs of the unfinished tasks.
+        """
+
+        for task in error.task:
+            for device in self.tasks.get(task, ()):
+                self[device] = DeviceResult(device, status={"code": -1, "message": str(error)}, task=task)
+
+    def finished(self, task: int, state: int, lines: list):
+        """Sets the result of every device handled by a finished task from the task lines.
+
+        Args:
+            task (int): ID of the task.
+            state (int): Final state of the task.
+            lines (list): JSON data of the task lines.
+        """
+
+        lines = {line.get('name'): line for line in lines or () if isinstance(line, dict)}
+
+        for device in self.tasks.get(task, ()):
+            line = lines.get(device)
+
+            if line is None:
+                status = {"code": 0, "message": "OK"} if state in (STATE_DONE, STATE_WARNING) else UNKNOWN_STATUS
+                self[device] = DeviceResult(device, status=status, task=task)
+                continue
+
+            ok = line.get('state') in (STATE_DONE, STATE_WARNING) and not line.get('err')
+            detail = line.get('detail')
+            status = {"code": 0, "message": "OK"} if ok else {"code": line.get('err') or -1, "message": detail or "Failed"}
+
+            self[device] = DeviceResult(device, status=status, task=task, detail=detail)
+
+
+def unique(items: list, key):
+    """Returns the items by name, where key returns the name of an item.
+
+    Raises:
+        ValueError: If two items have the same name.
+    """
+
+    result = {}
+
+    for item in items:
+        name = key(item)
+
+        if name in result:
+            raise ValueError(f"Duplicate device name: {name}")
+
+        result[name] = item
+
+    return result
+
+
+def chunked(items: list, size: int):
+    """Splits items into lists of at most size items.
+    """
+
+    items = list(items)
+
+    for index in range(0, len(items), size):
+        yield items[index:index + size]
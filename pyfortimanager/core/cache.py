@@ -0,0 +1,146 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from pyfortimanager.core.methods import NO_INVALIDATE_EXEC, READ_ONLY_EXEC, call_key
+
+
+class ResponseCache(object):
+    """Size-bounded LRU cache with time-to-live for read-only calls.
+
+    Responses are cached per method, url and params. Writes (set, update, add, delete) through any model remove cached responses for the same url prefix, both before they are sent and after they complete. exec calls that may change data clear the whole cache. A read that was in flight while the cache was invalidated is not cached, so it cannot put back data from before the write.
+
+    Every hit returns a copy of the cached response, so callers may modify it.
+
+    Args:
+        maxsize (int): Maximum number of cached responses. Default is 1024.
+        ttl (float): Seconds a response is cached. Set to 0 to only cache the urls in ttls. Default is 60.
+        ttls (dict, optional): Seconds a response is cached per url prefix. The longest matching prefix is used. Ex. { "/dvmdb/adom": 300, "/um/image/version/list": 3600 }
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60, ttls: dict = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.hits = 0
+        self.misses = 0
+
+        # Incremented on every invalidation, responses of reads sent before it are not cached
+        self.generation = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def cacheable(self, method: str, params: dict):
+        """Returns True if the call is a read-only call with a time-to-live.
+        """
+
+        url = params.get('url') or ""
+
+        if method != "get" and not (method == "exec" and url in READ_ONLY_EXEC):
+            return False
+
+        return self.ttl_for(url) > 0
+
+    def ttl_for(self, url: str):
+        """Returns the time-to-live for a url.
+        """
+
+        ttl = self.ttl
+        match = ""
+
+        for prefix, prefix_ttl in self.ttls.items():
+            if url.startswith(prefix) and len(prefix) > len(match):
+                ttl = prefix_ttl
+                match = prefix
+
+        return ttl
+
+    def get(self, method: str, params: dict):
+        """Returns a copy of a cached response, or None if there is no valid cached response.
+        """
+
+        key = call_key(method, params)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            response = entry[1]
+
+        return copy.deepcopy(response)
+
+    def set(self, method: str, params: dict, response: dict, generation: int = None):
+        """Caches a copy of a response. Only successful responses are cached.
+
+        Args:
+            method (str): The method of the call.
+            params (dict): The params block of the call.
+            response (dict): JSON data of the call.
+            generation (int, optional): The generation of the cache when the call was sent. The response is dropped if the cache has been invalidated since.
+        """
+
+        if not response or response.get('status', {}).get('code') != 0:
+            return
+
+        key = call_key(method, params)
+        expires = time.monotonic() + self.ttl_for(params.get('url') or "")
+        response = copy.deepcopy(response)
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            self._entries[key] = (expires, response)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, method: str, params: dict):
+        """Removes the cached responses affected by a call.
+        """
+
+        if method == "get" or (method == "exec" and params.get('url') in READ_ONLY_EXEC + NO_INVALIDATE_EXEC):
+            return
+
+        if method == "exec":
+            self.clear()
+            return
+
+        url = (params.get('url') or "").rstrip("/")
+
+        with self._lock:
+            self.generation += 1
+
+            for key in [key for key in self._entries if _overlaps(key[1] or "", url)]:
+                del self._entries[key]
+
+    def clear(self):
+        """Removes all cached responses.
+        """
+
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+
+def _overlaps(cached_url: str, url: str):
+    """Returns True if one of the urls is the other url or one of its parents.
+    """
+
+    cached_url = cached_url.rstrip("/")
+
+    return cached_url == url or cached_url.startswith(url + "/") or url.startswith(cached_url + "/")
@@ -0,0 +1,63 @@
+import json
+
+
+class JSONCodec(object):
+    """Encodes request bodies and decodes response bodies using the json module from the standard library.
+    """
+
+    name = "json"
+
+    def dumps(self, obj):
+        """Encodes an object as JSON.
+
+        Args:
+            obj: The object to encode.
+
+        Returns:
+            bytes: The JSON data.
+        """
+
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data):
+        """Decodes JSON data.
+
+        Args:
+            data (bytes): The JSON data.
+
+        Returns:
+            The decoded object.
+        """
+
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """Encodes request bodies and decodes response bodies using orjson.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, obj):
+        # Dict keys that are not strings are converted like the json module does, ex. {1: "a"} -> {"1": "a"}
+        return self._orjson.dumps(obj, option=self._orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+
+def default_codec():
+    """Returns the fastest installed codec, falling back to the standard library.
+
+    Returns:
+        JSONCodec: The codec.
+    """
+
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        return JSONCodec()
@@ -0,0 +1,88 @@
+import contextvars
+import time
+
+from pyfortimanager.core.exceptions import DeadlineExceeded
+
+
+# The deadline of the calls currently being made, if any.
+current_deadline = contextvars.ContextVar("pyfortimanager_deadline", default=None)
+
+
+class Deadline(object):
+    """Time budget for a group of calls.
+
+    The budget starts when the with-block is entered. Inside it, no request is sent once the budget is spent, and request timeouts are shortened to the remaining time. Operations making many calls, like map() and the iter_* methods, stop and return what they have so far.
+
+    Args:
+        seconds (float): The time budget.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = None
+        self._tokens = []
+
+    def __enter__(self):
+        # Entering the same deadline again inside its own with-block keeps the running budget
+        if not self._tokens:
+            self.expires_at = time.monotonic() + self.seconds
+
+        self._tokens.append(current_deadline.set(self))
+        return self
+
+    def __exit__(self, *exc):
+        current_deadline.reset(self._tokens.pop())
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, *exc):
+        self.__exit__(*exc)
+
+    def __repr__(self):
+        return f"Deadline(remaining={self.remaining:.3f})"
+
+    @property
+    def remaining(self):
+        """Seconds left of the budget. The whole budget until the with-block is entered.
+        """
+
+        if self.expires_at is None:
+            return float(self.seconds)
+
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self):
+        """True when the budget has been spent.
+        """
+
+        return self.remaining <= 0
+
+    def check(self):
+        """Raises DeadlineExceeded if the budget has been spent.
+        """
+
+        if self.expired:
+            raise DeadlineExceeded(f"The deadline of {self.seconds} seconds has been exceeded.")
+
+    def clip(self, timeout: float = None):
+        """Returns the timeout, shortened to the remaining time.
+
+        Args:
+            timeout (float, optional): A timeout in seconds. None means no timeout.
+        """
+
+        if timeout is None:
+            return self.remaining
+
+        return min(timeout, self.remaining)
+
+
+def expired():
+    """Returns True if the current deadline, if any, has been spent.
+    """
+
+    deadline = current_deadline.get()
+
+    return deadline is not None and deadline.expired
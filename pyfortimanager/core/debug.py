@@ -0,0 +1,303 @@
+import contextvars
+import functools
+import io
+import json
+import re
+import threading
+import time
+from collections import deque
+
+
+# Keys whose values are replaced in logged params
+REDACT_PATTERN = re.compile(r"pass|secret|token|psk|private|api[-_]?key", re.IGNORECASE)
+
+# Capture of the request currently being sent, used to time new connections
+current_capture = contextvars.ContextVar("pyfortimanager_capture", default=None)
+
+
+class Capture(object):
+    """Timings, profile and memory use of one request, collected while it runs.
+
+    Args:
+        profile (bool): Profile the request with cProfile.
+        trace_memory (bool): Measure the memory allocated during the request with tracemalloc.
+    """
+
+    def __init__(self, profile: bool = False, trace_memory: bool = False):
+        # Seconds spent resolving and connecting, if a new connection was made
+        self.connect = 0.0
+
+        self.profiler = None
+        self.stats = None
+        self.memory = None
+        self.memory_peak = None
+
+        self._memory_start = None
+        self._peak = False
+        self._token = current_capture.set(self)
+
+        if trace_memory:
+            import tracemalloc
+
+            if tracemalloc.is_tracing():
+                self._memory_start = tracemalloc.get_traced_memory()[0]
+
+                # reset_peak() needs Python 3.9, the peak is not reported without it
+                if hasattr(tracemalloc, "reset_peak"):
+                    tracemalloc.reset_peak()
+                    self._peak = True
+
+        if profile:
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+
+            try:
+                self.profiler.enable()
+            except ValueError:
+                # Another profiler is already running in this thread
+                self.profiler = None
+
+    def stop(self):
+        """Stops the profiler and memory measurement. Safe to call more than once.
+        """
+
+        if self._token is not None:
+            try:
+                current_capture.reset(self._token)
+            except ValueError:
+                # Stopped in another context, such as a different asyncio task
+                pass
+
+            self._token = None
+
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.stats = self.profiler
+            self.profiler = None
+
+        if self._memory_start is not None:
+            import tracemalloc
+
+            current, peak = tracemalloc.get_traced_memory()
+            self.memory = current - self._memory_start
+            self.memory_peak = peak - self._memory_start if self._peak else None
+            self._memory_start = None
+
+    def profile_text(self, limit: int = 20):
+        """Returns the functions with the highest cumulative time, or an empty string if the request was not profiled.
+        """
+
+        if self.stats is None:
+            return ""
+
+        import pstats
+
+        output = io.StringIO()
+        pstats.Stats(self.stats, stream=output).sort_stats("cumulative").print_stats(limit)
+
+        return output.getvalue()
+
+
+class SlowCallLog(object):
+    """Logs requests that take longer than a threshold, with redacted params, payload sizes and where the time went.
+
+    The time is split into queue wait, DNS and connect, server time until the response headers arrived, download and JSON decode. With profile=True, every request is profiled with cProfile, and slow requests are logged with the functions using the most time. With trace_memory=True, the memory allocated while sending and decoding is logged as well. Both have a cost and are meant for debugging.
+
+    Args:
+        threshold (float): Seconds a request may take before it is logged. Default is 1.
+        logger (logging.Logger, optional): Logger to write to. Defaults to the pyfortimanager logger.
+        level (int): Log level of the messages. Default is 30, logging.WARNING.
+        profile (bool): Profile every request with cProfile. Only used with Api, as asyncio runs other tasks during a request. Default is False.
+        trace_memory (bool): Measure the memory allocated during every request with tracemalloc. Tracing is process-wide, so concurrent requests are counted together. Default is False.
+        redact (re.Pattern, optional): Pattern of the keys whose values are redacted.
+        maxlen (int): Number of slow calls kept in calls. Default is 100.
+    """
+
+    def __init__(self, threshold: float = 1, logger=None, level: int = 30, profile: bool = False, trace_memory: bool = False, redact: re.Pattern = REDACT_PATTERN, maxlen: int = 100):
+        import logging
+
+        self.threshold = threshold
+        self.logger = logger or logging.getLogger("pyfortimanager")
+        self.level = level
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.redact = redact
+
+        # The most recent slow calls, as dicts
+        self.calls = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+        if trace_memory:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    def capture(self, is_async: bool = False):
+        """Starts collecting timings, and the profile and memory use if enabled, for a request.
+        """
+
+        return Capture(profile=self.profile and not is_async, trace_memory=self.trace_memory)
+
+    def report(self, call, params: list, capture: Capture):
+        """Logs the request if it took longer than the threshold.
+
+        Args:
+            call (CallMetrics): The metrics of the request.
+            params (list): Payload data for every params block.
+            capture (Capture): Timings collected while the request ran.
+        """
+
+        capture.stop()
+
+        if call.queue_wait + call.latency < self.threshold:
+            return
+
+        record = {
+            "method": call.method,
+            "url": params[0].get('url') if params else None,
+            "http_status": call.http_status,
+            "status_code": call.status_code,
+            "request_bytes": call.request_bytes,
+            "response_bytes": call.response_bytes,
+            "params": redact(params, self.redact),
+            "timings": timings(call, capture),
+        }
+
+        if capture.memory is not None:
+            record['memory'] = capture.memory
+            record['memory_peak'] = capture.memory_peak
+
+        with self._lock:
+            self.calls.append(record)
+
+        message = "Slow FortiManager call %s %s took %.3fs (%s), sent %d bytes, received %d bytes, HTTP status %s, status code %s, params %s"
+        args = [
+            record['method'],
+            record['url'],
+            call.queue_wait + call.latency,
+            ", ".join(f"{name} {seconds:.3f}s" for name, seconds in record['timings'].items() if seconds is not None),
+            call.request_bytes,
+            call.response_bytes,
+            call.http_status,
+            call.status_code,
+            json.dumps(record['params'], default=str),
+        ]
+
+        if capture.memory is not None:
+            message += ", allocated %d bytes"
+            args.append(capture.memory)
+
+        if capture.memory_peak is not None:
+            message += " (peak %d bytes)"
+            args.append(capture.memory_peak)
+
+        profile = capture.profile_text()
+
+        if profile:
+            message += "\n%s"
+            args.append(profile)
+
+        self.logger.log(self.level, message, *args)
+
+
+def timings(call, capture: Capture):
+    """Splits the time of a request into queue wait, connect, server, download and decode. Parts that were not measured are None.
+    """
+
+    connect = capture.connect
+    first_byte = call.first_byte
+
+    return {
+        "queue": call.queue_wait,
+        "connect": connect,
+        "server": max(0.0, first_byte - connect) if first_byte is not None else None,
+        "download": max(0.0, call.latency - first_byte) if first_byte is not None else None,
+        "decode": call.decode_time,
+    }
+
+
+def redact(value, pattern: re.Pattern):
+    """Returns a copy of the params with the values of sensitive keys replaced.
+    """
+
+    if isinstance(value, dict):
+        return {key: "<redacted>" if isinstance(key, str) and pattern.search(key) else redact(item, pattern) for key, item in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return [redact(item, pattern) for item in value]
+
+    return value
+
+
+def _timed(connection_class):
+    """Returns a subclass of a urllib3 connection class adding the time spent connecting to the current capture.
+    """
+
+    class TimedConnection(connection_class):
+        def connect(self):
+            start = time.monotonic()
+
+            try:
+                return super(TimedConnection, self).connect()
+            finally:
+                capture = current_capture.get()
+
+                if capture is not None:
+                    capture.connect += time.monotonic() - start
+
+    TimedConnection.__name__ = f"Timed{connection_class.__name__}"
+
+    return TimedConnection
+
+
+@functools.lru_cache(maxsize=None)
+def timed_http_adapter():
+    """Returns an HTTPAdapter class measuring the time spent resolving and connecting, used by Api when a SlowCallLog is set.
+
+    The classes are created on first use, so requests and urllib3 are only imported when needed.
+    """
+
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = _timed(HTTPConnection)
+
+    class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = _timed(HTTPSConnection)
+
+    class TimedHTTPAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            super(TimedHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": TimedHTTPConnectionPool,
+                "https": TimedHTTPSConnectionPool,
+            }
+
+    return TimedHTTPAdapter
+
+
+def aiohttp_trace_config():
+    """Returns an aiohttp TraceConfig measuring the time spent resolving and connecting, used by AsyncApi when a SlowCallLog is set.
+    """
+
+    import aiohttp
+
+    async def on_connection_create_start(session, context, params):
+        context.connect_start = time.monotonic()
+
+    async def on_connection_create_end(session, context, params):
+        capture = current_capture.get()
+
+        if capture is not None:
+            capture.connect += time.monotonic() - context.connect_start
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+
+    return trace_config
@@ -0,0 +1,53 @@
+class FortiManagerError(Exception):
+    """Base class for all pyfortimanager errors.
+    """
+
+
+class StatusError(FortiManagerError):
+    """FortiManager returned a non-zero status code for a request.
+    """
+
+    def __init__(self, status: dict, url: str = None):
+        self.status = status or {}
+        self.url = url
+        self.code = self.status.get('code')
+
+        super(StatusError, self).__init__(f"{url}: {self.status.get('message')} (code {self.code})")
+
+
+class HTTPError(FortiManagerError):
+    """FortiManager returned an HTTP status other than 200 OK.
+    """
+
+    def __init__(self, status_code: int, url: str = None):
+        self.status_code = status_code
+        self.url = url
+
+        super(HTTPError, self).__init__(f"HTTP {status_code} from {url}")
+
+
+class CircuitOpenError(FortiManagerError):
+    """The circuit breaker is open, because the FortiManager has been failing. No request was sent.
+    """
+
+
+class DeadlineExceeded(FortiManagerError):
+    """The time budget of the deadline has been spent. No request was sent.
+    """
+
+
+class TaskTimeout(FortiManagerError):
+    """One or more FortiManager tasks did not finish within the timeout. The tasks themselves keep running.
+    """
+
+    def __init__(self, task, timeout: float, state: dict = None):
+        self.task = task
+        self.timeout = timeout
+        self.state = state or {}
+
+        if isinstance(task, (list, tuple)):
+            message = f"Tasks {', '.join(str(id) for id in task)} did not finish within {timeout} seconds."
+        else:
+            message = f"Task {task} did not finish within {timeout} seconds ({self.state.get('percent', 0)}% done)."
+
+        super(TaskTimeout, self).__init__(message)
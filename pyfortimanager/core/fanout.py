@@ -0,0 +1,165 @@
+import contextvars
+
+from pyfortimanager.core.deadline import current_deadline
+from pyfortimanager.core.exceptions import DeadlineExceeded
+
+
+class MapResult(object):
+    """Result of calling a function for one item in Api.map.
+    """
+
+    __slots__ = ("index", "item", "result", "error")
+
+    def __init__(self, index: int, item, result=None, error: BaseException = None):
+        self.index = index
+        self.item = item
+        self.result = result
+        self.error = error
+
+    def __repr__(self):
+        return f"MapResult(item={self.item!r}, ok={self.ok})"
+
+    @property
+    def ok(self):
+        """True if the call did not raise an exception.
+        """
+
+        return self.error is None
+
+
+def _skipped(index: int, item):
+    return MapResult(index=index, item=item, error=DeadlineExceeded("Skipped, the deadline has been exceeded."))
+
+
+def _call(fn, index: int, item):
+    try:
+        return MapResult(index=index, item=item, result=fn(item))
+    except Exception as error:
+        return MapResult(index=index, item=item, error=error)
+
+
+def fan_out(fn, items, max_workers: int, ordered: bool = False):
+    """Calls fn for every item on a bounded thread pool, and yields a MapResult for every item.
+
+    The calls run in the context of the caller, so a deadline set by the caller applies to them. Once it has been spent, no more calls are started, and the remaining items get a MapResult with a DeadlineExceeded error.
+
+    Args:
+        fn (callable): Function called with every item.
+        items (iterable): The items.
+        max_workers (int): Number of threads.
+        ordered (bool): Yield the results in the order of the items instead of as they complete. Default is False.
+
+    Returns:
+        generator: MapResult for every item.
+    """
+
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    items = enumerate(items)
+    deadline = current_deadline.get()
+    pending = set()
+    done_items = []
+    done_results = {}
+    next_index = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        def submit():
+            # Only keep a limited number of items queued, so items can be a generator of any size
+            for index, item in items:
+                if deadline is not None and deadline.expired:
+                    done_items.append(_skipped(index, item))
+                    continue
+
+                pending.add(executor.submit(contextvars.copy_context().run, _call, fn, index, item))
+
+                if len(pending) >= max_workers * 2:
+                    return
+
+        submit()
+
+        while pending or done_items:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED) if pending else (set(), None)
+            pending.difference_update(done)
+
+            results = [future.result() for future in done] + done_items
+            done_items.clear()
+
+            for result in results:
+                if not ordered:
+                    yield result
+                    continue
+
+                done_results[result.index] = result
+
+            while next_index in done_results:
+                yield done_results.pop(next_index)
+                next_index += 1
+
+            submit()
+
+
+async def fan_out_async(fn, items, max_workers: int, ordered: bool = False):
+    """Awaits fn(item) for every item with at most max_workers in flight, and yields a MapResult for every item.
+
+    Args:
+        fn (callable): Function returning an awaitable for every item.
+        items (iterable): The items.
+        max_workers (int): Number of calls in flight.
+        ordered (bool): Yield the results in the order of the items instead of as they complete. Default is False.
+
+    Returns:
+        async generator: MapResult for every item.
+    """
+
+    import asyncio
+
+    async def call(index: int, item):
+        try:
+            return MapResult(index=index, item=item, result=await fn(item))
+        except Exception as error:
+            return MapResult(index=index, item=item, error=error)
+
+    items = enumerate(items)
+    deadline = current_deadline.get()
+    pending = set()
+    done_items = []
+    done_results = {}
+    next_index = 0
+
+    def submit():
+        for index, item in items:
+            if deadline is not None and deadline.expired:
+                done_items.append(_skipped(index, item))
+                continue
+
+            pending.add(asyncio.ensure_future(call(index, item)))
+
+            if len(pending) >= max_workers:
+                return
+
+    submit()
+
+    try:
+        while pending or done_items:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED) if pending else (set(), None)
+            pending.difference_update(done)
+
+            results = [future.result() for future in done] + done_items
+            done_items.clear()
+
+            for result in results:
+                if not ordered:
+                    yield result
+                    continue
+
+                done_results[result.index] = result
+
+            while next_index in done_results:
+                yield done_results.pop(next_index)
+                next_index += 1
+
+            submit()
+    finally:
+        # Stop the remaining calls if the consumer stops early
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,132 @@
+class Filter(object):
+    """A filter expression evaluated by FortiManager.
+
+    Filters are combined with & (and) and | (or), and compile to the JSON-RPC filter syntax. Ex. (Field("os_ver") == 7) & Field("name").like("FGT%")
+    """
+
+    def __init__(self, expression: list):
+        self.expression = expression
+
+    def __and__(self, other):
+        return Filter([self.compile(), "&&", compile_filter(other)])
+
+    def __or__(self, other):
+        return Filter([self.compile(), "||", compile_filter(other)])
+
+    def __repr__(self):
+        return f"Filter({self.expression!r})"
+
+    def compile(self):
+        """Returns the filter in the JSON-RPC filter syntax.
+
+        Returns:
+            list: The filter expression.
+        """
+
+        return self.expression
+
+
+class Field(object):
+    """An attribute to filter on. Comparing a Field returns a Filter.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __eq__(self, value):
+        return Filter([self.name, "==", value])
+
+    def __ne__(self, value):
+        return Filter([self.name, "!=", value])
+
+    def __lt__(self, value):
+        return Filter([self.name, "<", value])
+
+    def __le__(self, value):
+        return Filter([self.name, "<=", value])
+
+    def __gt__(self, value):
+        return Filter([self.name, ">", value])
+
+    def __ge__(self, value):
+        return Filter([self.name, ">=", value])
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Field({self.name!r})"
+
+    def in_(self, *values):
+        """Matches when the attribute equals any of the values.
+
+        Args:
+            *values: Values to match.
+
+        Returns:
+            Filter: The filter expression.
+        """
+
+        return Filter([self.name, "in", *values])
+
+    def like(self, pattern: str):
+        """Matches the attribute against a pattern. Use % as a wildcard.
+
+        Args:
+            pattern (str): Pattern to match. Ex. FGT60F%
+
+        Returns:
+            Filter: The filter expression.
+        """
+
+        return Filter([self.name, "like", pattern])
+
+
+def all_of(*filters):
+    """Combines filters so all of them must match.
+
+    Returns:
+        Filter: The filter expression.
+    """
+
+    return _combine("&&", filters)
+
+
+def any_of(*filters):
+    """Combines filters so at least one of them must match.
+
+    Returns:
+        Filter: The filter expression.
+    """
+
+    return _combine("||", filters)
+
+
+def _combine(operator: str, filters: tuple):
+    expression = []
+
+    for filter in filters:
+        if expression:
+            expression.append(operator)
+
+        expression.append(compile_filter(filter))
+
+    if len(expression) == 1:
+        return Filter(expression[0])
+
+    return Filter(expression)
+
+
+def compile_filter(filter):
+    """Returns a filter in the JSON-RPC filter syntax.
+
+    Args:
+        filter (Filter or list): A Filter, or a filter already in the JSON-RPC filter syntax.
+
+    Returns:
+        list: The filter expression.
+    """
+
+    if isinstance(filter, Filter):
+        return filter.compile()
+
+    return filter
@@ -1,4 +1,20 @@
-import requests
+import contextlib
+import contextvars
+import sys
+import time
+import types
+from collections.abc import Awaitable
+
+from pyfortimanager.core.batch import BatchResult, current_batch
+from pyfortimanager.core.bulk import DeviceResults
+from pyfortimanager.core.deadline import Deadline, current_deadline, expired
+from pyfortimanager.core.exceptions import DeadlineExceeded, HTTPError, StatusError, TaskTimeout
+from pyfortimanager.core.filters import compile_filter
+from pyfortimanager.core.metrics import CallMetrics
+from pyfortimanager.core.methods import call_key, is_read_only, url_template
+from pyfortimanager.core.retry import cancelled
+from pyfortimanager.core.stream import StreamDecoder, import_ijson
+from pyfortimanager.core.tracing import current_span, start_span, trace_method
 
 
 class FortiManager(object):
@@ -9,28 +25,952 @@ class FortiManager(object):
         self.api = api
         self.base_url = f"{self.api.host}/jsonrpc"
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Trace the public methods of every model, if the API has a tracer
+        for name, value in list(vars(cls).items()):
+            if not name.startswith("_") and isinstance(value, types.FunctionType):
+                setattr(cls, name, trace_method(f"{cls.__name__}.{name}", value))
+
     def post(self, method: str, params: dict):
         """Sends a POST request to the FortiManager API.
 
+        When called inside a batch, the request is queued and a BatchResult is returned instead. When using AsyncApi, a coroutine is returned.
+
         Args:
             method (str): get, exec, add, set, update, delete.
             params (dict): Payload data to send with the request.
 
+        Raises:
+            HTTPError: If FortiManager returns an HTTP status other than 200 OK.
+            CircuitOpenError: If the circuit breaker is open.
+
         Returns:
             dict: JSON data.
         """
 
-        headers = {
-            "Authorization": f"Bearer {self.api.token}"
+        batch = current_batch.get()
+        if batch is not None and batch.api is self.api:
+            span = current_span.get()
+
+            if span is not None:
+                span.set_attribute("pyfortimanager.batched", True)
+
+            return batch.add(method=method, params=params)
+
+        cache = self.api.cache
+        cacheable = cache is not None and cache.cacheable(method, params)
+
+        if cacheable:
+            response = cache.get(method, params)
+
+            if response is not None:
+                return self._cached(response)
+
+            generation = cache.generation
+
+        if self.api.coalesce and is_read_only(method, params):
+            results = self._coalesced(method=method, params=params)
+        else:
+            results = self.send(method=method, params=[params])
+
+        def first(results):
+            response = results[0] if results else None
+
+            if cacheable:
+                cache.set(method, params, response, generation=generation)
+
+            return response
+
+        return self._then(results, first)
+
+    def _coalesced(self, method: str, params: dict):
+        """Sends a read-only request, sharing the result with identical requests already in flight.
+        """
+
+        key = call_key(method, params)
+
+        if self.api.is_async:
+            return self.api.single_flight.do_async(key, lambda: self.send(method=method, params=[params]))
+
+        return self.api.single_flight.do(key, lambda: self.send(method=method, params=[params]))
+
+    def _cached(self, response: dict):
+        """Returns a cached response the same way as a response from the FortiManager.
+        """
+
+        if self.api.is_async:
+            async def cached():
+                return response
+
+            return cached()
+
+        return response
+
+    def send(self, method: str, params: list):
+        """Sends one JSON-RPC request with one or more params blocks.
+
+        Failed requests are retried according to the retry policy set on the API.
+
+        Args:
+            method (str): get, exec, add, set, update, delete.
+            params (list): Payload data for every params block.
+
+        Raises:
+            HTTPError: If FortiManager returns an HTTP status other than 200 OK.
+            CircuitOpenError: If the circuit breaker is open.
+
+        Returns:
+            list: JSON data for every params block.
+        """
+
+        if self.api.is_async:
+            return self.send_async(method=method, params=params)
+
+        self._invalidate(method, params)
+
+        try:
+            return self._send_retried(method=method, params=params)
+        finally:
+            # Reads sent while the write was in flight may have cached the old data
+            self._invalidate(method, params)
+
+    def _send_retried(self, method: str, params: list):
+        deadline = current_deadline.get()
+        attempt = 0
+
+        while True:
+            if deadline is not None:
+                deadline.check()
+
+            try:
+                return self._send_hedged(method=method, params=params)
+            except Exception as error:
+                self._check_deadline(deadline, error)
+                delay = self._retry_delay(attempt, method, params, error, deadline)
+
+                if delay is None:
+                    raise
+
+            time.sleep(delay)
+            attempt += 1
+
+    def _invalidate(self, method: str, params: list):
+        """Removes the cached responses affected by a request from the cache, if the API has one.
+        """
+
+        if self.api.cache is not None:
+            for block in params:
+                self.api.cache.invalidate(method, block)
+
+    def _send_hedged(self, method: str, params: list):
+        """Sends a request, hedging it if it is read-only and the API has a hedge policy.
+        """
+
+        if self.api.hedge is None or not all(is_read_only(method, block) for block in params):
+            return self._send_once(method=method, params=params)
+
+        return self.api.hedge.run(self._endpoint(method, params), lambda: self._send_once(method=method, params=params))
+
+    async def _send_hedged_async(self, method: str, params: list):
+        if self.api.hedge is None or not all(is_read_only(method, block) for block in params):
+            return await self._send_once_async(method=method, params=params)
+
+        return await self.api.hedge.run_async(self._endpoint(method, params), lambda: self._send_once_async(method=method, params=params))
+
+    def _endpoint(self, method: str, params: list):
+        """Returns the method and url template of a request, used to track latency per endpoint.
+        """
+
+        return f"{method} {url_template(params[0].get('url'))}"
+
+    def _send_once(self, method: str, params: list):
+        # Encode first, so a payload that cannot be encoded holds no limiter slot or circuit breaker trial
+        data = self._data(method, params)
+        call = CallMetrics(method, params)
+        call.request_bytes = len(data)
+        span = None
+        capture = None
+
+        self._before()
+        queued = time.monotonic()
+        start = self._acquire()
+
+        try:
+            capture = self._capture()
+            call.queue_wait = start - queued
+            span = self._start_span(call, params)
+            response = self.api.transport.send(url=self.base_url, data=data, headers=self._headers(), timeout=self._timeout())
+        except BaseException:
+            call.latency = self._release(start, method, params)
+            self._record(call, params, span, capture)
+            raise
+
+        call.latency = self._release(start, method, params, response.status_code)
+        call.http_status = response.status_code
+        call.first_byte = response.first_byte
+        call.response_bytes = len(response.content)
+
+        try:
+            # HTTP 200 OK
+            if response.status_code == 200:
+                return self._decode(call, response.content)
+        finally:
+            self._record(call, params, span, capture)
+
+        raise HTTPError(status_code=response.status_code, url=params[0].get('url'))
+
+    async def send_async(self, method: str, params: list):
+        """Sends one JSON-RPC request with one or more params blocks, using the transport of AsyncApi.
+
+        Args:
+            method (str): get, exec, add, set, update, delete.
+            params (list): Payload data for every params block.
+
+        Returns:
+            list: JSON data for every params block.
+        """
+
+        self._invalidate(method, params)
+
+        try:
+            return await self._send_retried_async(method=method, params=params)
+        finally:
+            self._invalidate(method, params)
+
+    async def _send_retried_async(self, method: str, params: list):
+        deadline = current_deadline.get()
+        attempt = 0
+
+        while True:
+            if deadline is not None:
+                deadline.check()
+
+            try:
+                return await self._send_hedged_async(method=method, params=params)
+            except Exception as error:
+                self._check_deadline(deadline, error)
+                delay = self._retry_delay(attempt, method, params, error, deadline)
+
+                if delay is None:
+                    raise
+
+            import asyncio
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _check_deadline(self, deadline: Deadline, error: Exception):
+        """Raises DeadlineExceeded if a request failed because the deadline was spent while it was in flight.
+        """
+
+        if deadline is not None and deadline.expired and not isinstance(error, DeadlineExceeded):
+            raise DeadlineExceeded(f"The deadline of {deadline.seconds} seconds has been exceeded.") from error
+
+    def _retry_delay(self, attempt: int, method: str, params: list, error: Exception, deadline: Deadline = None):
+        """Returns the seconds to wait before retrying a failed request, or None if it should not be retried.
+        """
+
+        if self.api.retry is None or not self.api.retry.should_retry(attempt, method, params, error):
+            return None
+
+        delay = self.api.retry.delay(attempt)
+
+        # No point in waiting if the deadline passes before the retry
+        if deadline is not None and delay >= deadline.remaining:
+            return None
+
+        return delay
+
+    async def _send_once_async(self, method: str, params: list):
+        data = self._data(method, params)
+        call = CallMetrics(method, params)
+        call.request_bytes = len(data)
+        span = None
+        capture = None
+        queued = time.monotonic()
+
+        async with self._slot():
+            self._before()
+            start = await self._acquire_async()
+
+            try:
+                capture = self._capture()
+                call.queue_wait = start - queued
+                span = self._start_span(call, params)
+                response = await self.api.transport.send_async(url=self.base_url, data=data, headers=self._headers(), timeout=self._timeout())
+            except BaseException:
+                call.latency = self._release(start, method, params)
+                self._record(call, params, span, capture)
+                raise
+
+            call.latency = self._release(start, method, params, response.status_code)
+            call.http_status = response.status_code
+            call.first_byte = response.first_byte
+            call.response_bytes = len(response.content)
+
+        try:
+            # HTTP 200 OK
+            if call.http_status == 200:
+                return self._decode(call, response.content)
+        finally:
+            self._record(call, params, span, capture)
+
+        raise HTTPError(status_code=call.http_status, url=params[0].get('url'))
+
+    def _decode(self, call: CallMetrics, content: bytes):
+        """Decodes the JSON data of a response, and adds the decode time and FortiManager status code to the metrics.
+        """
+
+        start = time.monotonic()
+        result = self.api.codec.loads(content)['result']
+
+        call.decode_time = time.monotonic() - start
+        call.set_result(result)
+
+        return result
+
+    def _timeout(self):
+        """Returns the connect and read timeouts for a request, shortened to the remaining time of the current deadline.
+        """
+
+        connect_timeout = self.api.connect_timeout
+        read_timeout = self.api.read_timeout
+        deadline = current_deadline.get()
+
+        if deadline is not None:
+            connect_timeout = deadline.clip(connect_timeout)
+            read_timeout = deadline.clip(read_timeout)
+
+        return (connect_timeout, read_timeout)
+
+    def _before(self):
+        """Raises CircuitOpenError if the circuit breaker, if any, is open.
+        """
+
+        if self.api.circuit_breaker is not None:
+            self.api.circuit_breaker.before()
+
+    def _acquire(self):
+        """Waits for the adaptive limiter, if any, and returns the start time of the request.
+
+        The wait is bounded by the current deadline, if any, which is checked again once the limiter lets the request through.
+        """
+
+        deadline = current_deadline.get()
+        acquired = False
+
+        try:
+            if self.api.limiter is not None:
+                acquired = self.api.limiter.acquire(timeout=None if deadline is None else deadline.remaining)
+
+                if not acquired:
+                    raise DeadlineExceeded(f"The deadline of {deadline.seconds} seconds has been exceeded.")
+
+            if deadline is not None:
+                deadline.check()
+        except BaseException:
+            self._unacquire(acquired)
+            raise
+
+        return time.monotonic()
+
+    async def _acquire_async(self):
+        deadline = current_deadline.get()
+        acquired = False
+
+        try:
+            if self.api.limiter is not None:
+                acquired = await self.api.limiter.acquire_async(timeout=None if deadline is None else deadline.remaining)
+
+                if not acquired:
+                    raise DeadlineExceeded(f"The deadline of {deadline.seconds} seconds has been exceeded.")
+
+            if deadline is not None:
+                deadline.check()
+        except BaseException:
+            self._unacquire(acquired)
+            raise
+
+        return time.monotonic()
+
+    def _unacquire(self, acquired: bool):
+        """Gives back the limiter slot, if acquired, and the circuit breaker trial, if any, of a request that will not be sent.
+        """
+
+        if acquired:
+            self.api.limiter.cancel()
+
+        self._cancel()
+
+    @contextlib.asynccontextmanager
+    async def _slot(self):
+        """Holds one of the max_concurrency slots of AsyncApi. The wait is bounded by the current deadline, if any.
+        """
+
+        import asyncio
+
+        semaphore = self.api.semaphore
+        deadline = current_deadline.get()
+
+        if deadline is None:
+            await semaphore.acquire()
+        else:
+            try:
+                await asyncio.wait_for(semaphore.acquire(), deadline.remaining)
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(f"The deadline of {deadline.seconds} seconds has been exceeded.") from None
+
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def _cancel(self):
+        """Gives back the circuit breaker trial, if any, of a request that was never sent.
+        """
+
+        if self.api.circuit_breaker is not None:
+            self.api.circuit_breaker.cancel()
+
+    def _release(self, start: float, method: str, params: list, status: int = None):
+        """Reports a finished request to the adaptive limiter, circuit breaker and hedge policy, if any. A missing status means the request raised an exception.
+
+        Called while an exception is raised if the request failed. A cancelled request only gives back its limiter slot and circuit breaker trial.
+
+        Returns:
+            float: Seconds since the start of the request.
+        """
+
+        latency = time.monotonic() - start
+
+        if cancelled(sys.exc_info()[1]):
+            if self.api.limiter is not None:
+                self.api.limiter.cancel()
+
+            self._cancel()
+
+            return latency
+
+        failed = status is None or status >= 500 or status == 429
+        endpoint = self._endpoint(method, params)
+
+        if self.api.limiter is not None:
+            self.api.limiter.release(latency=latency, key=endpoint, error=failed)
+
+        if self.api.hedge is not None and status == 200:
+            self.api.hedge.record(endpoint, latency)
+
+        if self.api.circuit_breaker is not None:
+            if failed:
+                self.api.circuit_breaker.failure()
+            else:
+                self.api.circuit_breaker.success()
+
+        return latency
+
+    def _start_span(self, call: CallMetrics, params: list):
+        """Starts the span of an HTTP request, if the API has a tracer.
+        """
+
+        return start_span(self.api.tracer, f"jsonrpc {call.method} {call.url}", {
+            "http.request.method": "POST",
+            "url.full": self.base_url,
+            "rpc.system": "jsonrpc",
+            "rpc.method": call.method,
+            "pyfortimanager.url": params[0].get('url') or "",
+            "pyfortimanager.adom": call.adom,
+            "pyfortimanager.params": len(params),
+        })
+
+    def _capture(self):
+        """Starts collecting the timings of a request for the slow call log, if the API has one.
+        """
+
+        if self.api.debug is None:
+            return None
+
+        return self.api.debug.capture(is_async=self.api.is_async)
+
+    def _record(self, call: CallMetrics, params: list, span=None, capture=None):
+        """Reports the metrics of a finished request to the metrics and slow call log, if the API has them, and ends its span.
+
+        Called while an exception is raised if the request failed. A cancelled request is not counted, and its span ends without an error.
+        """
+
+        error = sys.exc_info()[1]
+
+        if cancelled(error):
+            if capture is not None:
+                capture.stop()
+
+            if span is not None:
+                span.set_attribute("pyfortimanager.cancelled", True)
+                span.end()
+
+            return
+
+        if self.api.metrics is not None:
+            self.api.metrics.record(call)
+
+        if capture is not None:
+            self.api.debug.report(call, params, capture)
+
+        if span is None:
+            return
+
+        if call.http_status is not None:
+            span.set_attribute("http.response.status_code", call.http_status)
+
+        if call.status_code is not None:
+            span.set_attribute("pyfortimanager.status_code", call.status_code)
+
+        span.set_attribute("http.request.body.size", call.request_bytes)
+        span.set_attribute("http.response.body.size", call.response_bytes)
+
+        # A stream closed early by the caller is not an error
+        if error is not None and not isinstance(error, GeneratorExit):
+            span.record_error(error)
+        elif call.http_status != 200:
+            span.record_error(HTTPError(status_code=call.http_status, url=span.attributes.get("pyfortimanager.url")))
+
+        span.end()
+
+    def stream(self, params: dict):
+        """Sends a get request and yields the objects in the response as they are decoded, so only one object is held in memory at a time. Requires ijson.
+
+        Args:
+            params (dict): Payload data to send with the request.
+
+        Raises:
+            StatusError: If FortiManager returns an error.
+
+        Returns:
+            generator: The objects, or an async generator when using AsyncApi.
+        """
+
+        if self.api.is_async:
+            return self.stream_async(params=params)
+
+        return self._stream_sync(params=params)
+
+    def _stream_sync(self, params: dict):
+        ijson = import_ijson()
+        decoder = StreamDecoder()
+
+        data = self._data("get", [params])
+        call = CallMetrics("get", [params])
+        call.request_bytes = len(data)
+        span = None
+        capture = None
+
+        self._before()
+        queued = time.monotonic()
+        start = self._acquire()
+
+        try:
+            capture = self._capture()
+            call.queue_wait = start - queued
+            span = self._start_span(call, [params])
+
+            with self.api.transport.stream(url=self.base_url, data=data, headers=self._headers(), timeout=self._timeout()) as response:
+                call.first_byte = response.first_byte
+                call.http_status = response.status_code
+
+                if response.status_code != 200:
+                    raise HTTPError(status_code=response.status_code, url=params['url'])
+
+                try:
+                    for prefix, event, value in ijson.parse(response.raw, use_float=True):
+                        complete, item = decoder.feed(prefix, event, value)
+                        if complete:
+                            yield item
+                finally:
+                    call.response_bytes = response.bytes_read()
+        finally:
+            call.latency = self._release(start, "get", [params], call.http_status)
+            call.status_code = decoder.status.get('code')
+            self._record(call, [params], span, capture)
+
+        self._check_stream_status(decoder, params)
+
+    async def stream_async(self, params: dict):
+        """Sends a get request and yields the objects in the response as they are decoded, when using AsyncApi. Requires ijson.
+        """
+
+        ijson = import_ijson()
+        decoder = StreamDecoder()
+        data = self._data("get", [params])
+        call = CallMetrics("get", [params])
+        call.request_bytes = len(data)
+        span = None
+        capture = None
+        queued = time.monotonic()
+
+        async with self._slot():
+            self._before()
+            start = await self._acquire_async()
+
+            try:
+                capture = self._capture()
+                call.queue_wait = start - queued
+                span = self._start_span(call, [params])
+
+                async with self.api.transport.stream_async(url=self.base_url, data=data, headers=self._headers(), timeout=self._timeout()) as response:
+                    call.first_byte = response.first_byte
+                    call.http_status = response.status_code
+
+                    if response.status_code != 200:
+                        raise HTTPError(status_code=response.status_code, url=params['url'])
+
+                    try:
+                        async for prefix, event, value in ijson.parse(response.raw, use_float=True):
+                            complete, item = decoder.feed(prefix, event, value)
+                            if complete:
+                                yield item
+                    finally:
+                        call.response_bytes = response.bytes_read()
+            finally:
+                call.latency = self._release(start, "get", [params], call.http_status)
+                call.status_code = decoder.status.get('code')
+                self._record(call, [params], span, capture)
+
+        self._check_stream_status(decoder, params)
+
+    def _check_stream_status(self, decoder, params: dict):
+        if decoder.status.get('code', 0) != 0:
+            raise StatusError(status=decoder.status, url=params['url'])
+
+    def _headers(self):
+        return {
+            "Authorization": f"Bearer {self.api.token}",
+            "Content-Type": "application/json"
         }
 
-        data = {
+    def _data(self, method: str, params: list):
+        """Encodes the JSON-RPC request body with the codec set on the API.
+        """
+
+        return self.api.codec.dumps({
             "method": method,
-            "params": [params]
-        }
+            "params": params
+        })
+
+    def _get_options(self, params: dict, fields: list = None, option: list = None, loadsub: bool = None, filter: list = None):
+        """Adds the optional get parameters to a request, letting FortiManager trim the response.
+
+        Args:
+            params (dict): Payload data of the request.
+            fields (list, optional): Only return these attributes.
+            option (list, optional): Options for the request. Replaces any default option.
+            loadsub (bool, optional): Enable or disable the return of any sub-objects.
+            filter (Filter or list, optional): Only return objects matching the filter.
+
+        Returns:
+            dict: The updated payload data.
+        """
+
+        if fields:
+            params['fields'] = fields
+
+        if option is not None:
+            params['option'] = option
+
+        if loadsub is not None:
+            params['loadsub'] = loadsub
+
+        if filter is not None:
+            params['filter'] = compile_filter(filter)
+
+        return params
+
+    def _get_page(self, params: dict, offset: int, page_size: int):
+        """Retrieves one page of a get request using the range option.
+
+        Raises:
+            StatusError: If FortiManager returns an error.
+
+        Returns:
+            list: The objects on the page.
+        """
+
+        results = self.send(method="get", params=[self._page_params(params, offset, page_size)])
+
+        return self._page_data(results, params)
+
+    async def _get_page_async(self, params: dict, offset: int, page_size: int):
+        """Retrieves one page of a get request using the range option, when using AsyncApi.
+        """
+
+        results = await self.send(method="get", params=[self._page_params(params, offset, page_size)])
+
+        return self._page_data(results, params)
+
+    def _page_params(self, params: dict, offset: int, page_size: int):
+        # No page size means everything in one request
+        if not page_size:
+            return params
+
+        return dict(params, range=[offset, page_size])
+
+    def _page_data(self, results: list, params: dict):
+        response = results[0] if results else None
+
+        if response is None:
+            raise StatusError(status={"message": "No response from FortiManager"}, url=params['url'])
+
+        if response['status']['code'] != 0:
+            raise StatusError(status=response['status'], url=params['url'])
+
+        return response.get('data') or []
+
+    def _iterate(self, params: dict, page_size: int = 1000, prefetch: bool = False, stream: bool = False):
+        """Yields the objects of a get request one at a time, fetching them in pages using the range option.
+
+        Iteration stops early, without raising, when the current deadline has been spent.
+
+        Args:
+            params (dict): Payload data of the get request.
+            page_size (int): Number of objects to fetch per request. Set to None to retrieve everything in one request. Default is 1000.
+            prefetch (bool): Fetch the next page in the background while the current page is consumed. Default is False.
+            stream (bool): Decode every page incrementally, see stream(). Cannot be combined with prefetch. Default is False.
+
+        Returns:
+            generator: The objects, or an async generator when using AsyncApi.
+        """
+
+        if stream and prefetch:
+            raise ValueError("stream and prefetch cannot be combined.")
+
+        if self.api.is_async:
+            if stream:
+                return self._until_deadline_async(self._iterate_stream_async(params=params, page_size=page_size))
+
+            return self._until_deadline_async(self._iterate_async(params=params, page_size=page_size, prefetch=prefetch))
+
+        if stream:
+            return self._until_deadline(self._iterate_stream_sync(params=params, page_size=page_size))
+
+        return self._until_deadline(self._iterate_sync(params=params, page_size=page_size, prefetch=prefetch))
+
+    def _until_deadline(self, items):
+        """Yields from items, stopping without raising when the current deadline has been spent.
+        """
+
+        try:
+            yield from items
+        except DeadlineExceeded:
+            return
+
+    async def _until_deadline_async(self, items):
+        try:
+            async for item in items:
+                yield item
+        except DeadlineExceeded:
+            return
+
+    def _iterate_sync(self, params: dict, page_size: int, prefetch: bool):
+        offset = 0
+        page = self._get_page(params=params, offset=offset, page_size=page_size)
+        executor = None
+        next_page = None
+
+        if prefetch:
+            from concurrent.futures import ThreadPoolExecutor
+
+            executor = ThreadPoolExecutor(max_workers=1)
+
+        try:
+            while True:
+                offset += page_size or 0
+                next_page = None
+
+                # A full page means there may be more objects
+                if executor is not None and page_size and len(page) == page_size:
+                    next_page = executor.submit(contextvars.copy_context().run, self._get_page, params, offset, page_size)
+
+                yield from page
+
+                if not page_size or len(page) < page_size or expired():
+                    return
+
+                page = next_page.result() if next_page else self._get_page(params=params, offset=offset, page_size=page_size)
+        finally:
+            # Do not wait for a prefetched page the caller stopped before
+            if next_page is not None:
+                next_page.cancel()
+
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    async def _iterate_async(self, params: dict, page_size: int, prefetch: bool):
+        import asyncio
+
+        offset = 0
+        page = await self._get_page_async(params=params, offset=offset, page_size=page_size)
+
+        next_page = None
+
+        try:
+            while True:
+                offset += page_size or 0
+                next_page = None
+
+                # A full page means there may be more objects
+                if prefetch and page_size and len(page) == page_size:
+                    next_page = asyncio.ensure_future(self._get_page_async(params=params, offset=offset, page_size=page_size))
+
+                for item in page:
+                    yield item
+
+                if not page_size or len(page) < page_size or expired():
+                    return
+
+                page = await next_page if next_page else await self._get_page_async(params=params, offset=offset, page_size=page_size)
+        finally:
+            # Stop fetching if the consumer stops early
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+
+    def _iterate_stream_sync(self, params: dict, page_size: int):
+        offset = 0
+
+        while True:
+            count = 0
+
+            for item in self._stream_sync(params=self._page_params(params, offset, page_size)):
+                count += 1
+                yield item
+
+            if not page_size or count < page_size or expired():
+                return
+
+            offset += page_size
+
+    async def _iterate_stream_async(self, params: dict, page_size: int):
+        offset = 0
+
+        while True:
+            count = 0
+
+            async for item in self.stream_async(params=self._page_params(params, offset, page_size)):
+                count += 1
+                yield item
+
+            if not page_size or count < page_size or expired():
+                return
+
+            offset += page_size
+
+    def _bulk(self, method: str, devices: dict, chunks, wait: bool = False, timeout: float = None, retries: int = 0, max_workers: int = 1):
+        """Sends devices in chunks, waits for the created tasks if wait is set, and sends the devices that failed again up to retries times.
+
+        Args:
+            method (str): get, exec, add, set, update, delete.
+            devices (dict): The entry of every device by name, as passed to chunks.
+            chunks (callable): Function called with a list of entries, yielding the device names and params of every chunk. The params are a dict for a command handling all devices of the chunk, or a list with a params block for every device.
+            wait (bool): Wait for the tasks to finish.
+            timeout (float, optional): Seconds to wait for the tasks.
+            retries (int): Number of times the devices whose request raised an exception are sent again.
+            max_workers (int): Number of chunks sent at the same time, using map(). Default is 1.
+
+        Returns:
+            DeviceResults: The result of every device, or a coroutine when using AsyncApi.
+        """
+
+        if self.api.is_async:
+            return self._bulk_async(method=method, devices=devices, chunks=chunks, wait=wait, timeout=timeout, retries=retries, max_workers=max_workers)
+
+        results = DeviceResults()
+        pending = list(devices)
+
+        for _ in range(retries + 1):
+            tasks = DeviceResults()
+
+            for result in self.api.map(lambda chunk: self._send_chunk(method, chunk[1]), chunks([devices[name] for name in pending]), max_workers=max_workers, ordered=True):
+                self._chunk_result(results, tasks, result)
+
+            if wait and tasks.tasks:
+                try:
+                    for event in self.api.system.watch_tasks(list(tasks.tasks), timeout=timeout):
+                        tasks.finished(event.task, event.state, self.api.system.tasks(task=event.task).get('data'))
+                except TaskTimeout as error:
+                    tasks.timed_out(error)
+
+            results.merge(tasks)
+            pending = [name for name in pending if results[name].retriable]
+
+            if not pending:
+                break
+
+        return results
+
+    async def _bulk_async(self, method: str, devices: dict, chunks, wait: bool, timeout: float, retries: int, max_workers: int):
+        results = DeviceResults()
+        pending = list(devices)
+
+        for _ in range(retries + 1):
+            tasks = DeviceResults()
+
+            async for result in self.api.map(lambda chunk: self._send_chunk(method, chunk[1]), chunks([devices[name] for name in pending]), max_workers=max_workers, ordered=True):
+                self._chunk_result(results, tasks, result)
+
+            if wait and tasks.tasks:
+                try:
+                    async for event in self.api.system.watch_tasks(list(tasks.tasks), timeout=timeout):
+                        tasks.finished(event.task, event.state, (await self.api.system.tasks(task=event.task)).get('data'))
+                except TaskTimeout as error:
+                    tasks.timed_out(error)
+
+            results.merge(tasks)
+            pending = [name for name in pending if results[name].retriable]
+
+            if not pending:
+                break
+
+        return results
+
+    def _send_chunk(self, method: str, params):
+        """Sends the request of a chunk of a bulk operation, see _bulk().
+        """
+
+        if isinstance(params, list):
+            return self.send(method=method, params=params)
+
+        return self.post(method=method, params=params)
+
+    def _chunk_result(self, results: DeviceResults, tasks: DeviceResults, result):
+        """Sets the results of the devices in a chunk from its MapResult. Chunks creating a task are added to tasks.
+        """
+
+        names, params = result.item
+
+        if not result.ok:
+            results.failed_chunk(names, result.error)
+        elif isinstance(params, list):
+            results.updated(names, result.result)
+        else:
+            tasks.sent(names, result.result)
+
+    def _then(self, response, callback):
+        """Applies callback to the JSON data of a call, also when the call has been queued in a batch.
+
+        Args:
+            response: The value returned by post.
+            callback (callable): Function called with the JSON data.
+
+        Returns:
+            The value returned by callback, a BatchResult if the call is queued, or a coroutine when using AsyncApi.
+        """
+
+        if isinstance(response, Awaitable):
+            async def then():
+                return callback(await response)
+
+            return then()
 
-        response = requests.post(url=self.base_url, json=data, verify=self.api.verify, headers=headers)
+        if isinstance(response, BatchResult):
+            return response.then(callback)
 
-        # HTTP 200 OK
-        if response.status_code == 200:
-            return response.json()['result'][0]
+        return callback(response)
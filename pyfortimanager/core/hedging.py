@@ -0,0 +1,226 @@
+import contextvars
+import threading
+from collections import deque
+
+
+class LatencyTracker(object):
+    """Keeps the latency of the most recent successful requests per endpoint.
+
+    Args:
+        window (int): Number of latencies kept per endpoint. Default is 100.
+    """
+
+    def __init__(self, window: int = 100):
+        self.window = window
+
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, latency: float):
+        """Adds the latency of a request to an endpoint.
+
+        Args:
+            key (str): The endpoint. Ex. get /dvmdb/adom/{adom}/device
+            latency (float): Seconds the request took.
+        """
+
+        with self._lock:
+            samples = self._samples.get(key)
+
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+
+            samples.append(latency)
+
+    def percentile(self, key: str, percentile: float, min_samples: int = 1):
+        """Returns the latency below which the given percentage of recent requests to an endpoint finished.
+
+        Args:
+            key (str): The endpoint.
+            percentile (float): Percentage between 0 and 100. Ex. 95
+            min_samples (int): Minimum number of latencies needed. Default is 1.
+
+        Returns:
+            float: The latency in seconds, or None if there are fewer than min_samples latencies.
+        """
+
+        with self._lock:
+            samples = sorted(self._samples.get(key) or ())
+
+        if not samples or len(samples) < min_samples:
+            return None
+
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+
+        return samples[index]
+
+
+class HedgePolicy(object):
+    """Sends a second copy of a read-only request if the first has not answered within a percentile of the recent latency of that endpoint. The first reply wins.
+
+    Hedging cuts the tail latency caused by a slow connection or a busy FortiManager worker, at the cost of some extra requests. max_ratio caps the share of requests that are hedged, so a FortiManager that is slow overall is not sent twice the load.
+
+    Args:
+        percentile (float): Percentile of recent latency to wait before hedging. Default is 95.
+        min_samples (int): Latencies needed for an endpoint before its requests are hedged. Default is 20.
+        window (int): Number of latencies kept per endpoint. Default is 100.
+        min_delay (float): Minimum seconds to wait before hedging. Default is 0.01.
+        max_ratio (float): Maximum share of requests that are hedged. Default is 0.1.
+        max_workers (int, optional): Threads sending hedged requests when using Api. Defaults to twice the pool_maxsize of the Api, room for a duplicate of every pooled connection.
+    """
+
+    def __init__(self, percentile: float = 95, min_samples: int = 20, window: int = 100, min_delay: float = 0.01, max_ratio: float = 0.1, max_workers: int = None):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self.max_workers = max_workers
+        self.tracker = LatencyTracker(window=window)
+
+        self.requests = 0
+        self.hedged = 0
+
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def record(self, key: str, latency: float):
+        """Adds the latency of a successful request to an endpoint.
+        """
+
+        self.tracker.record(key, latency)
+
+    def delay(self, key: str):
+        """Returns the seconds to wait before hedging a request to an endpoint, or None if there are not enough latencies yet.
+        """
+
+        delay = self.tracker.percentile(key, self.percentile, min_samples=self.min_samples)
+
+        if delay is None:
+            return None
+
+        return max(self.min_delay, delay)
+
+    @property
+    def executor(self):
+        """Thread pool sending the requests when using Api.
+        """
+
+        with self._lock:
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pyfortimanager-hedge")
+
+            return self._executor
+
+    def _count(self):
+        with self._lock:
+            self.requests += 1
+
+    def _allow(self):
+        """Returns True and counts the hedge if the share of hedged requests is below max_ratio.
+        """
+
+        with self._lock:
+            if self.hedged >= self.requests * self.max_ratio:
+                return False
+
+            self.hedged += 1
+            return True
+
+    def run(self, key: str, fn):
+        """Calls fn, and calls it again if it has not returned within the hedge delay of the endpoint.
+
+        Args:
+            key (str): The endpoint.
+            fn (callable): Function sending the request.
+
+        Returns:
+            The value of the first call that succeeds. If both fail, the error of the last one is raised.
+        """
+
+        self._count()
+        delay = self.delay(key)
+
+        if delay is None:
+            return fn()
+
+        from concurrent.futures import FIRST_COMPLETED, wait
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+
+        started = threading.Event()
+
+        def primary():
+            started.set()
+            return fn()
+
+        # Every call needs its own copy of the context, a context can only be entered by one thread at a time
+        first = self.executor.submit(contextvars.copy_context().run, primary)
+
+        # Time spent queued for a thread does not count toward the hedge delay, a duplicate would queue behind it
+        started.wait()
+
+        try:
+            return first.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+
+        if not self._allow():
+            return first.result()
+
+        pending = {first, self.executor.submit(contextvars.copy_context().run, fn)}
+
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+
+            if not pending:
+                return done.pop().result()
+
+    async def run_async(self, key: str, fn):
+        """Awaits fn(), and awaits it again if it has not returned within the hedge delay of the endpoint. The slower call is cancelled.
+
+        Args:
+            key (str): The endpoint.
+            fn (callable): Function returning a coroutine sending the request.
+
+        Returns:
+            The value of the first call that succeeds. If both fail, the error of the last one is raised.
+        """
+
+        import asyncio
+
+        self._count()
+        delay = self.delay(key)
+
+        if delay is None:
+            return await fn()
+
+        pending = {asyncio.ensure_future(fn())}
+
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+
+            if done:
+                return done.pop().result()
+
+            if not self._allow():
+                return await pending.pop()
+
+            pending.add(asyncio.ensure_future(fn()))
+
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for future in done:
+                    if future.exception() is None:
+                        return future.result()
+
+                if not pending:
+                    return done.pop().result()
+        finally:
+            for future in pending:
+                future.cancel()
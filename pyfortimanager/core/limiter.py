@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import deque
+
+
+class AdaptiveLimiter(object):
+    """Limits the number of requests in flight, adjusting the limit with AIMD (additive increase, multiplicative decrease).
+
+    The limit grows by one for every limit successful requests. It is multiplied by backoff when a request fails, or when the recent latency of an endpoint grows beyond tolerance times its baseline latency. The limit stays between min_limit and max_limit.
+
+    Args:
+        initial_limit (int): Starting limit. Default is 10.
+        min_limit (int): Lowest limit. Default is 1.
+        max_limit (int): Highest limit. Default is 100.
+        backoff (float): Factor the limit is multiplied by on overload. Default is 0.5.
+        tolerance (float): How many times slower than the baseline latency requests may get before it counts as overload. Default is 2.0.
+    """
+
+    def __init__(self, initial_limit: int = 10, min_limit: int = 1, max_limit: int = 100, backoff: float = 0.5, tolerance: float = 2.0):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+
+        self.limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self.in_flight = 0
+
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._async_waiters = deque()
+        self._latencies = {}
+        self._last_decrease = 0.0
+
+    def acquire(self, timeout: float = None):
+        """Waits until a request may be sent.
+
+        Args:
+            timeout (float, optional): Seconds to wait at most. Default is no limit.
+
+        Returns:
+            bool: True if the request may be sent, False if the timeout passed first.
+        """
+
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.in_flight < int(self.limit), timeout):
+                return False
+
+            self.in_flight += 1
+
+            return True
+
+    async def acquire_async(self, timeout: float = None):
+        """Waits until a request may be sent, when using AsyncApi.
+
+        Args:
+            timeout (float, optional): Seconds to wait at most. Default is no limit.
+
+        Returns:
+            bool: True if the request may be sent, False if the timeout passed first.
+        """
+
+        import asyncio
+
+        end = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return True
+
+                waiter = asyncio.get_running_loop().create_future()
+                self._async_waiters.append(waiter)
+
+            try:
+                await asyncio.wait_for(waiter, None if end is None else end - time.monotonic())
+            except BaseException as error:
+                # This waiter may have been woken already, pass the free slot on to the next one
+                with self._lock:
+                    self._wake_async()
+
+                if isinstance(error, asyncio.TimeoutError):
+                    return False
+
+                raise
+
+    def release(self, latency: float, key: str = None, error: bool = False):
+        """Marks a request as done and adjusts the limit.
+
+        Args:
+            latency (float): Seconds the request took.
+            key (str, optional): Identifies the kind of request, usually the method and url template. Latency is compared per key.
+            error (bool): True if the request failed because of the FortiManager or the connection.
+        """
+
+        with self._condition:
+            self.in_flight -= 1
+
+            if error or self._slow(key, latency):
+                self._decrease(latency)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+            self._condition.notify_all()
+            self._wake_async()
+
+    def cancel(self):
+        """Marks a request as done without adjusting the limit, for a request that was abandoned before it finished.
+        """
+
+        with self._condition:
+            self.in_flight -= 1
+
+            self._condition.notify_all()
+            self._wake_async()
+
+    def _slow(self, key: str, latency: float):
+        if key is None:
+            return False
+
+        latencies = self._latencies.get(key)
+
+        if latencies is None:
+            if len(self._latencies) > 1000:
+                self._latencies.clear()
+
+            self._latencies[key] = [latency, latency]
+
+            return False
+
+        # Compare the recent latency of the endpoint with its lowest recent latency. The baseline rises slowly, so it follows changes in the normal latency of the endpoint.
+        latencies[0] += 0.3 * (latency - latencies[0])
+        latencies[1] = min(latencies[1] * 1.005, latencies[0])
+
+        return latencies[0] > latencies[1] * self.tolerance
+
+    def _decrease(self, latency: float):
+        # Only decrease once per round trip, so one burst of slow requests is not counted many times
+        now = time.monotonic()
+
+        if now - self._last_decrease < latency:
+            return
+
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+
+    def _wake_async(self):
+        free = int(self.limit) - self.in_flight
+
+        while free > 0 and self._async_waiters:
+            waiter = self._async_waiters.popleft()
+
+            if not waiter.done():
+                waiter.get_loop().call_soon_threadsafe(_set_waiter, waiter)
+                free -= 1
+
+
+def _set_waiter(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,76 @@
+import json
+import re
+
+
+# exec calls that only read data
+READ_ONLY_EXEC = (
+    "/um/image/version/list",
+)
+
+# exec calls that never change data on the FortiManager
+NO_INVALIDATE_EXEC = (
+    "/sys/proxy/json",
+    "/sys/task/result",
+)
+
+# Patterns replacing the names in a url with placeholders, applied in order
+URL_TEMPLATES = (
+    (re.compile(r"^/?pm/(pkg|wanprof)/adom/[^/]+/[^/]+"), r"/pm/\1/adom/{adom}/{name}"),
+    (re.compile(r"/adom/[^/{][^/]*"), "/adom/{adom}"),
+    (re.compile(r"/device/[^/{][^/]*"), "/device/{device}"),
+    (re.compile(r"/vdom/[^/{][^/]*"), "/vdom/{vdom}"),
+    (re.compile(r"/dynamic_mapping/[^/{][^/]*/[^/]+"), "/dynamic_mapping/{device}/{vdom}"),
+    (re.compile(r"/(pkg|group|variable|radius|template-group|managed-switch|wtp|interface|policy)/(?!adom(/|$))[^/{][^/]*"), r"/\1/{name}"),
+    (re.compile(r"/\d+(?=/|$)"), "/{id}"),
+)
+
+
+def is_read_only(method: str, params: dict):
+    """Returns True if a call only reads data, and can safely be sent more than once.
+
+    Args:
+        method (str): get, exec, add, set, update, delete.
+        params (dict): Payload data of the call.
+
+    Returns:
+        bool: True for get calls, read-only exec calls and proxy calls using the get action.
+    """
+
+    if method == "get":
+        return True
+
+    if method != "exec":
+        return False
+
+    url = params.get('url')
+
+    if url in READ_ONLY_EXEC:
+        return True
+
+    return url == "/sys/proxy/json" and (params.get('data') or {}).get('action', "get") == "get"
+
+
+def call_key(method: str, params: dict):
+    """Returns a hashable key identifying a call by its method, url and params.
+    """
+
+    return (method, params.get('url'), json.dumps(params, sort_keys=True, default=str))
+
+
+def url_template(url: str):
+    """Returns the url with ADOM, device and object names replaced by placeholders, so calls to the same endpoint share one key.
+
+    Args:
+        url (str): The url of the call. Ex. /dvmdb/adom/root/device/FGT-01
+
+    Returns:
+        str: The url template. Ex. /dvmdb/adom/{adom}/device/{device}
+    """
+
+    if not url:
+        return ""
+
+    for pattern, replacement in URL_TEMPLATES:
+        url = pattern.sub(replacement, url)
+
+    return url
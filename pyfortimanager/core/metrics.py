@@ -0,0 +1,296 @@
+import bisect
+import re
+import threading
+
+from pyfortimanager.core.methods import url_template
+
+
+# Upper bounds of the latency and queue wait buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# Upper bounds of the response size buckets, in bytes
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+ADOM_PATTERN = re.compile(r"/adom/([^/]+)")
+
+
+class CallMetrics(object):
+    """Metrics of one HTTP request to the FortiManager.
+
+    Args:
+        method (str): get, exec, add, set, update, delete.
+        params (list): Payload data for every params block.
+    """
+
+    def __init__(self, method: str, params: list):
+        self.method = method
+        self.url = call_url(params)
+        self.adom = call_adom(params)
+
+        # HTTP status, or None if the request raised an exception
+        self.http_status = None
+
+        # First non-zero FortiManager status code of the params blocks, or 0 if all succeeded
+        self.status_code = None
+
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+        # Seconds spent waiting for the limiter and concurrency slots, and waiting for the response
+        self.queue_wait = 0.0
+        self.latency = 0.0
+
+        # Seconds until the response headers arrived, and spent decoding the JSON data, if measured
+        self.first_byte = None
+        self.decode_time = None
+
+    def set_result(self, result: list):
+        """Sets the FortiManager status code from the JSON data of the params blocks.
+        """
+
+        codes = [(block.get('status') or {}).get('code', 0) for block in result or () if isinstance(block, dict)]
+        self.status_code = next((code for code in codes if code != 0), 0)
+
+    def labels(self, *names):
+        """Returns the values of the given fields as strings, to be used as metric labels.
+        """
+
+        return tuple("" if getattr(self, name) is None else str(getattr(self, name)) for name in names)
+
+
+def call_url(params: list):
+    """Returns the url template of a request. Requests with params blocks for different urls are reported as (batch).
+    """
+
+    urls = {url_template(block.get('url')) for block in params}
+
+    return urls.pop() if len(urls) == 1 else "(batch)"
+
+
+def call_adom(params: list):
+    """Returns the ADOM of a request, from the url or data of the first params block.
+    """
+
+    block = params[0] if params else {}
+    match = ADOM_PATTERN.search(block.get('url') or "")
+
+    if match:
+        return match.group(1)
+
+    data = block.get('data')
+
+    if isinstance(data, dict) and isinstance(data.get('adom'), str):
+        return data['adom']
+
+    return ""
+
+
+class Histogram(object):
+    """Counts observed values in buckets.
+
+    Args:
+        buckets (tuple): Upper bounds of the buckets, in ascending order.
+    """
+
+    def __init__(self, buckets: tuple):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Returns (upper bound, count of values less than or equal to it) for every bucket, ending with +Inf.
+        """
+
+        total = 0
+        result = []
+
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+
+        return result
+
+    def copy(self):
+        histogram = Histogram(self.buckets)
+        histogram.counts = list(self.counts)
+        histogram.sum = self.sum
+        histogram.count = self.count
+
+        return histogram
+
+
+class Exporter(object):
+    """Interface for sending call metrics elsewhere. Subclasses override export(), which is called after every request.
+    """
+
+    def export(self, call: CallMetrics):
+        """Called with the metrics of every request.
+
+        Args:
+            call (CallMetrics): The metrics of the request.
+        """
+
+        raise NotImplementedError
+
+
+class Metrics(object):
+    """Collects counters and histograms of the requests sent to the FortiManager, per method, url template and ADOM.
+
+    Args:
+        exporters (list, optional): Exporters called with the metrics of every request.
+        latency_buckets (tuple): Upper bounds of the latency and queue wait buckets, in seconds.
+        size_buckets (tuple): Upper bounds of the response size buckets, in bytes.
+    """
+
+    # Labels of the counters and histograms
+    LABELS = ("method", "url", "adom")
+    STATUS_LABELS = ("method", "url", "adom", "http_status", "status_code")
+
+    def __init__(self, exporters: list = None, latency_buckets: tuple = LATENCY_BUCKETS, size_buckets: tuple = SIZE_BUCKETS):
+        self.exporters = list(exporters or [])
+        self.latency_buckets = latency_buckets
+        self.size_buckets = size_buckets
+
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clears all counters and histograms.
+        """
+
+        with self._lock:
+            # name -> { label values: value }
+            self.counters = {
+                "requests_total": {},
+                "request_bytes_total": {},
+                "response_bytes_total": {},
+            }
+
+            # name -> { label values: Histogram }
+            self.histograms = {
+                "request_latency_seconds": {},
+                "queue_wait_seconds": {},
+                "response_size_bytes": {},
+            }
+
+    def record(self, call: CallMetrics):
+        """Adds the metrics of a request, and passes them to the exporters.
+
+        Args:
+            call (CallMetrics): The metrics of the request.
+        """
+
+        labels = call.labels(*self.LABELS)
+
+        with self._lock:
+            self._inc("requests_total", call.labels(*self.STATUS_LABELS), 1)
+            self._inc("request_bytes_total", labels, call.request_bytes)
+            self._inc("response_bytes_total", labels, call.response_bytes)
+
+            self._observe("request_latency_seconds", labels, call.latency, self.latency_buckets)
+            self._observe("queue_wait_seconds", labels, call.queue_wait, self.latency_buckets)
+            self._observe("response_size_bytes", labels, call.response_bytes, self.size_buckets)
+
+        for exporter in self.exporters:
+            exporter.export(call)
+
+    def _inc(self, name: str, labels: tuple, value: float):
+        counter = self.counters[name]
+        counter[labels] = counter.get(labels, 0) + value
+
+    def _observe(self, name: str, labels: tuple, value: float, buckets: tuple):
+        histogram = self.histograms[name].get(labels)
+
+        if histogram is None:
+            histogram = self.histograms[name][labels] = Histogram(buckets)
+
+        histogram.observe(value)
+
+    def snapshot(self):
+        """Returns a copy of all counters and histograms, taken at one point in time.
+
+        Returns:
+            dict: "counters" maps every counter name to { label values: value }, and "histograms" maps every histogram name to { label values: Histogram }.
+        """
+
+        with self._lock:
+            return {
+                "counters": {name: dict(values) for name, values in self.counters.items()},
+                "histograms": {name: {labels: histogram.copy() for labels, histogram in values.items()} for name, values in self.histograms.items()},
+            }
+
+
+class PrometheusExporter(object):
+    """Renders the counters and histograms of a Metrics object in the Prometheus text format.
+
+    It reads a snapshot of the Metrics object every time it renders, so it is not passed in the exporters of Metrics.
+
+    Args:
+        metrics (Metrics): The metrics to render.
+        prefix (str): Prefix of the metric names. Default is pyfortimanager.
+    """
+
+    HELP = {
+        "requests_total": "Requests sent to the FortiManager.",
+        "request_bytes_total": "Bytes sent to the FortiManager.",
+        "response_bytes_total": "Bytes received from the FortiManager.",
+        "request_latency_seconds": "Seconds from sending a request until the response was received.",
+        "queue_wait_seconds": "Seconds a request waited for the limiter and concurrency slots.",
+        "response_size_bytes": "Size of the responses from the FortiManager.",
+    }
+
+    def __init__(self, metrics: Metrics, prefix: str = "pyfortimanager"):
+        self.metrics = metrics
+        self.prefix = prefix
+
+    def render(self):
+        """Returns the metrics in the Prometheus text format.
+
+        Returns:
+            str: The text to serve on the /metrics endpoint.
+        """
+
+        lines = []
+        snapshot = self.metrics.snapshot()
+
+        for name, values in snapshot['counters'].items():
+            labels = Metrics.STATUS_LABELS if name == "requests_total" else Metrics.LABELS
+            self._header(lines, name, "counter")
+
+            for label_values, value in values.items():
+                lines.append(f"{self.prefix}_{name}{self._labels(labels, label_values)} {value}")
+
+        for name, values in snapshot['histograms'].items():
+            self._header(lines, name, "histogram")
+
+            for label_values, histogram in values.items():
+                for bound, count in histogram.cumulative():
+                    le = "+Inf" if bound == float("inf") else str(bound)
+                    lines.append(f"{self.prefix}_{name}_bucket{self._labels(Metrics.LABELS + ('le',), label_values + (le,))} {count}")
+
+                lines.append(f"{self.prefix}_{name}_sum{self._labels(Metrics.LABELS, label_values)} {histogram.sum}")
+                lines.append(f"{self.prefix}_{name}_count{self._labels(Metrics.LABELS, label_values)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: list, name: str, kind: str):
+        lines.append(f"# HELP {self.prefix}_{name} {self.HELP[name]}")
+        lines.append(f"# TYPE {self.prefix}_{name} {kind}")
+
+    def _labels(self, names: tuple, values: tuple):
+        pairs = ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+
+        return "{" + pairs + "}"
+
+
+def escape(value: str):
+    """Escapes a label value for the Prometheus text format.
+    """
+
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
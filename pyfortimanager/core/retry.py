@@ -0,0 +1,175 @@
+import random
+import sys
+import threading
+import time
+
+from pyfortimanager.core.exceptions import CircuitOpenError, HTTPError
+from pyfortimanager.core.methods import is_read_only
+
+
+class RetryPolicy(object):
+    """Retries failed requests with exponential backoff and full jitter.
+
+    Read-only calls are retried on connection errors, timeouts and the HTTP statuses in retry_statuses. Other calls are only retried if the request never reached the FortiManager, so a write is never applied twice. Use methods to set the number of retries per JSON-RPC method; calls using those methods are retried on any of the errors above.
+
+    Args:
+        retries (int): Retries for read-only calls. Default is 3.
+        write_retries (int): Retries for other calls, if the request never reached the FortiManager. Default is 3.
+        backoff (float): Seconds to wait before the first retry. Doubles for every retry. Default is 0.5.
+        max_backoff (float): Maximum seconds to wait between retries. Default is 30.
+        methods (dict, optional): Retries per JSON-RPC method. Ex. { "exec": 2 }
+        retry_statuses (tuple): HTTP statuses that are retried. Default is 429, 500, 502, 503 and 504.
+    """
+
+    def __init__(self, retries: int = 3, write_retries: int = 3, backoff: float = 0.5, max_backoff: float = 30, methods: dict = None, retry_statuses: tuple = (429, 500, 502, 503, 504)):
+        self.retries = retries
+        self.write_retries = write_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.methods = methods or {}
+        self.retry_statuses = retry_statuses
+
+    def should_retry(self, attempt: int, method: str, params: list, error: BaseException):
+        """Returns True if a failed request should be sent again.
+
+        Args:
+            attempt (int): Number of retries already made.
+            method (str): get, exec, add, set, update, delete.
+            params (list): Payload data for every params block.
+            error (BaseException): The error raised by the request.
+        """
+
+        if method in self.methods:
+            return attempt < self.methods[method] and self.transient(error)
+
+        if all(is_read_only(method, block) for block in params):
+            return attempt < self.retries and self.transient(error)
+
+        return attempt < self.write_retries and not_sent(error)
+
+    def transient(self, error: BaseException):
+        """Returns True if the error may go away when the request is sent again.
+        """
+
+        if isinstance(error, HTTPError):
+            return error.status_code in self.retry_statuses
+
+        if not_sent(error) or isinstance(error, OSError):
+            return True
+
+        asyncio = sys.modules.get("asyncio")
+
+        if asyncio is not None and isinstance(error, asyncio.TimeoutError):
+            return True
+
+        aiohttp = sys.modules.get("aiohttp")
+
+        return aiohttp is not None and isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+
+    def delay(self, attempt: int):
+        """Returns the seconds to wait before a retry, using full jitter.
+        """
+
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+def cancelled(error: BaseException):
+    """Returns True if the error means the caller abandoned the request, such as the slower copy of a hedged read. It says nothing about the FortiManager.
+    """
+
+    asyncio = sys.modules.get("asyncio")
+
+    return asyncio is not None and isinstance(error, asyncio.CancelledError)
+
+
+def not_sent(error: BaseException):
+    """Returns True if the error means the request never reached the FortiManager.
+    """
+
+    if isinstance(error, CircuitOpenError):
+        return False
+
+    urllib3 = sys.modules.get("urllib3.exceptions")
+
+    # requests wraps the urllib3 error, which holds the reason
+    if urllib3 is not None:
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+
+        if isinstance(reason, urllib3.ConnectTimeoutError) or isinstance(error, urllib3.ConnectTimeoutError):
+            return True
+
+    aiohttp = sys.modules.get("aiohttp")
+
+    return aiohttp is not None and isinstance(error, aiohttp.ClientConnectorError)
+
+
+class CircuitBreaker(object):
+    """Fails fast while the FortiManager is down.
+
+    After failure_threshold failed requests in a row, the circuit opens and requests raise CircuitOpenError without being sent. After reset_timeout seconds, one trial request is let through. If it succeeds the circuit closes, otherwise it opens again.
+
+    Args:
+        failure_threshold (int): Failed requests in a row before the circuit opens. Default is 5.
+        reset_timeout (float): Seconds the circuit stays open before a trial request. Default is 30.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.failures = 0
+        self.opened_at = None
+
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """closed, open or half-open.
+        """
+
+        if self.opened_at is None:
+            return "closed"
+
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+
+        return "half-open"
+
+    def before(self):
+        """Raises CircuitOpenError if requests may not be sent.
+        """
+
+        with self._lock:
+            state = self.state
+
+            if state == "closed":
+                return
+
+            # Let one trial request through when the reset timeout has passed
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return
+
+            raise CircuitOpenError("The FortiManager is failing, the circuit breaker is open.")
+
+    def cancel(self):
+        """Gives back the trial of a half-open circuit when the trial request was never sent.
+        """
+
+        with self._lock:
+            self._trial = False
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+
+            if self._trial or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._trial = False
@@ -0,0 +1,107 @@
+import copy
+import threading
+
+from pyfortimanager.core.deadline import current_deadline
+from pyfortimanager.core.exceptions import DeadlineExceeded
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Coalesces concurrent identical calls, so they share one in-flight call and all get its result.
+
+    Callers that join a call in flight get a copy of its result, and wait no longer than their current deadline, if any.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """Calls fn, unless a call with the same key is already in flight. In that case, waits for it and returns its result.
+
+        Args:
+            key: Hashable key identifying the call.
+            fn (callable): Function making the call.
+
+        Raises:
+            DeadlineExceeded: If the current deadline passes while waiting for a call in flight.
+
+        Returns:
+            The value returned by fn.
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            deadline = current_deadline.get()
+
+            if not call.done.wait(None if deadline is None else deadline.remaining):
+                raise DeadlineExceeded(f"The deadline of {deadline.seconds} seconds has been exceeded.")
+
+            if call.error is not None:
+                raise call.error
+
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call.done.set()
+
+        return call.result
+
+    async def do_async(self, key, fn):
+        """Awaits fn(), unless a call with the same key is already in flight. In that case, awaits its result.
+
+        Args:
+            key: Hashable key identifying the call.
+            fn (callable): Function returning the awaitable making the call.
+
+        Raises:
+            DeadlineExceeded: If the current deadline passes while waiting for a call in flight.
+
+        Returns:
+            The result of the awaitable.
+        """
+
+        import asyncio
+
+        future = self._futures.get(key)
+        leader = future is None
+
+        if leader:
+            future = self._futures[key] = asyncio.ensure_future(fn())
+            future.add_done_callback(lambda _: self._futures.pop(key, None))
+
+            # A cancelled waiter must not cancel the call for the other waiters
+            return await asyncio.shield(future)
+
+        deadline = current_deadline.get()
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), None if deadline is None else deadline.remaining)
+        except asyncio.TimeoutError:
+            if deadline is None or not deadline.expired:
+                raise
+
+            raise DeadlineExceeded(f"The deadline of {deadline.seconds} seconds has been exceeded.") from None
+
+        return copy.deepcopy(result)
@@ -0,0 +1,69 @@
+# Prefixes of the JSON parser events for result[0].data
+DATA_PREFIX = "result.item.data"
+ITEM_PREFIX = "result.item.data.item"
+
+
+def import_ijson():
+    """Imports ijson, which is needed for streaming responses.
+
+    Returns:
+        module: The ijson module.
+    """
+
+    try:
+        import ijson
+    except ImportError:
+        raise ImportError("Streaming responses requires ijson. Install it with: pip install pyfortimanager[stream]")
+
+    return ijson
+
+
+class StreamDecoder(object):
+    """Builds the objects in result[0].data from JSON parser events, one object at a time.
+
+    Feed every (prefix, event, value) from ijson.parse to feed(). The status of the response is collected in status.
+    """
+
+    def __init__(self):
+        self._object_builder = import_ijson().ObjectBuilder
+        self._builder = None
+        self._end = None
+        self.status = {}
+
+    def feed(self, prefix: str, event: str, value):
+        """Processes one parser event.
+
+        Returns:
+            tuple: (True, object) when an object is complete, otherwise (False, None).
+        """
+
+        # Building an object
+        if self._builder is not None:
+            if (prefix, event) == self._end:
+                item = self._builder.value
+                self._builder = None
+
+                return True, item
+
+            self._builder.event(event, value)
+
+            return False, None
+
+        # A list item, or a single object when retrieving one object
+        if prefix == ITEM_PREFIX or (prefix == DATA_PREFIX and event == "start_map"):
+            if event in ("start_map", "start_array"):
+                self._builder = self._object_builder()
+                self._builder.event(event, value)
+                self._end = (prefix, event.replace("start", "end"))
+
+                return False, None
+
+            return True, value
+
+        if prefix == "result.item.status.code":
+            self.status['code'] = value
+
+        elif prefix == "result.item.status.message":
+            self.status['message'] = value
+
+        return False, None
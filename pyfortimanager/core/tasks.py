@@ -0,0 +1,192 @@
+import random
+import time
+
+from pyfortimanager.core.filters import Field, all_of, compile_filter
+
+
+# Task states
+STATE_PENDING = 0
+STATE_RUNNING = 1
+STATE_CANCELLING = 2
+STATE_CANCELLED = 3
+STATE_DONE = 4
+STATE_ERROR = 5
+STATE_ABORTING = 6
+STATE_ABORTED = 7
+STATE_WARNING = 8
+STATE_TIMEOUT = 9
+
+# States of a task that has finished, successfully or not
+FINISHED_STATES = (STATE_CANCELLED, STATE_DONE, STATE_ERROR, STATE_ABORTED, STATE_WARNING, STATE_TIMEOUT)
+
+
+def task_finished(task: dict):
+    """Returns True if a task has finished, successfully or not.
+
+    Args:
+        task (dict): JSON data of the task.
+    """
+
+    return task.get('state') in FINISHED_STATES
+
+
+class TaskPoller(object):
+    """Decides how long to wait between polls of a task.
+
+    While the progress of the task does not change, the interval grows by backoff up to max_interval. When it changes, the next poll is planned halfway to the estimated completion time, so short tasks are picked up quickly and long tasks are polled rarely. A random jitter keeps many waiters from polling at the same moment.
+
+    Args:
+        interval (float): Seconds to wait before the first poll, and the shortest interval. Default is 1.
+        max_interval (float): Longest interval in seconds. Default is 30.
+        backoff (float): Factor the interval grows by while the task makes no progress. Default is 1.5.
+        jitter (float): Share of the interval added or removed at random. Default is 0.1.
+    """
+
+    def __init__(self, interval: float = 1, max_interval: float = 30, backoff: float = 1.5, jitter: float = 0.1):
+        self.min_interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+
+        self.interval = interval
+        self.polls = 0
+
+        self._percent = None
+        self._percent_time = None
+
+    def next_interval(self, percent: float = None):
+        """Returns the seconds to wait before the next poll, given the progress of the last poll.
+
+        Args:
+            percent (float, optional): Progress of the task between 0 and 100.
+
+        Returns:
+            float: Seconds to wait.
+        """
+
+        now = time.monotonic()
+        self.polls += 1
+
+        if percent is not None and self._percent is not None and percent > self._percent and now > self._percent_time:
+            # Poll halfway to the estimated completion time
+            rate = (percent - self._percent) / (now - self._percent_time)
+            self.interval = (100 - percent) / rate / 2
+        elif self.polls > 1:
+            self.interval *= self.backoff
+
+        if percent is not None and percent != self._percent:
+            self._percent = percent
+            self._percent_time = now
+
+        self.interval = min(self.max_interval, max(self.min_interval, self.interval))
+
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class TaskEvent(object):
+    """A task watched by TaskWatcher has finished, or FortiManager did not return it. The state of a task that was not returned is None.
+    """
+
+    __slots__ = ("task", "state", "data")
+
+    def __init__(self, task: int, data: dict):
+        self.task = task
+        self.state = data.get('state')
+        self.data = data
+
+    def __repr__(self):
+        return f"TaskEvent(task={self.task!r}, state={self.state!r})"
+
+    @property
+    def ok(self):
+        """True if the task finished without errors. Tasks finishing with warnings count as ok.
+        """
+
+        return self.state in (STATE_DONE, STATE_WARNING)
+
+
+class TaskWatcher(object):
+    """Tracks the state of any number of tasks with one filtered /task/task request per poll.
+
+    Contiguous task IDs, as created by a rollout, are requested as a range of IDs instead of a list, which keeps the request small.
+
+    Args:
+        tasks (list): IDs of the tasks.
+        poller (TaskPoller): Decides how long to wait between polls.
+    """
+
+    def __init__(self, tasks: list, poller: TaskPoller):
+        self.poller = poller
+
+        # IDs of the tasks that have not finished
+        self.pending = {int(task) for task in tasks}
+
+        # Progress of every task, between 0 and 100
+        self.percent = dict.fromkeys(self.pending, 0)
+
+    def params(self):
+        """Returns the params of a request for the state of all pending tasks, without their lines.
+        """
+
+        return {
+            "url": "/task/task",
+            "filter": compile_filter(self.filter()),
+            "loadsub": False
+        }
+
+    def filter(self):
+        """Returns a filter matching the pending tasks.
+        """
+
+        low, high = min(self.pending), max(self.pending)
+
+        # Mostly contiguous IDs, other tasks in the range are ignored
+        if high - low + 1 <= 2 * len(self.pending):
+            return all_of(Field("id") >= low, Field("id") <= high)
+
+        return Field("id").in_(*sorted(self.pending))
+
+    def update(self, tasks: list):
+        """Updates the pending tasks from the JSON data of the request.
+
+        Args:
+            tasks (list): JSON data of the tasks.
+
+        Returns:
+            list: TaskEvent for every task that has finished since the last poll, and for every pending task that was not returned.
+        """
+
+        events = []
+        missing = set(self.pending)
+
+        for data in tasks or ():
+            task = data.get('id')
+
+            if task not in self.pending:
+                continue
+
+            missing.discard(task)
+
+            if task_finished(data):
+                self.pending.discard(task)
+                self.percent[task] = 100
+                events.append(TaskEvent(task=task, data=data))
+            else:
+                self.percent[task] = data.get('percent') or 0
+
+        # A task that does not exist, or has been purged, would otherwise be waited for forever
+        for task in sorted(missing):
+            self.pending.discard(task)
+            self.percent[task] = 100
+            events.append(TaskEvent(task=task, data={"id": task, "state": None}))
+
+        return events
+
+    def progress(self):
+        """Returns the average progress of all tasks, between 0 and 100.
+        """
+
+        if not self.percent:
+            return 100
+
+        return sum(self.percent.values()) / len(self.percent)
@@ -0,0 +1,310 @@
+import contextlib
+import contextvars
+import functools
+import threading
+import time
+import types
+from collections import deque
+from collections.abc import Awaitable
+
+
+# Span of the model method, batch or map() call currently running
+current_span = contextvars.ContextVar("pyfortimanager_span", default=None)
+
+
+class Span(object):
+    """A timed operation, such as a model method or an HTTP request.
+
+    Args:
+        name (str): Name of the operation. Ex. FortiGates.all
+        parent (Span, optional): The span this operation runs in.
+        attributes (dict, optional): Attributes of the operation.
+    """
+
+    def __init__(self, name: str, parent=None, attributes: dict = None):
+        self.name = name
+        self.parent = parent
+        self.attributes = dict(attributes or {})
+        self.error = None
+        self.start_time = time.time()
+        self.end_time = None
+
+    @property
+    def duration(self):
+        """Seconds the operation took, or None if it has not ended.
+        """
+
+        if self.end_time is None:
+            return None
+
+        return self.end_time - self.start_time
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.error = error
+
+    def end(self):
+        self.end_time = time.time()
+
+
+class Tracer(object):
+    """Interface for tracing backends. Subclasses override start_span().
+    """
+
+    def start_span(self, name: str, parent: Span = None, attributes: dict = None):
+        """Starts a span.
+
+        Args:
+            name (str): Name of the operation.
+            parent (Span, optional): The span this operation runs in.
+            attributes (dict, optional): Attributes of the operation.
+
+        Returns:
+            Span: The started span. The caller ends it.
+        """
+
+        raise NotImplementedError
+
+
+class MemorySpan(Span):
+    """Span adding itself to its MemoryTracer when it ends.
+    """
+
+    def __init__(self, name: str, tracer, parent=None, attributes: dict = None):
+        super(MemorySpan, self).__init__(name, parent=parent, attributes=attributes)
+        self.tracer = tracer
+
+    def end(self):
+        super(MemorySpan, self).end()
+        self.tracer.add(self)
+
+
+class MemoryTracer(Tracer):
+    """Keeps the most recent finished spans in memory. Useful for finding where the time goes in a script.
+
+    Args:
+        maxlen (int): Number of finished spans kept. Default is 10000.
+    """
+
+    def __init__(self, maxlen: int = 10000):
+        self.spans = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, parent: Span = None, attributes: dict = None):
+        return MemorySpan(name, self, parent=parent, attributes=attributes)
+
+    def add(self, span: Span):
+        """Adds a finished span.
+        """
+
+        with self._lock:
+            self.spans.append(span)
+
+    def children(self, span: Span):
+        """Returns the finished spans started directly in the given span.
+        """
+
+        with self._lock:
+            return [child for child in self.spans if child.parent is span]
+
+
+class OpenTelemetrySpan(Span):
+    """Span backed by an OpenTelemetry span.
+    """
+
+    def __init__(self, name: str, span, parent=None, attributes: dict = None):
+        super(OpenTelemetrySpan, self).__init__(name, parent=parent, attributes=attributes)
+        self.span = span
+
+    def set_attribute(self, key: str, value):
+        super(OpenTelemetrySpan, self).set_attribute(key, value)
+        self.span.set_attribute(key, value)
+
+    def record_error(self, error: BaseException):
+        from opentelemetry.trace import Status, StatusCode
+
+        super(OpenTelemetrySpan, self).record_error(error)
+        self.span.record_exception(error)
+        self.span.set_status(Status(StatusCode.ERROR, str(error)))
+
+    def end(self):
+        super(OpenTelemetrySpan, self).end()
+        self.span.end()
+
+
+class OpenTelemetryTracer(Tracer):
+    """Sends spans to OpenTelemetry. Requires opentelemetry-api.
+
+    Spans without a parent from this module are started in the current OpenTelemetry context, so they show up under the spans of the application.
+
+    Args:
+        tracer (opentelemetry.trace.Tracer, optional): The tracer to use. Defaults to the tracer of the global tracer provider.
+    """
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError as error:
+            raise ImportError("OpenTelemetryTracer requires opentelemetry-api. Install it with: pip install pyfortimanager[otel]") from error
+
+        self.tracer = tracer or trace.get_tracer("pyfortimanager")
+
+    def start_span(self, name: str, parent: Span = None, attributes: dict = None):
+        from opentelemetry import trace
+
+        context = trace.set_span_in_context(parent.span) if isinstance(parent, OpenTelemetrySpan) else None
+        span = self.tracer.start_span(name, context=context, attributes=attributes)
+
+        return OpenTelemetrySpan(name, span, parent=parent, attributes=attributes)
+
+
+def start_span(tracer: Tracer, name: str, attributes: dict = None):
+    """Starts a span in the current span, or returns None if there is no tracer.
+    """
+
+    if tracer is None:
+        return None
+
+    return tracer.start_span(name, parent=current_span.get(), attributes=attributes)
+
+
+@contextlib.contextmanager
+def active_span(tracer: Tracer, name: str, attributes: dict = None):
+    """Starts a span and makes it the current span for the with-block. Does nothing if there is no tracer.
+    """
+
+    span = start_span(tracer, name, attributes)
+
+    if span is None:
+        yield None
+        return
+
+    token = current_span.set(span)
+
+    try:
+        yield span
+    except BaseException as error:
+        span.record_error(error)
+        raise
+    finally:
+        current_span.reset(token)
+        span.end()
+
+
+def trace_result(span: Span, result):
+    """Ends the span when the result is done. Coroutines and generators are wrapped, so the span stays current while they run and ends when they finish.
+
+    Args:
+        span (Span): The span, or None if there is no tracer.
+        result: The value returned by the traced call.
+
+    Returns:
+        The result, or a wrapper around it.
+    """
+
+    if span is None:
+        return result
+
+    if isinstance(result, Awaitable):
+        return _trace_awaitable(span, result)
+
+    if isinstance(result, types.GeneratorType):
+        return _trace_generator(span, result)
+
+    if isinstance(result, types.AsyncGeneratorType):
+        return _trace_async_generator(span, result)
+
+    span.end()
+
+    return result
+
+
+async def _trace_awaitable(span: Span, awaitable):
+    token = current_span.set(span)
+
+    try:
+        return await awaitable
+    except BaseException as error:
+        span.record_error(error)
+        raise
+    finally:
+        current_span.reset(token)
+        span.end()
+
+
+def _trace_generator(span: Span, generator):
+    try:
+        while True:
+            token = current_span.set(span)
+
+            try:
+                item = next(generator)
+            except StopIteration:
+                return
+            except BaseException as error:
+                span.record_error(error)
+                raise
+            finally:
+                current_span.reset(token)
+
+            yield item
+    finally:
+        generator.close()
+        span.end()
+
+
+async def _trace_async_generator(span: Span, generator):
+    try:
+        while True:
+            token = current_span.set(span)
+
+            try:
+                item = await generator.__anext__()
+            except StopAsyncIteration:
+                return
+            except BaseException as error:
+                span.record_error(error)
+                raise
+            finally:
+                current_span.reset(token)
+
+            yield item
+    finally:
+        await generator.aclose()
+        span.end()
+
+
+def trace_method(name: str, fn):
+    """Wraps a model method in a span named after it.
+
+    Args:
+        name (str): Name of the span. Ex. FortiGates.all
+        fn (callable): The method.
+
+    Returns:
+        callable: The wrapped method.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        span = start_span(self.api.tracer, name, {"pyfortimanager.adom": kwargs.get('adom') or self.api.adom})
+
+        if span is None:
+            return fn(self, *args, **kwargs)
+
+        token = current_span.set(span)
+
+        try:
+            result = fn(self, *args, **kwargs)
+        except BaseException as error:
+            span.record_error(error)
+            span.end()
+            raise
+        finally:
+            current_span.reset(token)
+
+        return trace_result(span, result)
+
+    return wrapper
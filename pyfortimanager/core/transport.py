@@ -0,0 +1,508 @@
+import contextlib
+import io
+import json
+import threading
+import time
+
+from pyfortimanager.core.deadline import current_deadline
+
+
+class Response(object):
+    """Response to a request sent by a transport.
+
+    Args:
+        status_code (int): HTTP status.
+        content (bytes): Body of the response.
+        first_byte (float, optional): Seconds until the response headers arrived.
+    """
+
+    def __init__(self, status_code: int, content: bytes, first_byte: float = None):
+        self.status_code = status_code
+        self.content = content
+        self.first_byte = first_byte
+
+
+class StreamResponse(object):
+    """Response whose body is read while it arrives.
+
+    Args:
+        status_code (int): HTTP status.
+        raw: File-like object with the body, or an object with an async read() when using AsyncApi.
+        bytes_read (callable): Function returning the number of bytes received so far.
+        first_byte (float, optional): Seconds until the response headers arrived.
+    """
+
+    def __init__(self, status_code: int, raw, bytes_read, first_byte: float = None):
+        self.status_code = status_code
+        self.raw = raw
+        self.bytes_read = bytes_read
+        self.first_byte = first_byte
+
+
+class AsyncReader(object):
+    """Async file-like object reading from a file-like object, or from an async iterator of bytes.
+    """
+
+    def __init__(self, raw=None, chunks=None):
+        self.raw = raw
+        self.chunks = chunks
+        self.buffer = b""
+
+    async def read(self, size: int = -1):
+        if self.raw is not None:
+            return self.raw.read(size)
+
+        # Read chunks until there is enough data, or the body has ended
+        while size < 0 or len(self.buffer) < size:
+            try:
+                self.buffer += await self.chunks.__anext__()
+            except StopAsyncIteration:
+                break
+
+        if size < 0:
+            size = len(self.buffer)
+
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+
+        return data
+
+
+class IteratorReader(io.RawIOBase):
+    """File-like object reading from an iterator of bytes.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buffer = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self.buffer:
+            try:
+                self.buffer = next(self.chunks)
+            except StopIteration:
+                return 0
+
+        size = min(len(buffer), len(self.buffer))
+        buffer[:size], self.buffer = self.buffer[:size], self.buffer[size:]
+
+        return size
+
+
+class Transport(object):
+    """Interface for sending JSON-RPC requests to the FortiManager. Subclasses implement send() for Api, and send_async() for AsyncApi.
+
+    Batched requests are sent the same way, as one request with several params blocks. stream() and stream_async() read the body while it arrives, and default to reading the whole response with send() and send_async().
+    """
+
+    def send(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        """Sends a request.
+
+        Args:
+            url (str): The JSON-RPC url.
+            data (bytes): The encoded JSON-RPC request.
+            headers (dict): HTTP headers.
+            timeout (tuple): Seconds to wait for a connection, and for data. None means no timeout.
+
+        Returns:
+            Response: The response.
+        """
+
+        raise NotImplementedError(f"{type(self).__name__} does not support Api, use AsyncApi.")
+
+    async def send_async(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        """Sends a request, when using AsyncApi.
+
+        Returns:
+            Response: The response.
+        """
+
+        raise NotImplementedError(f"{type(self).__name__} does not support AsyncApi, use Api.")
+
+    @contextlib.contextmanager
+    def stream(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        """Sends a request, and yields a StreamResponse to read the body from.
+        """
+
+        response = self.send(url=url, data=data, headers=headers, timeout=timeout)
+
+        yield StreamResponse(response.status_code, io.BytesIO(response.content), lambda: len(response.content), first_byte=response.first_byte)
+
+    @contextlib.asynccontextmanager
+    async def stream_async(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        """Sends a request, and yields a StreamResponse to read the body from, when using AsyncApi.
+        """
+
+        response = await self.send_async(url=url, data=data, headers=headers, timeout=timeout)
+
+        yield StreamResponse(response.status_code, AsyncReader(raw=io.BytesIO(response.content)), lambda: len(response.content), first_byte=response.first_byte)
+
+    def close(self):
+        """Closes all pooled connections. New connections are made on the next request.
+        """
+
+        pass
+
+    async def close_async(self):
+        self.close()
+
+
+class RequestsTransport(Transport):
+    """Sends requests with requests, over a shared keep-alive connection pool. Used by Api by default.
+
+    The session is created on first use. If pool_idle_timeout is set and the session has been idle for longer than that, the pooled connections are dropped and a new session is created.
+
+    Args:
+        verify (bool): Verify the certificate of the FortiManager, or the path to a CA bundle. Default is True.
+        pool_connections (int): Number of connection pools to cache. Default is 10.
+        pool_maxsize (int): Maximum number of connections in the pool. Default is 10.
+        pool_block (bool): Wait for a free connection instead of opening a new one when the pool is full. Default is False.
+        pool_idle_timeout (float, optional): Seconds before idle connections are dropped.
+        timed (bool): Measure the time spent connecting, for the slow call log. Default is False.
+    """
+
+    def __init__(self, verify: bool = True, pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False, pool_idle_timeout: float = None, timed: bool = False):
+        self.verify = verify
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.pool_idle_timeout = pool_idle_timeout
+        self.timed = timed
+
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._session_last_used = None
+
+    @property
+    def session(self):
+        """The shared requests session.
+        """
+
+        with self._session_lock:
+            now = time.monotonic()
+
+            # Drop connections that have been idle for too long
+            if self._session is not None and self.pool_idle_timeout is not None and now - self._session_last_used > self.pool_idle_timeout:
+                self._session.close()
+                self._session = None
+
+            if self._session is None:
+                self._session = self._new_session()
+
+            self._session_last_used = now
+
+            return self._session
+
+    def _new_session(self):
+        """Creates a new HTTP session with a keep-alive connection pool.
+
+        Returns:
+            requests.Session: The new session.
+        """
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        adapter_class = HTTPAdapter
+
+        # Time new connections for the slow call log
+        if self.timed:
+            from pyfortimanager.core.debug import timed_http_adapter
+            adapter_class = timed_http_adapter()
+
+        adapter = adapter_class(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block
+        )
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    def send(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        response = self.session.post(url=url, data=data, verify=self.verify, headers=headers, timeout=timeout)
+
+        return Response(response.status_code, response.content, first_byte=response.elapsed.total_seconds())
+
+    @contextlib.contextmanager
+    def stream(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        start = time.monotonic()
+
+        with self.session.post(url=url, data=data, verify=self.verify, headers=headers, timeout=timeout, stream=True) as response:
+            response.raw.decode_content = True
+
+            yield StreamResponse(response.status_code, response.raw, response.raw.tell, first_byte=time.monotonic() - start)
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+class AiohttpTransport(Transport):
+    """Sends requests with aiohttp, over a shared keep-alive connection pool. Used by AsyncApi by default. Requires aiohttp.
+
+    Args:
+        verify (bool): Verify the certificate of the FortiManager, or the path to a CA bundle. Default is True.
+        pool_connections (int): Multiplied by pool_maxsize, the maximum number of connections in total. Default is 10.
+        pool_maxsize (int): Maximum number of connections to the FortiManager. Default is 100.
+        pool_idle_timeout (float, optional): Seconds before idle connections are closed. Default is 15.
+        timed (bool): Measure the time spent connecting, for the slow call log. Default is False.
+    """
+
+    def __init__(self, verify: bool = True, pool_connections: int = 10, pool_maxsize: int = 100, pool_idle_timeout: float = None, timed: bool = False):
+        self.verify = verify
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_idle_timeout = pool_idle_timeout
+        self.timed = timed
+
+        self._session = None
+
+    @property
+    def ssl(self):
+        """SSL setting passed to aiohttp, based on verify.
+        """
+
+        if isinstance(self.verify, str):
+            import ssl
+
+            return ssl.create_default_context(cafile=self.verify)
+
+        return None if self.verify else False
+
+    async def get_session(self):
+        """Returns the shared aiohttp session, creating it on first use.
+
+        Returns:
+            aiohttp.ClientSession: The shared session.
+        """
+
+        if self._session is None or self._session.closed:
+            self._session = self._new_session()
+
+        return self._session
+
+    def _new_session(self):
+        """Creates a new aiohttp session with a keep-alive connection pool.
+
+        Returns:
+            aiohttp.ClientSession: The new session.
+        """
+
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("AsyncApi requires aiohttp. Install it with: pip install pyfortimanager[async]")
+
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_connections * self.pool_maxsize,
+            limit_per_host=self.pool_maxsize,
+            keepalive_timeout=self.pool_idle_timeout or 15
+        )
+
+        trace_configs = []
+
+        # Time new connections for the slow call log
+        if self.timed:
+            from pyfortimanager.core.debug import aiohttp_trace_config
+            trace_configs.append(aiohttp_trace_config())
+
+        return aiohttp.ClientSession(connector=connector, trace_configs=trace_configs)
+
+    def client_timeout(self, timeout: tuple):
+        """Returns the aiohttp timeouts for the connect and read timeouts of a request, with the remaining time of the current deadline as the total.
+        """
+
+        import aiohttp
+
+        deadline = current_deadline.get()
+
+        return aiohttp.ClientTimeout(
+            total=deadline.remaining if deadline is not None else None,
+            connect=timeout[0],
+            sock_read=timeout[1]
+        )
+
+    async def send_async(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        session = await self.get_session()
+        start = time.monotonic()
+
+        async with session.post(url=url, data=data, ssl=self.ssl, headers=headers, timeout=self.client_timeout(timeout)) as response:
+            first_byte = time.monotonic() - start
+
+            return Response(response.status, await response.read(), first_byte=first_byte)
+
+    @contextlib.asynccontextmanager
+    async def stream_async(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        session = await self.get_session()
+        start = time.monotonic()
+
+        async with session.post(url=url, data=data, ssl=self.ssl, headers=headers, timeout=self.client_timeout(timeout)) as response:
+            yield StreamResponse(response.status, response.content, lambda: response.content.total_bytes, first_byte=time.monotonic() - start)
+
+    async def close_async(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class HttpxTransport(Transport):
+    """Sends requests with httpx, over HTTP/2 if the FortiManager supports it. Works with both Api and AsyncApi. Requires httpx.
+
+    With HTTP/2, concurrent requests share one connection instead of one connection each.
+
+    Args:
+        verify (bool): Verify the certificate of the FortiManager, or the path to a CA bundle. Default is True.
+        http2 (bool): Use HTTP/2. Requires the h2 package. Default is True.
+        pool_maxsize (int): Maximum number of connections. Default is 10.
+        pool_idle_timeout (float, optional): Seconds before idle connections are closed. Default is 5.
+    """
+
+    def __init__(self, verify: bool = True, http2: bool = True, pool_maxsize: int = 10, pool_idle_timeout: float = None):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("HttpxTransport requires httpx. Install it with: pip install pyfortimanager[http2]")
+
+        self.verify = verify
+        self.http2 = http2
+        self.limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize, keepalive_expiry=pool_idle_timeout or 5)
+
+        self._client = None
+        self._async_client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """The shared httpx client used by Api.
+        """
+
+        import httpx
+
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(verify=self.verify, http2=self.http2, limits=self.limits)
+
+            return self._client
+
+    @property
+    def async_client(self):
+        """The shared httpx client used by AsyncApi.
+        """
+
+        import httpx
+
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(verify=self.verify, http2=self.http2, limits=self.limits)
+
+        return self._async_client
+
+    def _timeout(self, timeout: tuple):
+        import httpx
+
+        return httpx.Timeout(timeout[1], connect=timeout[0])
+
+    def send(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        client = self.client
+        start = time.monotonic()
+        response = client.send(client.build_request("POST", url, content=data, headers=headers, timeout=self._timeout(timeout)), stream=True)
+
+        try:
+            first_byte = time.monotonic() - start
+
+            return Response(response.status_code, response.read(), first_byte=first_byte)
+        finally:
+            response.close()
+
+    async def send_async(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        client = self.async_client
+        start = time.monotonic()
+        response = await client.send(client.build_request("POST", url, content=data, headers=headers, timeout=self._timeout(timeout)), stream=True)
+
+        try:
+            first_byte = time.monotonic() - start
+
+            return Response(response.status_code, await response.aread(), first_byte=first_byte)
+        finally:
+            await response.aclose()
+
+    @contextlib.contextmanager
+    def stream(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        start = time.monotonic()
+
+        with self.client.stream("POST", url, content=data, headers=headers, timeout=self._timeout(timeout)) as response:
+            yield StreamResponse(response.status_code, IteratorReader(response.iter_bytes()), lambda: response.num_bytes_downloaded, first_byte=time.monotonic() - start)
+
+    @contextlib.asynccontextmanager
+    async def stream_async(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        start = time.monotonic()
+
+        async with self.async_client.stream("POST", url, content=data, headers=headers, timeout=self._timeout(timeout)) as response:
+            yield StreamResponse(response.status_code, AsyncReader(chunks=response.aiter_bytes()), lambda: response.num_bytes_downloaded, first_byte=time.monotonic() - start)
+
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def close_async(self):
+        self.close()
+
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+
+class MemoryTransport(Transport):
+    """Answers requests with a Python function instead of a FortiManager, for tests and benchmarks without a network. Works with both Api and AsyncApi.
+
+    The handler is called with the method and every params block of a request, and returns the result for that block, such as {"status": {"code": 0, "message": "OK"}, "data": [...]}. It may also return a Response to answer the whole request, for example with an HTTP error, or raise an exception to simulate a failed connection.
+
+    Args:
+        handler (callable): Function called with the method and params block. Ex. lambda method, params: {"status": {"code": 0}, "data": []}
+        latency (float): Seconds every request takes. Default is 0.
+    """
+
+    def __init__(self, handler, latency: float = 0):
+        self.handler = handler
+        self.latency = latency
+
+        # The decoded JSON-RPC requests, in the order they were sent
+        self.requests = []
+
+    def _respond(self, data: bytes):
+        request = json.loads(data)
+        self.requests.append(request)
+        result = []
+
+        for params in request['params']:
+            response = self.handler(request['method'], params)
+
+            if isinstance(response, Response):
+                return response
+
+            result.append(response)
+
+        return Response(200, json.dumps({"id": request.get('id'), "result": result}).encode(), first_byte=self.latency)
+
+    def send(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        if self.latency:
+            time.sleep(self.latency)
+
+        return self._respond(data)
+
+    async def send_async(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        if self.latency:
+            import asyncio
+
+            await asyncio.sleep(self.latency)
+
+        return self._respond(data)
@@ -8,11 +8,15 @@ class ADOMs(FortiManager):
     def __init__(self, **kwargs):
         super(ADOMs, self).__init__(**kwargs)
 
-    def all(self, name: str = None):
+    def all(self, name: str = None, fields: list = None, option: list = None, loadsub: bool = None, filter: list = None):
         """Retrieves all ADOMs or a single ADOM.
 
         Args:
             name (str): Name of a ADOM.
+            fields (list, optional): Only return these attributes. Ex. ["name", "os_ver", "mr"]
+            option (list, optional): Options for the request. Ex. ["get meta"].
+            loadsub (bool, optional): Enable or disable the return of any sub-objects.
+            filter (Filter or list, optional): Only return objects matching the filter. Ex. Field("name").like("customer_%")
 
         Returns:
             dict: JSON data.
@@ -26,6 +30,8 @@ class ADOMs(FortiManager):
         if name:
             params['url'] += f"/{name}"
 
+        self._get_options(params=params, fields=fields, option=option, loadsub=loadsub, filter=filter)
+
         return self.post(method="get", params=params)
 
     def lock(self, name: str):
@@ -8,12 +8,16 @@ class Device_Groups(FortiManager):
     def __init__(self, **kwargs):
         super(Device_Groups, self).__init__(**kwargs)
 
-    def all(self, name: str = None, adom: str = None):
+    def all(self, name: str = None, adom: str = None, fields: list = None, option: list = None, loadsub: bool = None, filter: list = None):
         """Retrieves all device groups or a single device group with members.
 
         Args:
             name (str): Name of a specific device group.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name", "desc"]
+            option (list, optional): Options for the request. Default is ["object member"].
+            loadsub (bool, optional): Enable or disable the return of any sub-objects.
+            filter (Filter or list, optional): Only return objects matching the filter. Ex. Field("name").like("store%")
 
         Returns:
             dict: JSON data.
@@ -30,6 +34,8 @@ class Device_Groups(FortiManager):
         if name:
             params['url'] += f"/{name}"
 
+        self._get_options(params=params, fields=fields, option=option, loadsub=loadsub, filter=filter)
+
         return self.post(method="get", params=params)
 
     def add(self, name: str, description: str = None, adom: str = None):
@@ -1,3 +1,4 @@
+from pyfortimanager.core.bulk import chunked, unique
 from pyfortimanager.core.fortimanager import FortiManager
 
 
@@ -8,7 +9,7 @@ class FortiAPs(FortiManager):
     def __init__(self, **kwargs):
         super(FortiAPs, self).__init__(**kwargs)
 
-    def all(self, fortigate: str = None, vdom: str = "root", wtp_id: str = None, adom: str = None):
+    def all(self, fortigate: str = None, vdom: str = "root", wtp_id: str = None, adom: str = None, fields: list = None, option: list = None, loadsub: bool = None, filter: list = None):
         """Retrieves all FortiAPs or a single FortiAP from a FortiGate.
 
         Args:
@@ -16,6 +17,10 @@ class FortiAPs(FortiManager):
             vdom (str): Name of the virtual domain for the FortiGate.
             wtp_id (str, optional): Optional serial number of a specific FortiAP. Note: FortiGate is required to use this filter.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["wtp-id", "name", "wtp-profile"]
+            option (list, optional): Options for the request. Ex. ["get meta"].
+            loadsub (bool, optional): Enable or disable the return of any sub-objects.
+            filter (Filter or list, optional): Only return objects matching the filter. Ex. Field("wtp-profile") == "FAP231F-default"
 
         Returns:
             dict: JSON data.
@@ -39,8 +44,47 @@ class FortiAPs(FortiManager):
             if wtp_id:
                 params['url'] += f"/{wtp_id}"
 
+        self._get_options(params=params, fields=fields, option=option, loadsub=loadsub, filter=filter)
+
         return self.post(method="get", params=params)
 
+    def iter_all(self, fortigate: str = None, vdom: str = "root", adom: str = None, fields: list = None, option: list = None, loadsub: bool = None, filter: list = None, page_size: int = 1000, prefetch: bool = False, stream: bool = False):
+        """Yields all FortiAPs or the FortiAPs from a FortiGate one at a time, fetching them in pages.
+
+        Args:
+            fortigate (str, optional): Optional name of a specific FortiGate.
+            vdom (str): Name of the virtual domain for the FortiGate.
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["wtp-id", "name", "wtp-profile"]
+            option (list, optional): Options for the request. Ex. ["get meta"].
+            loadsub (bool, optional): Enable or disable the return of any sub-objects.
+            filter (Filter or list, optional): Only return objects matching the filter. Ex. Field("wtp-profile") == "FAP231F-default"
+            page_size (int): Number of objects to fetch per request. Set to None to retrieve everything in one request. Default is 1000.
+            prefetch (bool): Fetch the next page in the background while the current page is consumed. Default is False.
+            stream (bool): Decode every page incrementally from the response, so only one object is held in memory at a time. Requires ijson. Default is False.
+
+        Returns:
+            generator: JSON data for every FortiAP.
+        """
+
+        params = {
+            "url": f"/pm/config/adom/{adom or self.api.adom}/obj/wireless-controller/wtp",
+            "scope member": [
+                {
+                    "name": "All_FortiGate"
+                }
+            ]
+        }
+
+        # Optional fields
+        if fortigate:
+            params['scope member'][0]['name'] = fortigate
+            params['scope member'][0]['vdom'] = vdom
+
+        self._get_options(params=params, fields=fields, option=option, loadsub=loadsub, filter=filter)
+
+        return self._iterate(params=params, page_size=page_size, prefetch=prefetch, stream=stream)
+
     def upgrade(self, fortigate: str, wtp_id: str, image: str):
         """Updates the firmware of a specific FortiAP.
 
@@ -98,6 +142,37 @@ class FortiAPs(FortiManager):
 
         return self.post(method="exec", params=params)
 
+    def refresh_fleet(self, fortigates: list, chunk_size: int = 50, max_workers: int = 4, retries: int = 0, adom: str = None):
+        """Refreshes all FortiAPs from any number of FortiGates, in chunks of chunk_size FortiGates with up to max_workers chunks sent at the same time.
+
+        Args:
+            fortigates (list): List of FortiGate OID's to refresh. Example: [60123, 601234]
+            chunk_size (int): Number of FortiGates per request. Default is 50.
+            max_workers (int): Number of chunks sent at the same time. Default is 4.
+            retries (int): Number of times the FortiGates whose request failed, for example with a connection error, are sent again. FortiGates rejected by FortiManager are not sent again. Default is 0.
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+
+        Returns:
+            DeviceResults: DeviceResult for every FortiGate by OID. The OID's of the FortiGates that failed to refresh are in failed. A coroutine when using AsyncApi.
+        """
+
+        def chunks(fortigates):
+            for chunk in chunked(fortigates, chunk_size):
+                params = {
+                    "url": "/deployment/get/controller/status",
+                    "data": {
+                        "adom": adom or self.api.adom,
+                        "ctype": 1,
+                        "device": chunk,
+                        "options": 3,
+                        "resync": 1
+                    }
+                }
+
+                yield chunk, params
+
+        return self._bulk(method="exec", devices=unique(fortigates, key=lambda fortigate: fortigate), chunks=chunks, retries=retries, max_workers=max_workers)
+
     def profiles(self, name: str = None, adom: str = None):
         """Retrieves a list of all AP profiles or a single AP profile.
 
@@ -342,11 +417,23 @@ class FortiAPs(FortiManager):
                     "vdom": vdom
                 }
             ],
+            "filter": [
+                "wtp-id",
+                "==",
+                wtp_id
+            ],
+            "fields": [
+                "wtp-id",
+                "_conn-state"
+            ]
         }
-    
+
         response = self.post(method="get", params=params)
-    
-        for ap in response["data"]:
-            if ap["wtp-id"] == wtp_id:
-                return ap["_conn-state"] == 2
-        return False
\ No newline at end of file
+
+        def is_online(response):
+            for ap in response["data"]:
+                if ap["wtp-id"] == wtp_id:
+                    return ap["_conn-state"] == 2
+            return False
+
+        return self._then(response, is_online)
\ No newline at end of file
@@ -1,3 +1,4 @@
+from pyfortimanager.core.bulk import chunked, unique
 from pyfortimanager.core.fortimanager import FortiManager
 
 
@@ -8,12 +9,16 @@ class FortiGates(FortiManager):
     def __init__(self, **kwargs):
         super(FortiGates, self).__init__(**kwargs)
 
-    def all(self, fortigate: str = None, adom: str = None):
+    def all(self, fortigate: str = None, adom: str = None, fields: list = None, option: list = None, loadsub: bool = None, filter: list = None):
         """Retrieves all FortiGates or a single FortiGate.
 
         Args:
             name (str): Name of a specific FortiGate.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name", "sn"]
+            option (list, optional): Options for the request. Default is ["get meta"].
+            loadsub (bool, optional): Enable or disable the return of any sub-objects.
+            filter (Filter or list, optional): Only return objects matching the filter. Ex. Field("conn_status") == 1
 
         Returns:
             dict: JSON data.
@@ -30,8 +35,38 @@ class FortiGates(FortiManager):
         if fortigate:
             params['url'] += f"/{fortigate}"
 
+        self._get_options(params=params, fields=fields, option=option, loadsub=loadsub, filter=filter)
+
         return self.post(method="get", params=params)
 
+    def iter_all(self, adom: str = None, fields: list = None, option: list = None, loadsub: bool = None, filter: list = None, page_size: int = 1000, prefetch: bool = False, stream: bool = False):
+        """Yields all FortiGates one at a time, fetching them in pages.
+
+        Args:
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name", "sn"]
+            option (list, optional): Options for the request. Default is ["get meta"].
+            loadsub (bool, optional): Enable or disable the return of any sub-objects.
+            filter (Filter or list, optional): Only return objects matching the filter. Ex. Field("conn_status") == 1
+            page_size (int): Number of objects to fetch per request. Set to None to retrieve everything in one request. Default is 1000.
+            prefetch (bool): Fetch the next page in the background while the current page is consumed. Default is False.
+            stream (bool): Decode every page incrementally from the response, so only one object is held in memory at a time. Requires ijson. Default is False.
+
+        Returns:
+            generator: JSON data for every FortiGate.
+        """
+
+        params = {
+            "url": f"/dvmdb/adom/{adom or self.api.adom}/device",
+            "option": [
+                "get meta"
+            ]
+        }
+
+        self._get_options(params=params, fields=fields, option=option, loadsub=loadsub, filter=filter)
+
+        return self._iterate(params=params, page_size=page_size, prefetch=prefetch, stream=stream)
+
     def upgrade(self, fortigate: str, image: str, adom: str = None):
         """Upgrades the firmware on the FortiGate.
 
@@ -86,6 +121,42 @@ class FortiGates(FortiManager):
 
         return self.post(method="exec", params=params)
 
+    def refresh_fleet(self, fortigates: list, chunk_size: int = 50, max_workers: int = 4, wait: bool = True, timeout: float = None, retries: int = 0, adom: str = None):
+        """Refreshes any number of FortiGates, in chunks of chunk_size FortiGates with up to max_workers chunks sent at the same time.
+
+        Every chunk creates one task in FortiManager. By default, the tasks are waited for, and the result of every FortiGate is set from the task lines.
+
+        Args:
+            fortigates (list): Dicts of FortiGate name and OID to refresh. Ex: [{ "name": "FortiGate-VM64-1", "oid": "12345" }, { "name": "FortiGate-VM64-2", "oid": "23456" }]
+            chunk_size (int): Number of FortiGates per request. Default is 50.
+            max_workers (int): Number of chunks sent at the same time. Default is 4.
+            wait (bool): Wait for the tasks to finish. Default is True.
+            timeout (float, optional): Seconds to wait for the tasks. FortiGates whose task has not finished by then fail with a timeout status. Default is no timeout.
+            retries (int): Number of times the FortiGates whose request failed, for example with a connection error, are sent again. FortiGates rejected by FortiManager are not sent again. Default is 0.
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+
+        Returns:
+            DeviceResults: DeviceResult for every FortiGate by name. The names of the FortiGates that failed to refresh are in failed. A coroutine when using AsyncApi.
+        """
+
+        def chunks(fortigates):
+            for chunk in chunked(fortigates, chunk_size):
+                params = {
+                    "url": "/dvm/cmd/update/dev-list",
+                    "data": {
+                        "adom": adom or self.api.adom,
+                        "flags": [
+                            "create_task",
+                            "nonblocking"
+                        ],
+                        "update-dev-member-list": chunk
+                    }
+                }
+
+                yield [fortigate['name'] for fortigate in chunk], params
+
+        return self._bulk(method="exec", devices=unique(fortigates, key=lambda fortigate: fortigate['name']), chunks=chunks, wait=wait, timeout=timeout, retries=retries, max_workers=max_workers)
+
     def interfaces(self, fortigate: str, interface: str = None):
         """Retrieves all interfaces or a single interface from a FortiGate.
 
@@ -135,41 +206,107 @@ class FortiGates(FortiManager):
             "url": "/dvm/cmd/add/device",
             "data": {
                 "adom": adom or self.api.adom,
-                "device": {
-                    "flags": flags,
-                    "mgmt_mode": mgmt_mode,
-                    "mr": mr,
-                    "name": name or serial,
-                    "os_type": os_type,
-                    "os_ver": os_ver,
-                    "sn": serial
-                }
+                "device": self._model_device(serial=serial, mr=mr, os_ver=os_ver, name=name, mgmt_mode=mgmt_mode, os_type=os_type, adm_usr=adm_usr, adm_pass=adm_pass, description=description, meta_fields=meta_fields, flags=flags, prefer_img_ver=prefer_img_ver, branch_pt=branch_pt, build=build)
             }
         }
 
+        return self.post(method="exec", params=params)
+
+    def add_many(self, devices: list, chunk_size: int = 100, wait: bool = False, timeout: float = None, retries: int = 0, adom: str = None):
+        """Adds many FortiGates as model devices in FortiManager, using the multi-device add command.
+
+        The devices are sent in chunks of chunk_size devices, and every chunk creates one task in FortiManager. All devices are added to the same ADOM.
+
+        Args:
+            devices (list): A dict for every FortiGate, with the arguments of add() except adom. Ex. [{ "serial": "FGT60FTK1234ABCD", "mr": 0, "os_ver": 7 }]
+            chunk_size (int): Number of devices per request. Default is 100.
+            wait (bool): Wait for the tasks to finish, and set the result of every device from the task lines. Default is False.
+            timeout (float, optional): Seconds to wait for the tasks. Devices whose task has not finished by then fail with a timeout status. Default is no timeout.
+            retries (int): Number of times the devices whose request failed, for example with a connection error, are sent again. Devices rejected by FortiManager are not sent again. Default is 0.
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+
+        Raises:
+            ValueError: If a device sets its own ADOM, or two devices have the same name or serial number.
+
+        Returns:
+            DeviceResults: DeviceResult for every FortiGate by name, with the status and the ID of its task. A coroutine when using AsyncApi.
+        """
+
+        models = []
+        names = set()
+        serials = set()
+
+        for device in devices:
+            if "adom" in device:
+                raise ValueError(f"add_many() adds all devices to one ADOM, set it with the adom argument instead of per device: {device.get('name') or device.get('serial')}")
+
+            model = self._model_device(**device)
+
+            if model['name'] in names:
+                raise ValueError(f"Duplicate device name: {model['name']}")
+
+            if model['sn'] in serials:
+                raise ValueError(f"Duplicate serial number: {model['sn']}")
+
+            names.add(model['name'])
+            serials.add(model['sn'])
+            models.append(model)
+
+        def chunks(models):
+            for chunk in chunked(models, chunk_size):
+                params = {
+                    "url": "/dvm/cmd/add/dev-list",
+                    "data": {
+                        "adom": adom or self.api.adom,
+                        "add-dev-list": chunk,
+                        "flags": [
+                            "create_task",
+                            "nonblocking"
+                        ]
+                    }
+                }
+
+                yield [device['name'] for device in chunk], params
+
+        return self._bulk(method="exec", devices={device['name']: device for device in models}, chunks=chunks, wait=wait, timeout=timeout, retries=retries)
+
+    def _model_device(self, serial: str, mr: int, os_ver: int, name: str = None, mgmt_mode: str = "fmg", os_type: str = "fos", adm_usr: str = None, adm_pass: str = None, description: str = None, meta_fields: dict = None, flags: int = 67371040, prefer_img_ver: str = None, branch_pt: int = None, build: int = None):
+        """Returns the JSON data of a model device, see add().
+        """
+
+        device = {
+            "flags": flags,
+            "mgmt_mode": mgmt_mode,
+            "mr": mr,
+            "name": name or serial,
+            "os_type": os_type,
+            "os_ver": os_ver,
+            "sn": serial
+        }
+
         # Optional fields
         if adm_usr:
-            params['data']['device']['adm_usr'] = adm_usr
+            device['adm_usr'] = adm_usr
 
         if adm_pass:
-            params['data']['device']['adm_pass'] = adm_pass
+            device['adm_pass'] = adm_pass
 
         if description:
-            params['data']['device']['desc'] = description
+            device['desc'] = description
 
         if meta_fields:
-            params['data']['device']['meta fields'] = meta_fields
+            device['meta fields'] = meta_fields
 
         if prefer_img_ver:
-            params['data']['device']['prefer_img_ver'] = prefer_img_ver
-        
+            device['prefer_img_ver'] = prefer_img_ver
+
         if branch_pt:
-            params['data']['device']['branch_pt'] = branch_pt
+            device['branch_pt'] = branch_pt
 
         if build:
-            params['data']['device']['build'] = build
+            device['build'] = build
 
-        return self.post(method="exec", params=params)
+        return device
 
     def update(self, fortigate: str, meta_fields: dict = None, adm_pass: str = None, adm_usr: str = None, description: str = None, ip: str = None, latitude: float = None, longitude: float = None, name: str = None, hostname: str = None, prefer_img_ver: str = None, adom: str = None):
         """Updates a FortiGate.
@@ -192,6 +329,33 @@ class FortiGates(FortiManager):
             dict: JSON data.
         """
 
+        params = self._update_params(fortigate=fortigate, meta_fields=meta_fields, adm_pass=adm_pass, adm_usr=adm_usr, description=description, ip=ip, latitude=latitude, longitude=longitude, name=name, hostname=hostname, prefer_img_ver=prefer_img_ver, adom=adom)
+
+        return self.post(method="update", params=params)
+
+    def update_many(self, devices: list, chunk_size: int = 100, retries: int = 1, adom: str = None):
+        """Updates many FortiGates, sending the updates as multi-params requests.
+
+        Args:
+            devices (list): A dict for every FortiGate, with the arguments of update(). Ex. [{ "fortigate": "FortiGate-VM64-1", "meta_fields": { "Region": "North" } }]
+            chunk_size (int): Number of FortiGates per request. Default is 100.
+            retries (int): Number of times the FortiGates whose request failed, for example with a connection error, are sent again. FortiGates rejected by FortiManager are not sent again. Default is 1.
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+
+        Returns:
+            DeviceResults: DeviceResult for every FortiGate by name, with its status. A coroutine when using AsyncApi.
+        """
+
+        def chunks(devices):
+            for chunk in chunked(devices, chunk_size):
+                yield [device['fortigate'] for device in chunk], [self._update_params(**{"adom": adom, **device}) for device in chunk]
+
+        return self._bulk(method="update", devices=unique(devices, key=lambda device: device['fortigate']), chunks=chunks, retries=retries)
+
+    def _update_params(self, fortigate: str, meta_fields: dict = None, adm_pass: str = None, adm_usr: str = None, description: str = None, ip: str = None, latitude: float = None, longitude: float = None, name: str = None, hostname: str = None, prefer_img_ver: str = None, adom: str = None):
+        """Returns the params of a request updating a FortiGate, see update().
+        """
+
         params = {
             "url": f"/dvmdb/adom/{adom or self.api.adom}/device/{fortigate}",
             "data": {}
@@ -226,9 +390,9 @@ class FortiGates(FortiManager):
             params['data']['meta fields'] = meta_fields
 
         if prefer_img_ver:
-            params['data']['device']['prefer_img_ver'] = prefer_img_ver
+            params['data']['prefer_img_ver'] = prefer_img_ver
 
-        return self.post(method="update", params=params)
+        return params
 
     def delete(self, fortigate: str, adom: str = None):
         """Deletes a FortiGate.
@@ -250,3 +414,38 @@ class FortiGates(FortiManager):
         }
 
         return self.post(method="exec", params=params)
+
+    def delete_many(self, fortigates: list, chunk_size: int = 100, wait: bool = False, timeout: float = None, retries: int = 1, adom: str = None):
+        """Deletes many FortiGates, using the multi-device delete command.
+
+        The FortiGates are sent in chunks of chunk_size FortiGates, and every chunk creates one task in FortiManager.
+
+        Args:
+            fortigates (list): Names of the FortiGates to delete.
+            chunk_size (int): Number of FortiGates per request. Default is 100.
+            wait (bool): Wait for the tasks to finish, and set the result of every FortiGate from the task lines. Default is False.
+            timeout (float, optional): Seconds to wait for the tasks. FortiGates whose task has not finished by then fail with a timeout status. Default is no timeout.
+            retries (int): Number of times the FortiGates whose request failed, for example with a connection error, are sent again. FortiGates rejected by FortiManager are not sent again. Default is 1.
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+
+        Returns:
+            DeviceResults: DeviceResult for every FortiGate by name, with the status and the ID of its task. A coroutine when using AsyncApi.
+        """
+
+        def chunks(fortigates):
+            for chunk in chunked(fortigates, chunk_size):
+                params = {
+                    "url": "/dvm/cmd/del/dev-list",
+                    "data": {
+                        "adom": adom or self.api.adom,
+                        "del-dev-member-list": [{"name": fortigate} for fortigate in chunk],
+                        "flags": [
+                            "create_task",
+                            "nonblocking"
+                        ]
+                    }
+                }
+
+                yield chunk, params
+
+        return self._bulk(method="exec", devices=unique(fortigates, key=lambda fortigate: fortigate), chunks=chunks, wait=wait, timeout=timeout, retries=retries)
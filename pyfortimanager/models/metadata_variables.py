@@ -8,12 +8,16 @@ class MetadataVariables(FortiManager):
     def __init__(self, **kwargs):
         super(MetadataVariables, self).__init__(**kwargs)
 
-    def all(self, name: str = None, adom: str = None):
+    def all(self, name: str = None, adom: str = None, fields: list = None, option: list = None, loadsub: bool = None, filter: list = None):
         """Retrieves all metadata variables or a single metadata variable with members.
 
         Args:
             name (str, optional): Name of a specific variable.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name", "value"]
+            option (list, optional): Options for the request. Default is ["scope member"].
+            loadsub (bool, optional): Enable or disable the return of any sub-objects.
+            filter (Filter or list, optional): Only return objects matching the filter. Ex. Field("name").like("store_%")
 
         Returns:
             dict: JSON data.
@@ -30,6 +34,8 @@ class MetadataVariables(FortiManager):
         if name:
             params['url'] += f"/{name}"
 
+        self._get_options(params=params, fields=fields, option=option, loadsub=loadsub, filter=filter)
+
         return self.post(method="get", params=params)
 
     def add(self, name: str, description: str = None, default_value: str = None, revision_note: str = None, adom: str = None):
@@ -8,12 +8,16 @@ class Policy_Packages(FortiManager):
     def __init__(self, **kwargs):
         super(Policy_Packages, self).__init__(**kwargs)
 
-    def all(self, name: str = None, adom: str = None):
+    def all(self, name: str = None, adom: str = None, fields: list = None, option: list = None, loadsub: bool = None, filter: list = None):
         """Retrieves all policy packages or a single policy package with members.
 
         Args:
             name (str, optional): Name of a policy package.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name", "type", "scope member"]
+            option (list, optional): Options for the request. Ex. ["get meta"].
+            loadsub (bool, optional): Enable or disable the return of any sub-objects.
+            filter (Filter or list, optional): Only return objects matching the filter. Ex. Field("type") == "pkg"
 
         Returns:
             dict: JSON data.
@@ -27,6 +31,8 @@ class Policy_Packages(FortiManager):
         if name:
             params['url'] += f"/{name}"
 
+        self._get_options(params=params, fields=fields, option=option, loadsub=loadsub, filter=filter)
+
         return self.post(method="get", params=params)
 
     def add(self, name: str, ngfw_mode: int = 0, central_nat: int = 0, policy_offload_level: int = 0, subfolder: str = None, adom: str = None):
@@ -305,12 +311,16 @@ class Policy_Packages(FortiManager):
 
         return self.post(method="delete", params=params)
 
-    def firewall_policies(self, name: str, adom: str = None):
+    def firewall_policies(self, name: str, adom: str = None, fields: list = None, option: list = None, loadsub: bool = None, filter: list = None):
         """Retrieves all firewall policies in a policy package.
 
         Args:
             name (str): Name of the policy package.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["policyid", "name", "srcintf", "dstintf", "action"]
+            option (list, optional): Options for the request. Ex. ["get meta"].
+            loadsub (bool, optional): Enable or disable the return of any sub-objects.
+            filter (Filter or list, optional): Only return objects matching the filter. Ex. Field("name").like("%internet%")
 
         Returns:
             dict: JSON data.
@@ -320,8 +330,36 @@ class Policy_Packages(FortiManager):
             "url": f"/pm/config/adom/{adom or self.api.adom}/pkg/{name}/firewall/policy"
         }
 
+        self._get_options(params=params, fields=fields, option=option, loadsub=loadsub, filter=filter)
+
         return self.post(method="get", params=params)
 
+    def iter_firewall_policies(self, name: str, adom: str = None, fields: list = None, option: list = None, loadsub: bool = None, filter: list = None, page_size: int = 1000, prefetch: bool = False, stream: bool = False):
+        """Yields all firewall policies in a policy package one at a time, fetching them in pages.
+
+        Args:
+            name (str): Name of the policy package.
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["policyid", "name", "srcintf", "dstintf", "action"]
+            option (list, optional): Options for the request. Ex. ["get meta"].
+            loadsub (bool, optional): Enable or disable the return of any sub-objects.
+            filter (Filter or list, optional): Only return objects matching the filter. Ex. Field("name").like("%internet%")
+            page_size (int): Number of objects to fetch per request. Set to None to retrieve everything in one request. Default is 1000.
+            prefetch (bool): Fetch the next page in the background while the current page is consumed. Default is False.
+            stream (bool): Decode every page incrementally from the response, so only one object is held in memory at a time. Requires ijson. Default is False.
+
+        Returns:
+            generator: JSON data for every firewall policy.
+        """
+
+        params = {
+            "url": f"/pm/config/adom/{adom or self.api.adom}/pkg/{name}/firewall/policy"
+        }
+
+        self._get_options(params=params, fields=fields, option=option, loadsub=loadsub, filter=filter)
+
+        return self._iterate(params=params, page_size=page_size, prefetch=prefetch, stream=stream)
+
     def firewall_policy_disable(self, id: int, policy_package: str, adom: str = None):
         """Disables a firewall policy in a policy package.
 
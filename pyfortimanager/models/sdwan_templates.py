@@ -8,12 +8,16 @@ class SDWAN_Templates(FortiManager):
     def __init__(self, **kwargs):
         super(SDWAN_Templates, self).__init__(**kwargs)
 
-    def all(self, name: str = None, adom: str = None):
+    def all(self, name: str = None, adom: str = None, fields: list = None, option: list = None, loadsub: bool = None, filter: list = None):
         """Retrieves all SD-WAN templates or a single SD-WAN template with members.
 
         Args:
             name (str): Name of the SD-WAN template.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name", "scope member"]
+            option (list, optional): Options for the request. Ex. ["get meta"].
+            loadsub (bool, optional): Enable or disable the return of any sub-objects.
+            filter (Filter or list, optional): Only return objects matching the filter. Ex. Field("name").like("branch%")
 
         Returns:
             dict: JSON data.
@@ -27,6 +31,8 @@ class SDWAN_Templates(FortiManager):
         if name:
             params['url'] += f"/{name}"
 
+        self._get_options(params=params, fields=fields, option=option, loadsub=loadsub, filter=filter)
+
         return self.post(method="get", params=params)
 
     def delete(self, name: str, adom: str = None):
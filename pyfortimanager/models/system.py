@@ -1,4 +1,10 @@
+import time
+
+from pyfortimanager.core.deadline import current_deadline
+from pyfortimanager.core.exceptions import StatusError, TaskTimeout
+from pyfortimanager.core.filters import compile_filter
 from pyfortimanager.core.fortimanager import FortiManager
+from pyfortimanager.core.tasks import TaskPoller, TaskWatcher, task_finished
 
 
 class System(FortiManager):
@@ -146,7 +152,7 @@ class System(FortiManager):
 
         Args:
             task (int): ID of a specific task.
-            filter (list): Filter the result according to a set of criteria. example: List [ "{attribute}", "==", "{value}" ]
+            filter (Filter or list): Filter the result according to a set of criteria. example: Field("state") == 4 or List [ "{attribute}", "==", "{value}" ]
             loadsub (bool): Enable or disable the return of any sub-objects. Default is enabled.
 
         Returns:
@@ -155,7 +161,7 @@ class System(FortiManager):
 
         params = {
             "url": "/task/task",
-            "filter": filter,
+            "filter": compile_filter(filter),
             "loadsub": loadsub
         }
 
@@ -183,3 +189,173 @@ class System(FortiManager):
         }
 
         return self.post(method="exec", params=params)
+
+    def wait_for_task(self, task: int, timeout: float = None, interval: float = 1, max_interval: float = 30, progress=None):
+        """Waits for a task in FortiManager to finish and returns its lines.
+
+        The task is polled with an adaptive interval, starting at interval seconds. The interval grows while the task makes no progress, and follows the estimated completion time when it does, so waiting on many long tasks sends few requests.
+
+        Args:
+            task (int): ID of the task.
+            timeout (float, optional): Seconds to wait before raising TaskTimeout. Default is no timeout.
+            interval (float): Seconds between the first polls, and the shortest interval. Default is 1.
+            max_interval (float): Longest interval between polls, in seconds. Default is 30.
+            progress (callable, optional): Function called with the JSON data of the task after every poll. Ex. lambda task: print(task['percent'])
+
+        Raises:
+            TaskTimeout: If the task has not finished within the timeout. The task keeps running.
+            StatusError: If FortiManager returns an error, for example when the task does not exist.
+
+        Returns:
+            dict: JSON data of the task lines, the same as tasks(task=task).
+        """
+
+        poller = TaskPoller(interval=interval, max_interval=max_interval)
+
+        if self.api.is_async:
+            return self._wait_for_task_async(task=task, timeout=timeout, poller=poller, progress=progress)
+
+        return self._wait_for_task_sync(task=task, timeout=timeout, poller=poller, progress=progress)
+
+    def _wait_for_task_sync(self, task: int, timeout: float, poller: TaskPoller, progress):
+        end = time.monotonic() + timeout if timeout is not None else None
+
+        while True:
+            state = self._task_state(self.post(method="get", params=self._task_params(task)), task=task)
+
+            if progress is not None:
+                progress(state)
+
+            if task_finished(state):
+                return self.tasks(task=task)
+
+            delay = self._poll_delay(end, poller, state.get('percent'))
+
+            if delay is None:
+                raise TaskTimeout(task=task, timeout=timeout, state=state)
+
+            time.sleep(delay)
+
+    async def _wait_for_task_async(self, task: int, timeout: float, poller: TaskPoller, progress):
+        import asyncio
+
+        end = time.monotonic() + timeout if timeout is not None else None
+
+        while True:
+            state = self._task_state(await self.post(method="get", params=self._task_params(task)), task=task)
+
+            if progress is not None:
+                progress(state)
+
+            if task_finished(state):
+                return await self.tasks(task=task)
+
+            delay = self._poll_delay(end, poller, state.get('percent'))
+
+            if delay is None:
+                raise TaskTimeout(task=task, timeout=timeout, state=state)
+
+            await asyncio.sleep(delay)
+
+    def watch_tasks(self, tasks: list, timeout: float = None, interval: float = 1, max_interval: float = 30):
+        """Waits for many tasks in FortiManager to finish, and yields an event for every task as it finishes.
+
+        All pending tasks are polled with one filtered request per interval, so the number of requests does not grow with the number of tasks. The interval adapts to the average progress of the tasks, see wait_for_task().
+
+        Args:
+            tasks (list): IDs of the tasks.
+            timeout (float, optional): Seconds to wait before raising TaskTimeout for the tasks that have not finished. Default is no timeout.
+            interval (float): Seconds between the first polls, and the shortest interval. Default is 1.
+            max_interval (float): Longest interval between polls, in seconds. Default is 30.
+
+        Raises:
+            TaskTimeout: If not all tasks have finished within the timeout. The tasks keep running.
+            StatusError: If FortiManager returns an error.
+
+        Returns:
+            generator: TaskEvent with the ID and JSON data of every finished task, or an async generator when using AsyncApi. A task that FortiManager does not return, because it does not exist or has been purged, is yielded once with state None.
+        """
+
+        watcher = TaskWatcher(tasks=tasks, poller=TaskPoller(interval=interval, max_interval=max_interval))
+
+        if self.api.is_async:
+            return self._watch_tasks_async(watcher=watcher, timeout=timeout)
+
+        return self._watch_tasks_sync(watcher=watcher, timeout=timeout)
+
+    def _watch_tasks_sync(self, watcher: TaskWatcher, timeout: float):
+        end = time.monotonic() + timeout if timeout is not None else None
+
+        while watcher.pending:
+            yield from watcher.update(self._task_state(self.post(method="get", params=watcher.params())))
+
+            if not watcher.pending:
+                return
+
+            delay = self._poll_delay(end, watcher.poller, watcher.progress())
+
+            if delay is None:
+                raise TaskTimeout(task=sorted(watcher.pending), timeout=timeout)
+
+            time.sleep(delay)
+
+    async def _watch_tasks_async(self, watcher: TaskWatcher, timeout: float):
+        import asyncio
+
+        end = time.monotonic() + timeout if timeout is not None else None
+
+        while watcher.pending:
+            for event in watcher.update(self._task_state(await self.post(method="get", params=watcher.params()))):
+                yield event
+
+            if not watcher.pending:
+                return
+
+            delay = self._poll_delay(end, watcher.poller, watcher.progress())
+
+            if delay is None:
+                raise TaskTimeout(task=sorted(watcher.pending), timeout=timeout)
+
+            await asyncio.sleep(delay)
+
+    def _task_params(self, task: int):
+        """Returns the params of a request for the state of a task, without its lines.
+        """
+
+        return {
+            "url": f"/task/task/{task}",
+            "loadsub": False
+        }
+
+    def _task_state(self, response: dict, task: int = None):
+        """Returns the JSON data of a task, or of all requested tasks, or raises StatusError if FortiManager returned an error.
+        """
+
+        status = (response or {}).get('status') or {}
+
+        if status.get('code', 0) != 0:
+            raise StatusError(status=status, url=f"/task/task/{task}" if task else "/task/task")
+
+        return response.get('data') or {}
+
+    def _poll_delay(self, end: float, poller: TaskPoller, percent: float = None):
+        """Returns the seconds to wait before polling again, or None if the timeout has passed.
+        """
+
+        delay = poller.next_interval(percent)
+
+        if end is not None:
+            remaining = end - time.monotonic()
+
+            if remaining <= 0:
+                return None
+
+            delay = min(delay, remaining)
+
+        # Never sleep past the current deadline
+        deadline = current_deadline.get()
+
+        if deadline is not None:
+            delay = deadline.clip(delay)
+
+        return delay
@@ -19,6 +19,23 @@ setup(
     install_requires=[
         "requests>=2.20.0,<3.0"
     ],
+    extras_require={
+        "async": [
+            "aiohttp>=3.8,<4.0"
+        ],
+        "fast": [
+            "orjson>=3.0"
+        ],
+        "stream": [
+            "ijson>=3.1,<4.0"
+        ],
+        "otel": [
+            "opentelemetry-api>=1.0"
+        ],
+        "http2": [
+            "httpx[http2]>=0.23,<1.0"
+        ]
+    },
     zip_safe=False,
     keywords=[
         "fortinet",
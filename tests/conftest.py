@@ -0,0 +1,94 @@
+import pytest
+
+import pyfortimanager
+from pyfortimanager.core.tasks import STATE_DONE, STATE_RUNNING
+
+
+OK = {"code": 0, "message": "OK"}
+
+
+def ok(data=None):
+    """Returns the result of a successful params block.
+    """
+
+    result = {"status": dict(OK)}
+
+    if data is not None:
+        result['data'] = data
+
+    return result
+
+
+@pytest.fixture
+def make_api():
+    """Returns a function creating an Api that answers requests with a handler instead of a FortiManager.
+    """
+
+    def make(handler, transport=None, **kwargs):
+        return pyfortimanager.api(host="https://fortimanager.example.com", token="token", transport=transport or pyfortimanager.MemoryTransport(handler), **kwargs)
+
+    return make
+
+
+@pytest.fixture
+def make_async_api():
+    """Returns a function creating an AsyncApi that answers requests with a handler instead of a FortiManager.
+    """
+
+    def make(handler, transport=None, **kwargs):
+        return pyfortimanager.async_api(host="https://fortimanager.example.com", token="token", transport=transport or pyfortimanager.MemoryTransport(handler), **kwargs)
+
+    return make
+
+
+class TaskServer(object):
+    """Answers task requests like FortiManager. Every poll of a task advances it by step percent, until it finishes with its final state.
+
+    Args:
+        step (int): Percent a task advances per poll. Default is 50.
+    """
+
+    def __init__(self, step: int = 50):
+        self.step = step
+
+        self.tasks = {}
+        self.lines = {}
+        self._final = {}
+
+    def add(self, final: int = STATE_DONE, lines: list = None):
+        """Creates a task and returns its ID.
+        """
+
+        task = len(self.tasks) + 1
+        self.tasks[task] = {"id": task, "state": STATE_RUNNING, "percent": 0}
+        self.lines[task] = lines or []
+        self._final[task] = final
+
+        return task
+
+    def poll(self, task: int):
+        data = self.tasks[task]
+
+        if data['state'] == STATE_RUNNING:
+            data['percent'] = min(100, data['percent'] + self.step)
+
+            if data['percent'] == 100:
+                data['state'] = self._final[task]
+
+        return dict(data)
+
+    def handler(self, method: str, params: dict):
+        parts = params['url'].strip("/").split("/")
+
+        if parts == ["task", "task"]:
+            return ok([self.poll(task) for task in sorted(self.tasks)])
+
+        task = int(parts[2])
+
+        if task not in self.tasks:
+            return {"status": {"code": -3, "message": "Object does not exist"}}
+
+        if parts[-1] == "line":
+            return ok(self.lines[task])
+
+        return ok(self.poll(task))
@@ -0,0 +1,21 @@
+import asyncio
+
+import pytest
+
+from tests.conftest import ok
+
+
+def test_with_raises_type_error(make_async_api):
+    api = make_async_api(lambda method, params: ok())
+
+    with pytest.raises(TypeError, match="async with"):
+        with api:
+            pass
+
+
+def test_async_with_and_post(make_async_api):
+    async def main():
+        async with make_async_api(lambda method, params: ok([{"name": "root"}])) as api:
+            return await api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+    assert asyncio.run(main()) == ok([{"name": "root"}])
@@ -0,0 +1,295 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pyfortimanager.core.bulk import UNKNOWN_STATUS, DeviceResults, chunked
+from pyfortimanager.core.exceptions import TaskTimeout
+from pyfortimanager.core.tasks import STATE_DONE, STATE_ERROR
+
+from tests.conftest import TaskServer, ok
+
+
+DEVICE_LISTS = ("add-dev-list", "del-dev-member-list", "update-dev-member-list")
+
+
+def dev_list(server: TaskServer, rejected: tuple = (), unreachable: tuple = ()):
+    """Returns a handler creating a task for every multi-device command, with a failed task line for every rejected device. The first request with an unreachable device raises a connection error.
+    """
+
+    unreachable = set(unreachable)
+    sent = []
+
+    def handler(method, params):
+        if params['url'].startswith("/task/"):
+            return server.handler(method, params)
+
+        data = params['data']
+        names = [device['name'] for key in DEVICE_LISTS for device in data.get(key, ())]
+        sent.append(names)
+
+        if unreachable.intersection(names):
+            unreachable.difference_update(names)
+            raise ConnectionError("Connection refused")
+
+        lines = [{"name": name, "state": STATE_ERROR, "err": -1, "detail": "Rejected"} if name in rejected else {"name": name, "state": STATE_DONE, "err": 0} for name in names]
+
+        return ok({"taskid": server.add(final=STATE_ERROR if set(rejected).intersection(names) else STATE_DONE, lines=lines)})
+
+    handler.sent = sent
+
+    return handler
+
+
+def model(serial: str):
+    return {"serial": serial, "mr": 0, "os_ver": 7}
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+
+
+def test_sent_records_task_of_chunk():
+    results = DeviceResults()
+
+    results.sent(["FGT1", "FGT2"], ok({"taskid": 42}))
+
+    assert results.tasks == {42: ["FGT1", "FGT2"]}
+    assert results['FGT1'].task == 42
+    assert results.failed == []
+
+
+def test_sent_failed_chunk_has_no_task():
+    results = DeviceResults()
+
+    results.sent(["FGT1"], {"status": {"code": -10, "message": "Invalid"}, "data": {"taskid": 42}})
+
+    assert results.tasks == {}
+    assert results.failed == ["FGT1"]
+
+
+def test_updated_sets_status_per_device():
+    results = DeviceResults()
+
+    results.updated(["FGT1", "FGT2", "FGT3"], [ok(), {"status": {"code": -3, "message": "Object does not exist"}}])
+
+    assert results['FGT1'].ok
+    assert results['FGT2'].status['code'] == -3
+    assert results['FGT3'].status == UNKNOWN_STATUS
+    assert results.failed == ["FGT2", "FGT3"]
+
+
+def test_failed_chunk():
+    results = DeviceResults()
+
+    results.failed_chunk(["FGT1", "FGT2"], ConnectionError("Connection refused"))
+
+    assert results.failed == ["FGT1", "FGT2"]
+    assert results['FGT1'].status['message'] == "Connection refused"
+
+
+def test_finished_uses_task_lines():
+    results = DeviceResults()
+    results.sent(["FGT1", "FGT2", "FGT3"], ok({"taskid": 42}))
+
+    results.finished(42, STATE_ERROR, [
+        {"name": "FGT1", "state": STATE_DONE, "err": 0},
+        {"name": "FGT2", "state": STATE_ERROR, "err": -1, "detail": "Serial number already exists"},
+    ])
+
+    assert results['FGT1'].ok
+    assert results['FGT2'].detail == "Serial number already exists"
+    assert results['FGT3'].status == UNKNOWN_STATUS
+    assert results.failed == ["FGT2", "FGT3"]
+
+
+def test_finished_without_lines_uses_task_state():
+    results = DeviceResults()
+    results.sent(["FGT1"], ok({"taskid": 42}))
+
+    results.finished(42, STATE_DONE, [])
+
+    assert results['FGT1'].ok
+
+
+def test_timed_out():
+    results = DeviceResults()
+    results.sent(["FGT1"], ok({"taskid": 42}))
+    results.sent(["FGT2"], ok({"taskid": 43}))
+
+    results.timed_out(TaskTimeout(task=[43], timeout=10))
+
+    assert results.failed == ["FGT2"]
+    assert results['FGT2'].task == 43
+
+
+def test_merge_replaces_results_of_same_devices():
+    results = DeviceResults()
+    results.failed_chunk(["FGT1", "FGT2"], ConnectionError())
+
+    retried = DeviceResults()
+    retried.sent(["FGT2"], ok({"taskid": 44}))
+    results.merge(retried)
+
+    assert results.failed == ["FGT1"]
+    assert results.tasks == {44: ["FGT2"]}
+
+
+def test_update_many_does_not_resend_rejected_devices(make_api):
+    def handler(method, params):
+        if params['url'].endswith("/FGT2"):
+            return {"status": {"code": -3, "message": "Object does not exist"}}
+
+        return ok()
+
+    api = make_api(handler)
+
+    results = api.fortigates.update_many([{"fortigate": "FGT1", "description": "A"}, {"fortigate": "FGT2", "description": "B"}], retries=1)
+
+    assert results.failed == ["FGT2"]
+    assert not results['FGT2'].retriable
+    assert len(api.transport.requests) == 1
+
+
+def test_update_many_resends_devices_of_failed_request(make_api):
+    calls = []
+
+    def handler(method, params):
+        calls.append(params['url'])
+
+        if len(calls) == 1:
+            raise ConnectionError("Connection refused")
+
+        return ok()
+
+    api = make_api(handler)
+
+    results = api.fortigates.update_many([{"fortigate": "FGT1", "description": "A"}, {"fortigate": "FGT2", "description": "B"}], chunk_size=1, retries=1)
+
+    assert results.failed == []
+    assert calls.count(calls[0]) == 2
+
+
+def test_many_rejects_duplicate_names(make_api):
+    api = make_api(lambda method, params: ok())
+
+    with pytest.raises(ValueError, match="FGT1"):
+        api.fortigates.update_many([{"fortigate": "FGT1", "description": "A"}, {"fortigate": "FGT1", "description": "B"}])
+
+    with pytest.raises(ValueError, match="FGT1"):
+        api.fortigates.delete_many(["FGT1", "FGT1"])
+
+    assert api.transport.requests == []
+
+
+def test_add_many_waits_for_task_lines(make_api):
+    handler = dev_list(TaskServer(step=100), rejected=["FGT2"])
+    api = make_api(handler)
+
+    results = api.fortigates.add_many([model("FGT1"), model("FGT2"), model("FGT3")], chunk_size=2, wait=True)
+
+    assert handler.sent == [["FGT1", "FGT2"], ["FGT3"]]
+    assert results.tasks == {1: ["FGT1", "FGT2"], 2: ["FGT3"]}
+    assert results.failed == ["FGT2"]
+    assert results['FGT2'].detail == "Rejected"
+    assert results['FGT3'].ok and results['FGT3'].task == 2
+
+
+def test_add_many_resends_only_failed_chunks(make_api):
+    handler = dev_list(TaskServer(step=100), rejected=["FGT1"], unreachable=["FGT3"])
+    api = make_api(handler)
+
+    results = api.fortigates.add_many([model("FGT1"), model("FGT2"), model("FGT3")], chunk_size=2, wait=True, retries=2)
+
+    assert handler.sent == [["FGT1", "FGT2"], ["FGT3"], ["FGT3"]]
+    assert results.failed == ["FGT1"]
+    assert results['FGT3'].ok
+
+
+def test_add_many_timeout(make_api):
+    handler = dev_list(TaskServer(step=0))
+    api = make_api(handler)
+
+    results = api.fortigates.add_many([model("FGT1"), model("FGT2")], wait=True, timeout=0.05)
+
+    assert results.failed == ["FGT1", "FGT2"]
+    assert results['FGT1'].task == 1
+    assert "did not finish" in results['FGT1'].status['message']
+
+
+def test_add_many_async(make_async_api):
+    handler = dev_list(TaskServer(step=100), rejected=["FGT2"], unreachable=["FGT1"])
+    api = make_async_api(handler)
+
+    results = asyncio.run(api.fortigates.add_many([model("FGT1"), model("FGT2")], chunk_size=1, wait=True, retries=1))
+
+    assert handler.sent == [["FGT1"], ["FGT2"], ["FGT1"]]
+    assert results.failed == ["FGT2"]
+    assert results['FGT1'].ok
+
+
+def test_delete_many_waits_for_task_lines(make_api):
+    handler = dev_list(TaskServer(step=100), rejected=["FGT3"], unreachable=["FGT1"])
+    api = make_api(handler)
+
+    results = api.fortigates.delete_many(["FGT1", "FGT2", "FGT3"], chunk_size=2, wait=True)
+
+    assert handler.sent == [["FGT1", "FGT2"], ["FGT3"], ["FGT1", "FGT2"]]
+    assert results.failed == ["FGT3"]
+    assert results.tasks == {1: ["FGT3"], 2: ["FGT1", "FGT2"]}
+
+
+def test_refresh_fleet_sends_chunks_in_parallel(make_api):
+    handler = dev_list(TaskServer(step=100), rejected=["FGT4"])
+    lock = threading.Lock()
+    in_flight = []
+    concurrency = []
+
+    def slow(method, params):
+        if not params['url'].startswith("/task/"):
+            with lock:
+                in_flight.append(1)
+                concurrency.append(len(in_flight))
+
+            time.sleep(0.05)
+
+            with lock:
+                in_flight.pop()
+
+        return handler(method, params)
+
+    api = make_api(slow)
+    fortigates = [{"name": f"FGT{index}", "oid": index} for index in range(1, 7)]
+
+    results = api.fortigates.refresh_fleet(fortigates, chunk_size=2, max_workers=3)
+
+    assert max(concurrency) == 3
+    assert sorted(results) == [fortigate['name'] for fortigate in fortigates]
+    assert results.failed == ["FGT4"]
+    assert len(results.tasks) == 3
+
+
+def test_fortiaps_refresh_fleet(make_api):
+    calls = []
+
+    def handler(method, params):
+        devices = params['data']['device']
+        calls.append(devices)
+
+        if 2 in devices and calls.count(devices) == 1:
+            raise ConnectionError("Connection refused")
+
+        if 3 in devices:
+            return {"status": {"code": -6, "message": "Invalid url"}}
+
+        return ok()
+
+    api = make_api(handler)
+
+    results = api.fortiaps.refresh_fleet([1, 2, 3], chunk_size=1, max_workers=1, retries=1)
+
+    assert calls == [[1], [2], [3], [2]]
+    assert results.failed == [3]
+    assert results[2].ok
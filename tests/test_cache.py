@@ -0,0 +1,88 @@
+import threading
+
+from pyfortimanager import ResponseCache
+
+from tests.conftest import ok
+
+
+def test_read_is_cached(make_api):
+    cache = ResponseCache()
+    api = make_api(lambda method, params: ok([{"name": "root"}]), cache=cache)
+
+    for _ in range(3):
+        assert api.adoms.post(method="get", params={"url": "/dvmdb/adom"}) == ok([{"name": "root"}])
+
+    assert len(api.transport.requests) == 1
+    assert cache.hits == 2
+
+
+def test_write_invalidates_related_urls(make_api):
+    cache = ResponseCache()
+    api = make_api(lambda method, params: ok(), cache=cache)
+
+    api.adoms.post(method="get", params={"url": "/dvmdb/adom/root/device"})
+    api.adoms.post(method="get", params={"url": "/dvmdb/adom/root/device/FGT1"})
+    api.adoms.post(method="get", params={"url": "/pm/config/adom/root/obj/firewall/address"})
+    api.adoms.post(method="update", params={"url": "/dvmdb/adom/root/device/FGT1", "data": {}})
+
+    assert len(cache) == 1
+
+
+def test_exec_clears_cache(make_api):
+    cache = ResponseCache()
+    api = make_api(lambda method, params: ok(), cache=cache)
+
+    api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+    api.adoms.post(method="exec", params={"url": "/securityconsole/install/package", "data": {}})
+
+    assert len(cache) == 0
+
+
+def test_read_in_flight_during_write_is_not_cached(make_api):
+    cache = ResponseCache()
+    sent = threading.Event()
+    written = threading.Event()
+    data = {"value": 1}
+
+    def handler(method, params):
+        if method == "get":
+            value = data['value']
+            sent.set()
+            written.wait(5)
+            return ok({"value": value})
+
+        data['value'] = 2
+        return ok()
+
+    api = make_api(handler, cache=cache)
+    read = threading.Thread(target=api.adoms.post, kwargs={"method": "get", "params": {"url": "/dvmdb/adom/root"}})
+    read.start()
+    sent.wait(5)
+
+    api.adoms.post(method="set", params={"url": "/dvmdb/adom/root", "data": {}})
+    written.set()
+    read.join(5)
+
+    assert len(cache) == 0
+    assert api.adoms.post(method="get", params={"url": "/dvmdb/adom/root"})['data'] == {"value": 2}
+
+
+def test_cached_response_is_a_copy():
+    cache = ResponseCache()
+    response = ok([{"name": "root"}])
+
+    cache.set("get", {"url": "/dvmdb/adom"}, response)
+    response['data'].append({"name": "other"})
+
+    cached = cache.get("get", {"url": "/dvmdb/adom"})
+    cached['data'].clear()
+
+    assert cache.get("get", {"url": "/dvmdb/adom"}) == ok([{"name": "root"}])
+
+
+def test_failed_response_is_not_cached():
+    cache = ResponseCache()
+
+    cache.set("get", {"url": "/dvmdb/adom"}, {"status": {"code": -3, "message": "Object does not exist"}})
+
+    assert cache.get("get", {"url": "/dvmdb/adom"}) is None
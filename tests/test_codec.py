@@ -0,0 +1,33 @@
+import pytest
+
+from pyfortimanager.core.codec import JSONCodec, OrjsonCodec, default_codec
+
+
+def codecs():
+    yield JSONCodec()
+
+    try:
+        yield OrjsonCodec()
+    except ImportError:
+        pass
+
+
+@pytest.mark.parametrize("codec", list(codecs()), ids=lambda codec: codec.name)
+def test_round_trip(codec):
+    obj = {"method": "get", "params": [{"url": "/dvmdb/device", "data": {"name": "FGT1", "latitude": 52.5, "flags": None, "tags": ["a", "ü"]}}]}
+
+    assert isinstance(codec.dumps(obj), bytes)
+    assert codec.loads(codec.dumps(obj)) == obj
+
+
+@pytest.mark.parametrize("codec", list(codecs()), ids=lambda codec: codec.name)
+def test_non_string_keys_like_json(codec):
+    obj = {"meta fields": {1: "North", 2.5: "South", True: "East", None: "West"}}
+
+    assert codec.loads(codec.dumps(obj)) == JSONCodec().loads(JSONCodec().dumps(obj))
+
+
+def test_default_codec_prefers_orjson():
+    expected = "orjson" if len(list(codecs())) == 2 else "json"
+
+    assert default_codec().name == expected
@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import pytest
+
+from pyfortimanager import AdaptiveLimiter, Deadline
+from pyfortimanager.core.deadline import current_deadline
+from pyfortimanager.core.exceptions import DeadlineExceeded
+
+
+def test_budget_starts_when_block_is_entered():
+    deadline = Deadline(0.05)
+    time.sleep(0.1)
+
+    assert not deadline.expired
+
+    with deadline:
+        assert current_deadline.get() is deadline
+        assert 0 < deadline.remaining <= 0.05
+
+    assert current_deadline.get() is None
+
+
+def test_nested_block_keeps_running_budget():
+    deadline = Deadline(10)
+
+    with deadline:
+        expires_at = deadline.expires_at
+
+        with deadline:
+            assert deadline.expires_at == expires_at
+
+
+def test_no_request_is_sent_after_budget_is_spent(make_api):
+    api = make_api(lambda method, params: {"status": {"code": 0}})
+
+    with api.deadline(0.01):
+        time.sleep(0.02)
+
+        with pytest.raises(DeadlineExceeded):
+            api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+    assert api.transport.requests == []
+
+
+def test_limiter_wait_is_bounded_by_deadline(make_api):
+    limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+    api = make_api(lambda method, params: {"status": {"code": 0}}, limiter=limiter)
+    limiter.acquire()
+
+    start = time.monotonic()
+
+    with api.deadline(0.1):
+        with pytest.raises(DeadlineExceeded):
+            api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+    assert time.monotonic() - start < 1
+    assert limiter.in_flight == 1
+    assert api.transport.requests == []
+
+
+def test_async_waits_are_bounded_by_deadline(make_async_api):
+    limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+    api = make_async_api(lambda method, params: {"status": {"code": 0}}, limiter=limiter, max_concurrency=1)
+
+    async def main():
+        limiter.acquire()
+
+        async with api.deadline(0.1):
+            with pytest.raises(DeadlineExceeded):
+                await api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+        limiter.cancel()
+        await api.semaphore.acquire()
+
+        async with api.deadline(0.1):
+            with pytest.raises(DeadlineExceeded):
+                await api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+        api.semaphore.release()
+
+        return await api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+    start = time.monotonic()
+
+    assert asyncio.run(main()) == {"status": {"code": 0}}
+    assert time.monotonic() - start < 1
+    assert limiter.in_flight == 0
+    assert len(api.transport.requests) == 1
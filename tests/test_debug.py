@@ -0,0 +1,39 @@
+import logging
+import tracemalloc
+
+import pytest
+
+from pyfortimanager import SlowCallLog
+from pyfortimanager.core.debug import Capture
+
+from tests.conftest import ok
+
+
+@pytest.fixture
+def tracing():
+    tracemalloc.start()
+    yield
+    tracemalloc.stop()
+
+
+def test_slow_call_is_logged_with_memory(make_api, tracing, caplog):
+    debug = SlowCallLog(threshold=0, trace_memory=True)
+    api = make_api(lambda method, params: ok([{"name": "root"}]), debug=debug)
+
+    with caplog.at_level(logging.WARNING):
+        api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+    assert len(debug.calls) == 1
+    assert debug.calls[0]['memory'] is not None
+    assert "allocated" in caplog.text
+
+
+def test_capture_without_reset_peak(tracing, monkeypatch):
+    # Python 3.8 has no tracemalloc.reset_peak()
+    monkeypatch.delattr(tracemalloc, "reset_peak")
+
+    capture = Capture(trace_memory=True)
+    capture.stop()
+
+    assert capture.memory is not None
+    assert capture.memory_peak is None
@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+from pyfortimanager.core.exceptions import DeadlineExceeded
+
+from tests.conftest import ok
+
+
+def handler(method, params):
+    name = params['url'].rsplit("/", 1)[-1]
+
+    if name == "FGT2":
+        raise ConnectionError("Connection refused")
+
+    return ok({"name": name})
+
+
+def test_map_captures_errors_per_item(make_api):
+    api = make_api(handler)
+
+    results = list(api.map(lambda name: api.fortigates.all(fortigate=name), ["FGT1", "FGT2", "FGT3"], max_workers=3, ordered=True))
+
+    assert [result.item for result in results] == ["FGT1", "FGT2", "FGT3"]
+    assert [result.ok for result in results] == [True, False, True]
+    assert isinstance(results[1].error, ConnectionError)
+    assert results[2].result['data'] == {"name": "FGT3"}
+
+
+def test_map_ordered_waits_for_slower_items(make_api):
+    api = make_api(handler)
+
+    def fn(item):
+        time.sleep(0.05 if item == 0 else 0)
+        return item
+
+    assert [result.result for result in api.map(fn, range(6), max_workers=3)][-1] == 0
+    assert [result.result for result in api.map(fn, range(6), max_workers=3, ordered=True)] == list(range(6))
+
+
+def test_map_accepts_a_generator(make_api):
+    api = make_api(handler)
+
+    results = api.map(lambda item: item * 2, (item for item in range(100)), max_workers=4, ordered=True)
+
+    assert [result.result for result in results] == [item * 2 for item in range(100)]
+
+
+def test_map_skips_items_after_deadline(make_api):
+    api = make_api(handler)
+
+    def fn(item):
+        time.sleep(0.03)
+        return item
+
+    with api.deadline(0.05):
+        results = list(api.map(fn, range(10), max_workers=1, ordered=True))
+
+    assert results[0].ok
+    assert isinstance(results[-1].error, DeadlineExceeded)
+    assert len(results) == 10
+
+
+def test_map_async(make_async_api):
+    api = make_async_api(handler)
+
+    async def main():
+        return [result async for result in api.map(lambda name: api.fortigates.all(fortigate=name), ["FGT1", "FGT2", "FGT3"], max_workers=2, ordered=True)]
+
+    results = asyncio.run(main())
+
+    assert [result.ok for result in results] == [True, False, True]
+    assert isinstance(results[1].error, ConnectionError)
@@ -0,0 +1,45 @@
+from pyfortimanager import Field, all_of, any_of
+from pyfortimanager.core.filters import Filter, compile_filter
+
+from tests.conftest import ok
+
+
+def test_field_comparisons():
+    assert (Field("os_ver") == 7).compile() == ["os_ver", "==", 7]
+    assert (Field("os_ver") != 7).compile() == ["os_ver", "!=", 7]
+    assert (Field("mr") < 4).compile() == ["mr", "<", 4]
+    assert (Field("mr") <= 4).compile() == ["mr", "<=", 4]
+    assert (Field("mr") > 4).compile() == ["mr", ">", 4]
+    assert (Field("mr") >= 4).compile() == ["mr", ">=", 4]
+    assert Field("name").like("FGT%").compile() == ["name", "like", "FGT%"]
+    assert Field("sn").in_("FGT1", "FGT2").compile() == ["sn", "in", "FGT1", "FGT2"]
+
+
+def test_nested_and_or():
+    expression = ((Field("os_ver") == 7) & Field("name").like("FGT%")) | Field("sn").in_("FGT1")
+
+    assert expression.compile() == [[["os_ver", "==", 7], "&&", ["name", "like", "FGT%"]], "||", ["sn", "in", "FGT1"]]
+
+
+def test_combined_with_raw_filter():
+    assert ((Field("os_ver") == 7) & ["mr", "==", 4]).compile() == [["os_ver", "==", 7], "&&", ["mr", "==", 4]]
+
+
+def test_all_of_and_any_of():
+    assert all_of(Field("os_ver") == 7, Field("mr") == 4, Field("conn_status") == 1).compile() == [["os_ver", "==", 7], "&&", ["mr", "==", 4], "&&", ["conn_status", "==", 1]]
+    assert any_of(Field("os_ver") == 6, all_of(Field("os_ver") == 7, Field("mr") < 4)).compile() == [["os_ver", "==", 6], "||", [["os_ver", "==", 7], "&&", ["mr", "<", 4]]]
+    assert all_of(Field("os_ver") == 7).compile() == ["os_ver", "==", 7]
+
+
+def test_compile_filter_passes_raw_filters():
+    assert compile_filter(["name", "==", "FGT1"]) == ["name", "==", "FGT1"]
+    assert compile_filter(None) is None
+    assert isinstance(Field("name") == "FGT1", Filter)
+
+
+def test_filter_is_sent_compiled(make_api):
+    api = make_api(lambda method, params: ok([]))
+
+    api.system.tasks(filter=(Field("state") == 4) | (Field("state") == 5))
+
+    assert api.transport.requests[0]['params'][0]['filter'] == [["state", "==", 4], "||", ["state", "==", 5]]
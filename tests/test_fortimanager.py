@@ -0,0 +1,68 @@
+import pytest
+
+from pyfortimanager.core.exceptions import HTTPError
+from pyfortimanager.core.transport import Response
+
+from tests.conftest import ok
+
+
+def test_post_returns_result_of_params_block(make_api):
+    api = make_api(lambda method, params: ok([{"name": "root"}]))
+
+    response = api.adoms.post(method="get", params={"url": "/dvmdb/adom", "fields": ["name"]})
+
+    assert response == ok([{"name": "root"}])
+    assert len(api.transport.requests) == 1
+
+    request = api.transport.requests[0]
+    assert request['method'] == "get"
+    assert request['params'] == [{"url": "/dvmdb/adom", "fields": ["name"]}]
+
+
+def test_post_raises_http_error(make_api):
+    api = make_api(lambda method, params: Response(503, b""))
+
+    with pytest.raises(HTTPError) as error:
+        api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+    assert error.value.status_code == 503
+    assert error.value.url == "/dvmdb/adom"
+
+
+def test_batch_sends_one_request_per_method(make_api):
+    api = make_api(lambda method, params: ok({"url": params['url']}))
+
+    with api.batch():
+        first = api.adoms.post(method="get", params={"url": "/dvmdb/adom/root"})
+        second = api.adoms.post(method="get", params={"url": "/dvmdb/adom/other"})
+        third = api.adoms.post(method="set", params={"url": "/dvmdb/adom/root", "data": {}})
+
+        assert not first.done
+
+    assert [request['method'] for request in api.transport.requests] == ["get", "set"]
+    assert len(api.transport.requests[0]['params']) == 2
+
+    assert first.result['data'] == {"url": "/dvmdb/adom/root"}
+    assert second.result['data'] == {"url": "/dvmdb/adom/other"}
+    assert third.result['status']['code'] == 0
+
+
+def test_batch_max_size_splits_requests(make_api):
+    api = make_api(lambda method, params: ok())
+
+    with api.batch(max_size=2):
+        results = [api.adoms.post(method="get", params={"url": f"/dvmdb/adom/{index}"}) for index in range(5)]
+
+    assert [len(request['params']) for request in api.transport.requests] == [2, 2, 1]
+    assert all(result.done for result in results)
+
+
+def test_batch_is_not_sent_if_block_raises(make_api):
+    api = make_api(lambda method, params: ok())
+
+    with pytest.raises(RuntimeError):
+        with api.batch():
+            api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+            raise RuntimeError()
+
+    assert api.transport.requests == []
@@ -0,0 +1,145 @@
+import asyncio
+import itertools
+import time
+
+import pytest
+
+from pyfortimanager import AdaptiveLimiter, CircuitBreaker, HedgePolicy, MemoryTracer, Metrics, MemoryTransport
+
+from tests.conftest import ok
+
+
+class SlowTransport(MemoryTransport):
+    """Answers every third request slowly, so its hedged copy wins and the slow request is cancelled.
+    """
+
+    def __init__(self, handler, slow: float = 0.2):
+        super(SlowTransport, self).__init__(handler)
+        self.slow = slow
+        self._counter = itertools.count()
+
+    async def send_async(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        await asyncio.sleep(self.slow if next(self._counter) % 3 == 2 else 0.001)
+        return self._respond(data)
+
+    def send(self, url: str, data: bytes, headers: dict, timeout: tuple):
+        time.sleep(self.slow if next(self._counter) % 3 == 2 else 0.001)
+        return self._respond(data)
+
+
+def test_cancelled_hedge_is_not_a_failure(make_async_api):
+    limiter = AdaptiveLimiter(initial_limit=20, tolerance=1000)
+    breaker = CircuitBreaker(failure_threshold=3)
+    metrics = Metrics()
+    tracer = MemoryTracer()
+    hedge = HedgePolicy(percentile=50, min_samples=5, max_ratio=1)
+    api = make_async_api(None, transport=SlowTransport(lambda method, params: ok()), limiter=limiter, circuit_breaker=breaker, metrics=metrics, tracer=tracer, hedge=hedge)
+
+    async def main():
+        for _ in range(30):
+            await api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+    asyncio.run(main())
+
+    assert hedge.hedged > 0
+    assert limiter.in_flight == 0
+    assert limiter.limit >= 20
+    assert breaker.state == "closed" and breaker.failures == 0
+    assert all(labels[3] == "200" for labels in metrics.snapshot()['counters']['requests_total'])
+    assert not any(span.error for span in tracer.spans)
+
+
+def slow_then_fast(slow: float = 0.5):
+    """Returns a function whose first call takes slow seconds and whose later calls return at once.
+    """
+
+    calls = itertools.count()
+
+    def fn():
+        call = next(calls)
+
+        if call == 0:
+            time.sleep(slow)
+
+        return call
+
+    return fn
+
+
+def warm(hedge: HedgePolicy, key: str = "get /dvmdb/adom", latency: float = 0.01):
+    for _ in range(hedge.min_samples):
+        hedge.record(key, latency)
+
+    return key
+
+
+def test_run_without_samples_does_not_hedge():
+    hedge = HedgePolicy(min_samples=5)
+
+    assert hedge.run("get /dvmdb/adom", slow_then_fast(0.05)) == 0
+    assert hedge.hedged == 0
+
+
+def test_run_hedge_wins():
+    hedge = HedgePolicy(min_samples=5, max_ratio=1)
+    key = warm(hedge)
+    started = time.monotonic()
+
+    assert hedge.run(key, slow_then_fast()) == 1
+    assert time.monotonic() - started < 0.4
+    assert hedge.hedged == 1
+
+
+def test_run_max_ratio_waits_for_first_call():
+    hedge = HedgePolicy(min_samples=5, max_ratio=0)
+    key = warm(hedge)
+
+    assert hedge.run(key, slow_then_fast(0.1)) == 0
+    assert hedge.hedged == 0
+
+
+def test_run_raises_error_when_both_calls_fail():
+    hedge = HedgePolicy(min_samples=5, max_ratio=1)
+    key = warm(hedge)
+
+    def fn():
+        time.sleep(0.05)
+        raise ConnectionError("Connection refused")
+
+    with pytest.raises(ConnectionError):
+        hedge.run(key, fn)
+
+    assert hedge.hedged == 1
+
+
+def test_run_async_hedge_wins_and_cancels_slower_call():
+    hedge = HedgePolicy(min_samples=5, max_ratio=1)
+    key = warm(hedge)
+    calls = itertools.count()
+    cancelled = []
+
+    async def fn():
+        call = next(calls)
+
+        try:
+            if call == 0:
+                await asyncio.sleep(0.5)
+        except asyncio.CancelledError:
+            cancelled.append(call)
+            raise
+
+        return call
+
+    assert asyncio.run(hedge.run_async(key, fn)) == 1
+    assert cancelled == [0]
+    assert hedge.hedged == 1
+
+
+def test_api_hedges_slow_reads(make_api):
+    hedge = HedgePolicy(percentile=50, min_samples=5, max_ratio=1)
+    api = make_api(None, transport=SlowTransport(lambda method, params: ok({"name": "root"})), hedge=hedge)
+
+    for _ in range(10):
+        assert api.adoms.post(method="get", params={"url": "/dvmdb/adom/root"}) == ok({"name": "root"})
+
+    assert hedge.hedged > 0
@@ -0,0 +1,39 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def imported_after(code: str):
+    """Runs code in a new interpreter and returns the names of the modules imported by then.
+    """
+
+    script = f"import sys\n{code}\nprint('\\n'.join(sys.modules))"
+    output = subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).parent.parent, capture_output=True, text=True, check=True).stdout
+
+    return set(output.split())
+
+
+def test_import_does_not_load_http_clients_or_models():
+    modules = imported_after("import pyfortimanager")
+
+    for module in ("requests", "urllib3", "aiohttp", "httpx", "ijson", "opentelemetry"):
+        assert module not in modules
+
+    assert not any(module.startswith("pyfortimanager.models.") for module in modules)
+
+
+def test_model_is_imported_on_first_use():
+    modules = imported_after("import pyfortimanager\npyfortimanager.api(host='https://fortimanager.example.com', token='token', transport=pyfortimanager.MemoryTransport(None)).adoms")
+
+    assert "pyfortimanager.models.adoms" in modules
+    assert "pyfortimanager.models.fortigates" not in modules
+    assert "requests" not in modules
+
+
+@pytest.mark.parametrize("name", ["adoms", "fortigates", "system"])
+def test_model_instance_is_cached(make_api, name):
+    api = make_api(None)
+
+    assert getattr(api, name) is getattr(api, name)
@@ -0,0 +1,40 @@
+import threading
+import time
+
+from tests.conftest import ok
+
+
+def test_iter_all_reads_every_page(make_api):
+    devices = [{"name": f"FGT{index}"} for index in range(25)]
+
+    def handler(method, params):
+        start, size = params['range']
+        return ok(devices[start:start + size])
+
+    api = make_api(handler)
+
+    assert list(api.fortigates.iter_all(page_size=10, prefetch=True)) == devices
+    assert [request['params'][0]['range'] for request in api.transport.requests] == [[0, 10], [10, 10], [20, 10]]
+
+
+def test_closing_iterator_does_not_wait_for_prefetched_page(make_api):
+    release = threading.Event()
+
+    def handler(method, params):
+        start, size = params['range']
+
+        if start > 0:
+            release.wait(5)
+
+        return ok([{"name": f"FGT{index}"} for index in range(start, start + size)])
+
+    api = make_api(handler)
+    iterator = api.fortigates.iter_all(page_size=10, prefetch=True)
+    next(iterator)
+
+    start = time.monotonic()
+    iterator.close()
+    elapsed = time.monotonic() - start
+    release.set()
+
+    assert elapsed < 1
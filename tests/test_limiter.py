@@ -0,0 +1,69 @@
+import pytest
+
+from pyfortimanager import AdaptiveLimiter
+from pyfortimanager.core.exceptions import HTTPError
+from pyfortimanager.core.transport import Response
+
+from tests.conftest import ok
+
+
+def test_slot_is_released_when_transport_raises(make_api):
+    def handler(method, params):
+        raise ConnectionError("Connection refused")
+
+    limiter = AdaptiveLimiter(initial_limit=2)
+    api = make_api(handler, limiter=limiter)
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+    assert limiter.in_flight == 0
+
+
+def test_slot_is_released_on_http_error(make_api):
+    limiter = AdaptiveLimiter(initial_limit=2)
+    api = make_api(lambda method, params: Response(500, b""), limiter=limiter)
+
+    for _ in range(3):
+        with pytest.raises(HTTPError):
+            api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+    assert limiter.in_flight == 0
+
+
+def test_slot_is_not_taken_when_payload_cannot_be_encoded(make_api):
+    limiter = AdaptiveLimiter(initial_limit=2)
+    api = make_api(lambda method, params: ok(), limiter=limiter)
+
+    for _ in range(3):
+        with pytest.raises(TypeError):
+            api.adoms.post(method="get", params={"url": "/dvmdb/adom", "fields": {object()}})
+
+    assert limiter.in_flight == 0
+    assert api.transport.requests == []
+
+
+def test_limit_decreases_on_error_and_grows_on_success():
+    limiter = AdaptiveLimiter(initial_limit=10, backoff=0.5)
+
+    limiter.acquire()
+    limiter.release(latency=0.1, error=True)
+
+    assert limiter.limit == 5
+
+    limiter.acquire()
+    limiter.release(latency=0.1)
+
+    assert limiter.limit == pytest.approx(5.2)
+    assert limiter.in_flight == 0
+
+
+def test_latency_is_tracked_per_url_template(make_api):
+    limiter = AdaptiveLimiter()
+    api = make_api(lambda method, params: ok(), limiter=limiter)
+
+    for index in range(5):
+        api.fortigates.post(method="get", params={"url": f"/dvmdb/adom/root/device/FGT{index}"})
+
+    assert list(limiter._latencies) == ["get /dvmdb/adom/{adom}/device/{device}"]
@@ -0,0 +1,49 @@
+from pyfortimanager import Exporter, Metrics, PrometheusExporter
+
+from tests.conftest import ok
+
+
+class ListExporter(Exporter):
+    def __init__(self):
+        self.calls = []
+
+    def export(self, call):
+        self.calls.append(call)
+
+
+def test_requests_are_counted_per_url_template(make_api):
+    exporter = ListExporter()
+    metrics = Metrics(exporters=[exporter])
+    api = make_api(lambda method, params: ok(), metrics=metrics)
+
+    api.fortigates.post(method="get", params={"url": "/dvmdb/adom/root/device/FGT1"})
+    api.fortigates.post(method="get", params={"url": "/dvmdb/adom/root/device/FGT2"})
+
+    counters = metrics.snapshot()['counters']
+
+    assert counters['requests_total'] == {("get", "/dvmdb/adom/{adom}/device/{device}", "root", "200", "0"): 2}
+    assert [call.url for call in exporter.calls] == ["/dvmdb/adom/{adom}/device/{device}"] * 2
+
+
+def test_snapshot_is_a_copy(make_api):
+    metrics = Metrics()
+    api = make_api(lambda method, params: ok(), metrics=metrics)
+
+    api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+    snapshot = metrics.snapshot()
+    api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+    assert sum(snapshot['counters']['requests_total'].values()) == 1
+    assert sum(histogram.count for histogram in snapshot['histograms']['request_latency_seconds'].values()) == 1
+
+
+def test_prometheus_text_format(make_api):
+    metrics = Metrics()
+    api = make_api(lambda method, params: ok(), metrics=metrics)
+
+    api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+    text = PrometheusExporter(metrics).render()
+
+    assert "# TYPE pyfortimanager_requests_total counter" in text
+    assert 'pyfortimanager_requests_total{method="get",url="/dvmdb/adom",adom="",http_status="200",status_code="0"} 1' in text
+    assert 'pyfortimanager_request_latency_seconds_bucket{method="get",url="/dvmdb/adom",adom="",le="+Inf"} 1' in text
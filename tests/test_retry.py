@@ -0,0 +1,124 @@
+import pytest
+
+from pyfortimanager import CircuitBreaker, RetryPolicy
+from pyfortimanager.core.exceptions import CircuitOpenError, HTTPError
+from pyfortimanager.core.transport import Response
+
+from tests.conftest import ok
+
+
+def failing(times: int, status: int = 503):
+    """Returns a handler failing with an HTTP status the given number of times, then succeeding.
+    """
+
+    calls = []
+
+    def handler(method, params):
+        calls.append(method)
+
+        if len(calls) <= times:
+            return Response(status, b"")
+
+        return ok()
+
+    return handler
+
+
+def test_read_is_retried(make_api):
+    api = make_api(failing(2), retry=RetryPolicy(retries=2, backoff=0))
+
+    assert api.adoms.post(method="get", params={"url": "/dvmdb/adom"}) == ok()
+    assert len(api.transport.requests) == 3
+
+
+def test_read_gives_up_after_retries(make_api):
+    api = make_api(failing(3), retry=RetryPolicy(retries=2, backoff=0))
+
+    with pytest.raises(HTTPError):
+        api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+    assert len(api.transport.requests) == 3
+
+
+def test_write_is_not_retried_after_it_was_sent(make_api):
+    api = make_api(failing(1), retry=RetryPolicy(retries=2, write_retries=2, backoff=0))
+
+    with pytest.raises(HTTPError):
+        api.adoms.post(method="set", params={"url": "/dvmdb/adom/root", "data": {}})
+
+    assert len(api.transport.requests) == 1
+
+
+def test_status_is_not_retried(make_api):
+    api = make_api(failing(1, status=404), retry=RetryPolicy(retries=2, backoff=0))
+
+    with pytest.raises(HTTPError):
+        api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+    assert len(api.transport.requests) == 1
+
+
+def test_breaker_opens_after_threshold(make_api):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    api = make_api(failing(10), circuit_breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(HTTPError):
+            api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+    assert len(api.transport.requests) == 2
+
+
+def test_breaker_closes_after_successful_trial(make_api):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    api = make_api(failing(1), circuit_breaker=breaker)
+
+    with pytest.raises(HTTPError):
+        api.adoms.post(method="get", params={"url": "/dvmdb/adom"})
+
+    assert breaker.state == "half-open"
+    assert api.adoms.post(method="get", params={"url": "/dvmdb/adom"}) == ok()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+def test_breaker_reopens_after_failed_trial():
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=60)
+    breaker.opened_at = 0
+
+    assert breaker.state == "half-open"
+
+    breaker.before()
+    breaker.failure()
+
+    assert breaker.state == "open"
+
+
+def test_breaker_lets_one_trial_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.opened_at = 0
+
+    breaker.before()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before()
+
+    breaker.cancel()
+    breaker.before()
+
+
+def test_breaker_trial_is_given_back_when_payload_cannot_be_encoded(make_api):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.opened_at = 0
+    api = make_api(lambda method, params: ok(), circuit_breaker=breaker)
+
+    with pytest.raises(TypeError):
+        api.adoms.post(method="get", params={"url": "/dvmdb/adom", "fields": {object()}})
+
+    assert api.adoms.post(method="get", params={"url": "/dvmdb/adom"}) == ok()
+    assert breaker.state == "closed"
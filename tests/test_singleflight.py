@@ -0,0 +1,82 @@
+import asyncio
+import threading
+
+import pytest
+
+from pyfortimanager import Deadline
+from pyfortimanager.core.exceptions import DeadlineExceeded
+from pyfortimanager.core.singleflight import SingleFlight
+
+
+def test_followers_share_call_and_get_a_copy():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return [{"data": [1]}]
+
+    leader = threading.Thread(target=lambda: results.append(flight.do("key", fn)))
+    leader.start()
+    started.wait(5)
+
+    follower = threading.Thread(target=lambda: results.append(flight.do("key", fn)))
+    follower.start()
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(calls) == 1
+    assert results[0] == results[1]
+    assert results[0] is not results[1]
+    assert results[0][0]['data'] is not results[1][0]['data']
+
+
+def test_follower_wait_is_bounded_by_deadline():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fn():
+        started.set()
+        release.wait(5)
+
+    leader = threading.Thread(target=flight.do, args=("key", fn))
+    leader.start()
+    started.wait(5)
+
+    try:
+        with Deadline(0.05):
+            with pytest.raises(DeadlineExceeded):
+                flight.do("key", fn)
+    finally:
+        release.set()
+        leader.join(5)
+
+
+def test_async_follower_wait_is_bounded_by_deadline():
+    flight = SingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.5)
+        return [{"data": [1]}]
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do_async("key", fn))
+        await asyncio.sleep(0)
+
+        async with Deadline(0.05):
+            with pytest.raises(DeadlineExceeded):
+                await flight.do_async("key", fn)
+
+        follower = await flight.do_async("key", fn)
+
+        assert follower == await leader
+        assert follower is not leader.result()
+
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import pytest
+
+from pyfortimanager.core.exceptions import StatusError
+from pyfortimanager.core.stream import StreamDecoder
+
+from tests.conftest import ok
+
+
+ijson = pytest.importorskip("ijson")
+
+
+def decode(response: dict):
+    """Returns the objects StreamDecoder builds from a response, and its status.
+    """
+
+    decoder = StreamDecoder()
+    items = []
+
+    for prefix, event, value in ijson.parse(json.dumps(response).encode(), use_float=True):
+        complete, item = decoder.feed(prefix, event, value)
+
+        if complete:
+            items.append(item)
+
+    return items, decoder.status
+
+
+def test_decoder_list():
+    items, status = decode({"id": 1, "result": [{"status": {"code": 0, "message": "OK"}, "data": [{"name": "FGT1", "meta fields": {"Region": "North"}}, {"name": "FGT2", "vdom": [{"name": "root"}]}, "text", 1.5]}]})
+
+    assert items == [{"name": "FGT1", "meta fields": {"Region": "North"}}, {"name": "FGT2", "vdom": [{"name": "root"}]}, "text", 1.5]
+    assert status == {"code": 0, "message": "OK"}
+
+
+def test_decoder_single_object():
+    items, status = decode({"id": 1, "result": [{"data": {"name": "FGT1", "sn": "FGT60F"}, "status": {"code": 0, "message": "OK"}}]})
+
+    assert items == [{"name": "FGT1", "sn": "FGT60F"}]
+    assert status['code'] == 0
+
+
+def test_decoder_error_status():
+    items, status = decode({"id": 1, "result": [{"status": {"code": -3, "message": "Object does not exist"}, "url": "/dvmdb/device/FGT1"}]})
+
+    assert items == []
+    assert status == {"code": -3, "message": "Object does not exist"}
+
+
+def test_stream(make_api):
+    api = make_api(lambda method, params: ok([{"name": "FGT1"}, {"name": "FGT2"}]))
+
+    assert list(api.fortigates.stream(params={"url": "/dvmdb/device"})) == [{"name": "FGT1"}, {"name": "FGT2"}]
+
+
+def test_stream_error_status(make_api):
+    api = make_api(lambda method, params: {"status": {"code": -3, "message": "Object does not exist"}})
+
+    with pytest.raises(StatusError):
+        list(api.fortigates.stream(params={"url": "/dvmdb/device/FGT1"}))
+
+
+def test_stream_async(make_async_api):
+    api = make_async_api(lambda method, params: ok({"name": "FGT1"}))
+
+    async def main():
+        return [item async for item in api.fortigates.stream(params={"url": "/dvmdb/device/FGT1"})]
+
+    assert asyncio.run(main()) == [{"name": "FGT1"}]
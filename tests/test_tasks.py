@@ -0,0 +1,171 @@
+import asyncio
+
+import pytest
+
+from pyfortimanager.core.exceptions import StatusError, TaskTimeout
+from pyfortimanager.core.tasks import STATE_DONE, STATE_ERROR, STATE_RUNNING, TaskPoller, TaskWatcher
+
+from tests.conftest import TaskServer, ok
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the monotonic clock of the poller with a list holding the current time.
+    """
+
+    now = [0.0]
+    monkeypatch.setattr("pyfortimanager.core.tasks.time.monotonic", lambda: now[0])
+
+    return now
+
+
+def test_poller_backs_off_without_progress(clock):
+    poller = TaskPoller(interval=1, max_interval=3, jitter=0)
+
+    assert [poller.next_interval() for _ in range(5)] == [1, 1.5, 2.25, 3, 3]
+
+
+def test_poller_plans_halfway_to_completion(clock):
+    poller = TaskPoller(interval=1, max_interval=30, jitter=0)
+
+    assert poller.next_interval(0) == 1
+
+    clock[0] = 10
+    assert poller.next_interval(50) == 5
+
+    # Faster than the shortest interval
+    clock[0] = 11
+    assert poller.next_interval(99) == 1
+
+
+def test_poller_jitter():
+    intervals = [TaskPoller(interval=1, jitter=0.1).next_interval() for _ in range(20)]
+
+    assert all(0.9 <= interval <= 1.1 for interval in intervals)
+    assert len(set(intervals)) > 1
+
+
+def test_wait_for_task(make_api):
+    server = TaskServer(step=40)
+    task = server.add(lines=[{"name": "FGT1", "state": STATE_DONE}])
+    api = make_api(server.handler)
+    progress = []
+
+    result = api.system.wait_for_task(task, interval=0.01, progress=lambda state: progress.append(state['percent']))
+
+    assert result['data'] == [{"name": "FGT1", "state": STATE_DONE}]
+    assert progress == [40, 80, 100]
+    assert [request['params'][0]['url'] for request in api.transport.requests] == [f"/task/task/{task}"] * 3 + [f"/task/task/{task}/line"]
+
+
+def test_wait_for_task_timeout(make_api):
+    server = TaskServer(step=1)
+    task = server.add()
+    api = make_api(server.handler)
+
+    with pytest.raises(TaskTimeout) as error:
+        api.system.wait_for_task(task, timeout=0.05, interval=0.01)
+
+    assert error.value.task == task
+    assert 0 < error.value.state['percent'] < 100
+    assert server.tasks[task]['state'] == STATE_RUNNING
+
+
+def test_wait_for_task_that_does_not_exist(make_api):
+    api = make_api(TaskServer().handler)
+
+    with pytest.raises(StatusError):
+        api.system.wait_for_task(99, interval=0.01)
+
+
+def test_wait_for_task_async(make_async_api):
+    server = TaskServer()
+    task = server.add(final=STATE_ERROR, lines=[{"name": "FGT1", "state": STATE_ERROR, "err": -1}])
+    api = make_async_api(server.handler)
+
+    result = asyncio.run(api.system.wait_for_task(task, interval=0.01))
+
+    assert result['data'][0]['err'] == -1
+    assert server.tasks[task]['state'] == STATE_ERROR
+
+
+def test_watcher_reports_tasks_that_were_not_returned():
+    watcher = TaskWatcher(tasks=[1, 2, 3], poller=TaskPoller())
+
+    events = watcher.update([{"id": 1, "state": STATE_DONE}, {"id": 2, "state": STATE_RUNNING, "percent": 50}])
+
+    assert [(event.task, event.state) for event in events] == [(1, STATE_DONE), (3, None)]
+    assert not events[1].ok
+    assert watcher.pending == {2}
+
+
+def test_watch_tasks_ends_when_task_does_not_exist(make_api):
+    api = make_api(lambda method, params: ok([{"id": 1, "state": STATE_DONE}]))
+
+    events = list(api.system.watch_tasks([1, 99], interval=0.01))
+
+    assert [(event.task, event.state) for event in events] == [(1, STATE_DONE), (99, None)]
+    assert len(api.transport.requests) == 1
+
+
+def test_watcher_filter_uses_range_for_dense_tasks():
+    watcher = TaskWatcher(tasks=[10, 11, 13], poller=TaskPoller())
+
+    assert watcher.params()['filter'] == [["id", ">=", 10], "&&", ["id", "<=", 13]]
+
+    watcher = TaskWatcher(tasks=[100, 1, 50], poller=TaskPoller())
+
+    assert watcher.params()['filter'] == ["id", "in", 1, 50, 100]
+
+
+def test_watcher_progress():
+    watcher = TaskWatcher(tasks=[1, 2], poller=TaskPoller())
+
+    assert watcher.update([{"id": 1, "state": STATE_RUNNING, "percent": 50}, {"id": 2, "state": STATE_RUNNING}, {"id": 3, "state": STATE_DONE}]) == []
+    assert watcher.progress() == 25
+
+    events = watcher.update([{"id": 1, "state": STATE_DONE}, {"id": 2, "state": STATE_RUNNING, "percent": 50}])
+
+    assert [event.task for event in events] == [1]
+    assert events[0].ok
+    assert watcher.progress() == 75
+
+
+def test_watch_tasks_polls_all_tasks_at_once(make_api):
+    server = TaskServer()
+    server.add()
+    server.add(final=STATE_ERROR)
+    api = make_api(server.handler)
+
+    # The second task starts later, so it finishes one poll after the first
+    server.tasks[2]['percent'] = -50
+
+    events = list(api.system.watch_tasks([1, 2], interval=0.01))
+
+    assert [(event.task, event.state, event.ok) for event in events] == [(1, STATE_DONE, True), (2, STATE_ERROR, False)]
+    assert len(api.transport.requests) == 3
+
+
+def test_watch_tasks_timeout(make_api):
+    server = TaskServer(step=1)
+    server.add()
+    server.add()
+    api = make_api(server.handler)
+
+    with pytest.raises(TaskTimeout) as error:
+        list(api.system.watch_tasks([1, 2], timeout=0.05, interval=0.01))
+
+    assert error.value.task == [1, 2]
+
+
+def test_watch_tasks_async(make_async_api):
+    server = TaskServer()
+    server.add()
+    server.add()
+    api = make_async_api(server.handler)
+
+    async def main():
+        return [event.task async for event in api.system.watch_tasks([1, 2], interval=0.01)]
+
+    assert asyncio.run(main()) == [1, 2]
+    assert len(api.transport.requests) == 2
@@ -0,0 +1,81 @@
+import asyncio
+
+from pyfortimanager import MemoryTracer
+
+from tests.conftest import ok
+
+
+def handler(method, params):
+    if params['url'].endswith("/FGT2"):
+        raise ConnectionError("Connection refused")
+
+    return ok({"name": params['url'].rsplit("/", 1)[-1]})
+
+
+def names(spans):
+    return sorted(span.name for span in spans)
+
+
+def test_model_method_is_parent_of_request(make_api):
+    tracer = MemoryTracer()
+    api = make_api(handler, tracer=tracer)
+
+    api.fortigates.all(fortigate="FGT1")
+
+    method, = [span for span in tracer.spans if span.parent is None]
+    request, = tracer.children(method)
+
+    assert method.name == "FortiGates.all"
+    assert request.name == "jsonrpc get /dvmdb/adom/{adom}/device/{device}"
+    assert request.attributes['pyfortimanager.url'] == "/dvmdb/adom/root/device/FGT1"
+    assert request.attributes['pyfortimanager.params'] == 1
+    assert method.start_time <= request.start_time and request.end_time <= method.end_time
+
+
+def test_map_is_parent_of_calls_in_every_thread(make_api):
+    tracer = MemoryTracer()
+    api = make_api(handler, tracer=tracer)
+
+    results = list(api.map(lambda name: api.fortigates.all(fortigate=name), ["FGT1", "FGT2", "FGT3"], max_workers=3))
+
+    root, = [span for span in tracer.spans if span.parent is None]
+    methods = tracer.children(root)
+
+    assert root.name == "Api.map"
+    assert names(methods) == ["FortiGates.all"] * 3
+    assert all(len(tracer.children(method)) == 1 for method in methods)
+    assert sum(1 for span in tracer.spans if span.error is not None) == 2
+    assert sum(1 for result in results if not result.ok) == 1
+    assert root.error is None
+
+
+def test_batch_is_parent_of_its_request(make_api):
+    tracer = MemoryTracer()
+    api = make_api(handler, tracer=tracer)
+
+    with api.batch():
+        api.fortigates.all(fortigate="FGT1")
+        api.fortigates.all(fortigate="FGT3")
+
+    batch, = [span for span in tracer.spans if span.name == "Batch.send"]
+    request, = tracer.children(batch)
+
+    assert batch.attributes['pyfortimanager.calls'] == 2
+    assert request.attributes['pyfortimanager.params'] == 2
+    assert names(span for span in tracer.spans if span.parent is None) == ["Batch.send", "FortiGates.all", "FortiGates.all"]
+
+
+def test_async_map_is_parent_of_calls(make_async_api):
+    tracer = MemoryTracer()
+    api = make_async_api(handler, tracer=tracer)
+
+    async def main():
+        return [result async for result in api.map(lambda name: api.fortigates.all(fortigate=name), ["FGT1", "FGT3"], max_workers=2)]
+
+    asyncio.run(main())
+
+    root, = [span for span in tracer.spans if span.parent is None]
+
+    assert root.name == "AsyncApi.map"
+    assert names(tracer.children(root)) == ["FortiGates.all"] * 2
+    assert all(len(tracer.children(method)) == 1 for method in tracer.children(root))